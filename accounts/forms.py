@@ -5,7 +5,7 @@ Module containing custom user-related forms.
 
 This module defines form classes for user creation and management,
 extending Django's built-in UserCreationForm to add additional fields
-such as user roles.
+such as user roles, and a form for the email delivery preference.
 """
 
 from django import forms
@@ -43,3 +43,22 @@ class CustomUserCreationForm(UserCreationForm):
 
         model = CustomUser
         fields = ("username", "email", "role", "password1", "password2")
+
+
+class EmailPreferenceForm(forms.ModelForm):
+    """
+    Form for choosing how new publications are emailed to a reader.
+
+    Readers can receive one email per publication, or an hourly or daily
+    digest (see ``subscriptions.digests``).
+    """
+
+    class Meta:
+        """
+        Metadata for EmailPreferenceForm.
+        """
+
+        model = CustomUser
+        fields = ("email_delivery",)
+        labels = {"email_delivery": "Email delivery"}
+        widgets = {"email_delivery": forms.RadioSelect}
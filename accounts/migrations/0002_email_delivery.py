@@ -0,0 +1,26 @@
+# Generated by Django 5.2.5 on 2026-10-19 09:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="customuser",
+            name="email_delivery",
+            field=models.CharField(
+                choices=[
+                    ("immediate", "One email per publication"),
+                    ("hourly", "Hourly digest"),
+                    ("daily", "Daily digest"),
+                ],
+                default="immediate",
+                max_length=10,
+            ),
+        ),
+    ]
@@ -4,9 +4,9 @@ accounts.models
 Module defining the custom user model.
 
 Provides the CustomUser class, which extends Django's AbstractUser
-to include user roles and automatically assign groups and permissions
-based on the role. Also provides properties for accessing subscribed
-publishers and journalists.
+to include user roles and an email delivery preference, and automatically
+assign groups and permissions based on the role. Also provides properties
+for accessing subscribed publishers and journalists.
 """
 
 from django.contrib.auth.models import AbstractUser, Group, Permission
@@ -19,6 +19,16 @@ ROLE_CHOICES = (
     ("journalist", "Journalist"),
 )
 
+DELIVERY_IMMEDIATE = "immediate"
+DELIVERY_HOURLY = "hourly"
+DELIVERY_DAILY = "daily"
+
+DELIVERY_CHOICES = (
+    (DELIVERY_IMMEDIATE, "One email per publication"),
+    (DELIVERY_HOURLY, "Hourly digest"),
+    (DELIVERY_DAILY, "Daily digest"),
+)
+
 
 class CustomUser(AbstractUser):
     """
@@ -26,13 +36,19 @@ class CustomUser(AbstractUser):
 
     Attributes:
         role (CharField): The role of the user (Reader, Editor, Journalist).
+        email_delivery (CharField): How new publications are emailed to a
+            reader: immediately, or batched into an hourly or daily digest.
 
     Properties:
+        subscription_snapshot (SubscriptionSnapshot): Followed ids, memoized.
         subscribed_publishers (QuerySet): Publishers the user is subscribed to.
         subscribed_journalists (QuerySet): Journalists the user is subscribed to.
     """
 
     role = models.CharField(max_length=20, choices=ROLE_CHOICES)
+    email_delivery = models.CharField(
+        max_length=10, choices=DELIVERY_CHOICES, default=DELIVERY_IMMEDIATE
+    )
 
     def save(self, *args, **kwargs):
         """
@@ -72,6 +88,19 @@ class CustomUser(AbstractUser):
         self.groups.clear()
         self.groups.add(group)
 
+    @property
+    def subscription_snapshot(self):
+        """
+        Return the ids this user follows, loaded once per user object.
+
+        Returns:
+            SubscriptionSnapshot: Frozen sets of followed publisher ids,
+            journalist ids and journalist user ids.
+        """
+        from subscriptions.snapshot import get_snapshot
+
+        return get_snapshot(self)
+
     @property
     def subscribed_publishers(self):
         """
@@ -3,7 +3,8 @@ accounts.urls
 
 Module for the Accounts app URL configuration.
 
-Maps URLs for user registration, login, and logout to their respective views.
+Maps URLs for user registration, login, logout, and email preferences to
+their respective views.
 
 Attributes:
     app_name (str): Namespace for the accounts app URLs.
@@ -22,4 +23,6 @@ urlpatterns = [
     path("login/", views.user_login, name="login"),
     # URL for user logout
     path("logout/", views.user_logout, name="logout"),
+    # URL for the reader's email delivery preference
+    path("preferences/", views.email_preferences, name="email_preferences"),
 ]
@@ -3,15 +3,18 @@ accounts.views
 
 Views module for the Accounts app.
 
-Provides user registration, login, and logout functionality.
+Provides user registration, login, and logout functionality, and the
+reader's email delivery preference.
 Handles authentication, user creation, and related messages.
 """
 
 from django.contrib import messages
 from django.contrib.auth import authenticate, get_user_model, login, logout
+from django.contrib.auth.decorators import login_required
+from django.core.exceptions import PermissionDenied
 from django.shortcuts import redirect, render
 
-from .forms import CustomUserCreationForm
+from .forms import CustomUserCreationForm, EmailPreferenceForm
 
 User = get_user_model()
 
@@ -95,3 +98,31 @@ def user_logout(request):
     """
     logout(request)
     return redirect("accounts:login")
+
+
+@login_required
+def email_preferences(request):
+    """
+    Let a reader choose immediate emails or an hourly/daily digest.
+
+    Args:
+        request (HttpRequest): The HTTP request object.
+
+    Returns:
+        HttpResponse: Rendered preference form, or a redirect after saving.
+
+    Raises:
+        PermissionDenied: If the user is not a reader.
+    """
+    if request.user.role != "reader":
+        raise PermissionDenied()
+
+    if request.method == "POST":
+        form = EmailPreferenceForm(request.POST, instance=request.user)
+        if form.is_valid():
+            form.instance.save(update_fields=["email_delivery"])
+            messages.success(request, "Email preferences updated.")
+            return redirect("accounts:email_preferences")
+    else:
+        form = EmailPreferenceForm(instance=request.user)
+    return render(request, "accounts/email_preferences.html", {"form": form})
@@ -5,17 +5,31 @@ Admin configuration module for the Articles app.
 
 Registers models with Django admin and customizes their display, filters,
 search fields, and fieldsets for easier management of users, articles,
-publishers, journalists, newsletters, and subscriptions.
+article revisions and view counts, publishers, journalists, newsletters,
+archived articles and newsletters, subscriptions, digest runs, captured
+slow queries, request profiles, and startup benchmarks.
 """
 
+from django import forms
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
+from django.urls import reverse
+from django.utils.html import format_html
 
 from accounts.models import CustomUser
-from newsletters.models import Newsletter
-from subscriptions.models import Subscription
+from monitoring.models import RequestProfile, SlowQuery, StartupBenchmark
+from newsletters.models import ArchivedNewsletter, Newsletter
+from subscriptions.models import DigestRun, Subscription
 
-from .models import Article, Journalist, Publisher
+from .forms import BodyFormMixin
+from .models import (
+    ArchivedArticle,
+    Article,
+    ArticleRevision,
+    ArticleViewCount,
+    Journalist,
+    Publisher,
+)
 
 
 # ----------------------
@@ -32,9 +46,12 @@ class CustomUserAdmin(UserAdmin):
 
     model = CustomUser
     list_display = ("username", "email", "role", "is_staff", "is_active")
-    list_filter = ("role", "is_staff", "is_active")
+    list_filter = ("role", "email_delivery", "is_staff", "is_active")
     fieldsets = (
-        (None, {"fields": ("username", "password", "email", "role")}),
+        (
+            None,
+            {"fields": ("username", "password", "email", "role", "email_delivery")},
+        ),
         (
             "Permissions",
             {"fields": ("is_staff", "is_active", "groups", "user_permissions")},
@@ -70,11 +87,11 @@ class PublisherAdmin(admin.ModelAdmin):
     """
     Admin interface for the Publisher model.
 
-    Displays publisher name and allows assigning editors and journalists
-    using a horizontal filter widget.
+    Displays publisher name and subscriber count and allows assigning
+    editors and journalists using a horizontal filter widget.
     """
 
-    list_display = ("name",)
+    list_display = ("name", "subscriber_count")
     filter_horizontal = ("editors", "journalists")
 
 
@@ -86,46 +103,96 @@ class JournalistAdmin(admin.ModelAdmin):
     """
     Admin interface for the Journalist model.
 
-    Displays linked user and allows search by username or email.
+    Displays linked user and subscriber count and allows search by
+    username or email.
     """
 
-    list_display = ("user",)
+    list_display = ("user", "subscriber_count")
     search_fields = ("user__username", "user__email")
 
 
 # ----------------------
 # Article Admin
 # ----------------------
+class ArticleAdminForm(BodyFormMixin, forms.ModelForm):
+    """Admin form for Article that edits the separately stored body."""
+
+    content = forms.CharField(widget=forms.Textarea)
+
+    class Meta:
+        model = Article
+        fields = "__all__"
+
+
 @admin.register(Article)
 class ArticleAdmin(admin.ModelAdmin):
     """
     Admin interface for the Article model.
 
     Displays article details, filters by approval status and publisher,
-    and allows search by title, content, or author username.
+    and allows search by title or author username. Bodies are stored
+    compressed, so they are not searchable.
     """
 
+    form = ArticleAdminForm
     list_display = ("title", "author", "publisher", "is_approved", "created_at")
     list_filter = ("is_approved", "publisher")
-    search_fields = ("title", "content", "author__username")
+    search_fields = ("title", "author__username")
 
 
 # ----------------------
 # Newsletter Admin
 # ----------------------
+class NewsletterAdminForm(BodyFormMixin, forms.ModelForm):
+    """Admin form for Newsletter that edits the separately stored body."""
+
+    content = forms.CharField(widget=forms.Textarea)
+
+    class Meta:
+        model = Newsletter
+        fields = "__all__"
+
+
 @admin.register(Newsletter)
 class NewsletterAdmin(admin.ModelAdmin):
     """
     Admin interface for the Newsletter model.
 
     Displays newsletter details, filters by approval status and publisher,
-    and allows search by title, content, or author username.
+    and allows search by title or author username. Bodies are stored
+    compressed, so they are not searchable.
     """
 
+    form = NewsletterAdminForm
     list_display = ("title", "author", "publisher", "is_approved", "created_at")
     list_filter = ("is_approved", "publisher")
+    search_fields = ("title", "author__username")
+
+
+# ----------------------
+# Archive Admin
+# ----------------------
+@admin.register(ArchivedArticle, ArchivedNewsletter)
+class ArchivedContentAdmin(admin.ModelAdmin):
+    """
+    Admin interface for the ArchivedArticle and ArchivedNewsletter models.
+
+    Read-only; allows search by title, content, or author username.
+    """
+
+    list_display = ("title", "author", "publisher", "created_at", "archived_at")
+    list_filter = ("publisher",)
+    list_select_related = ("author", "publisher")
     search_fields = ("title", "content", "author__username")
 
+    def has_add_permission(self, request):
+        """Archived rows are only created by the archiver."""
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        """Archived rows are read-only."""
+        return False
+
 
 # ----------------------
 # Subscription Admin
@@ -146,3 +213,195 @@ class SubscriptionAdmin(admin.ModelAdmin):
         "publisher__name",
         "journalist__user__username",
     )
+
+
+# ----------------------
+# Article Revision Admin
+# ----------------------
+@admin.register(ArticleRevision)
+class ArticleRevisionAdmin(admin.ModelAdmin):
+    """
+    Admin interface for the ArticleRevision model.
+
+    Read-only list of saved article versions; diffs are shown on the editor
+    history page. Articles are listed by id, since the history of archived
+    articles outlives the live row.
+    """
+
+    list_display = (
+        "article_id",
+        "number",
+        "title",
+        "edited_by",
+        "is_snapshot",
+        "created_at",
+    )
+    list_filter = ("is_snapshot",)
+    list_select_related = ("edited_by",)
+    search_fields = ("title", "article__title", "edited_by__username")
+    exclude = ("data",)
+
+    def has_add_permission(self, request):
+        """Revisions are only written by the edit views."""
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        """Revisions are read-only."""
+        return False
+
+
+# ----------------------
+# Article View Count Admin
+# ----------------------
+@admin.register(ArticleViewCount)
+class ArticleViewCountAdmin(admin.ModelAdmin):
+    """
+    Admin interface for the ArticleViewCount model.
+
+    Read-only list of detail page views per article, most viewed first.
+    Articles are listed by id, since archived articles keep their count.
+    """
+
+    list_display = ("article_id", "publisher", "views", "updated_at")
+    list_filter = ("publisher",)
+    list_select_related = ("publisher",)
+    ordering = ("-views",)
+
+    def has_add_permission(self, request):
+        """Counts are only written by the view counter."""
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        """Counts are read-only."""
+        return False
+
+
+# ----------------------
+# Digest Run Admin
+# ----------------------
+@admin.register(DigestRun)
+class DigestRunAdmin(admin.ModelAdmin):
+    """
+    Admin interface for the DigestRun model.
+
+    Read-only history of digest email runs per delivery frequency.
+    """
+
+    list_display = ("frequency", "window_start", "window_end", "recipients", "items")
+    list_filter = ("frequency",)
+    ordering = ("-window_end",)
+
+    def has_add_permission(self, request):
+        """Runs are only recorded by the send_digests command."""
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        """Runs are read-only."""
+        return False
+
+
+# ----------------------
+# Slow Query Admin
+# ----------------------
+@admin.register(SlowQuery)
+class SlowQueryAdmin(admin.ModelAdmin):
+    """
+    Admin interface for the SlowQuery model.
+
+    Lists captured slow queries, one row per SQL fingerprint, with the
+    costliest first. Rows can be deleted once a query has been fixed.
+    """
+
+    list_display = (
+        "short_sql",
+        "count",
+        "avg_duration",
+        "max_ms",
+        "last_url_name",
+        "last_frame",
+        "last_seen",
+    )
+    search_fields = ("sql", "last_url_name", "last_frame")
+    ordering = ("-total_ms",)
+    readonly_fields = [field.name for field in SlowQuery._meta.fields]
+
+    @admin.display(description="SQL")
+    def short_sql(self, obj):
+        """Return the beginning of the normalized SQL."""
+        return obj.sql[:120]
+
+    @admin.display(description="Avg ms", ordering="total_ms")
+    def avg_duration(self, obj):
+        """Return the mean duration in milliseconds."""
+        return round(obj.avg_ms, 1)
+
+    def has_add_permission(self, request):
+        """Rows are only recorded by the slow-query middleware."""
+        return False
+
+
+# ----------------------
+# Request Profile Admin
+# ----------------------
+@admin.register(RequestProfile)
+class RequestProfileAdmin(admin.ModelAdmin):
+    """
+    Admin interface for the RequestProfile model.
+
+    Lists profiled requests with their SQL/template/Python breakdown and a
+    link to download the raw stats.
+    """
+
+    list_display = (
+        "created_at",
+        "method",
+        "path",
+        "status_code",
+        "total_ms",
+        "sql_ms",
+        "sql_count",
+        "template_ms",
+        "python_ms",
+        "requested",
+        "download",
+    )
+    list_filter = ("requested", "url_name")
+    search_fields = ("path", "url_name", "user__username")
+    ordering = ("-created_at",)
+    exclude = ("stats",)
+    readonly_fields = ("download",) + tuple(
+        field.name for field in RequestProfile._meta.fields if field.name != "stats"
+    )
+
+    @admin.display(description="Stats")
+    def download(self, obj):
+        """Return a link to the ``.prof`` download."""
+        url = reverse("monitoring:profile_download", args=[obj.pk])
+        return format_html('<a href="{}">Download</a>', url)
+
+    def has_add_permission(self, request):
+        """Profiles are only recorded by the profiling middleware."""
+        return False
+
+
+# ----------------------
+# Startup Benchmark Admin
+# ----------------------
+@admin.register(StartupBenchmark)
+class StartupBenchmarkAdmin(admin.ModelAdmin):
+    """
+    Admin interface for the StartupBenchmark model.
+
+    Read-only history of ``benchmark_startup`` results.
+    """
+
+    list_display = ("created_at", "median_ms", "min_ms", "max_ms", "runs", "note")
+    ordering = ("-created_at",)
+
+    def has_add_permission(self, request):
+        """Results are only recorded by the benchmark_startup command."""
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        """Results are read-only."""
+        return False
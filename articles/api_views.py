@@ -4,30 +4,90 @@ articles.api
 API views for articles and newsletters.
 
 Provides REST API endpoints for retrieving articles and newsletters
-based on user subscriptions and roles (reader, journalist, editor).
+based on user subscriptions and roles (reader, journalist, editor), for
+editors to approve or reject content in bulk, for readers to follow or
+unfollow many publishers and journalists at once, to search the
+publisher/journalist directory, to list a publisher's most-read
+articles, and for readers to see unread counts and mark sources read.
+
+The subscriber content lists are throttled per user and per client IP
+(see ``articles.throttling``).
 """
 
-from django.db.models import Q
 from rest_framework import generics, permissions
+from rest_framework.exceptions import NotFound, PermissionDenied
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
 from newsletters.models import Newsletter
+from subscriptions import read_state
+from subscriptions.bulk import apply_changes
 from subscriptions.models import Subscription
+from subscriptions.snapshot import get_snapshot
 
+from . import directory, view_counts
 from .models import Article
-from .serializers import ArticleSerializer, NewsletterSerializer
+from .moderation import MODERATED_MODELS, bulk_set_approval
+from .serializers import (
+    ArticleSerializer,
+    ArticleSummarySerializer,
+    BulkModerationSerializer,
+    BulkSubscriptionSerializer,
+    DirectoryQuerySerializer,
+    MarkReadSerializer,
+    NewsletterSerializer,
+    NewsletterSummarySerializer,
+)
+from .throttling import RateLimitHeadersMixin
+
+
+class SummaryViewMixin:
+    """
+    Serve a content-free summary representation on ``?view=summary``.
+
+    Subclasses set ``summary_serializer_class``; in summary mode the body is
+    never read from the database. Full mode fetches the compressed bodies
+    of a page with one extra query instead of joining them.
+    """
 
+    summary_serializer_class = None
 
-class SubscriberArticlesAPI(generics.ListAPIView):
+    def is_summary(self):
+        """Return True if the client asked for the summary representation."""
+        return self.request.query_params.get("view") == "summary"
+
+    def get_serializer_class(self):
+        """Pick the summary serializer when requested."""
+        if self.is_summary():
+            return self.summary_serializer_class
+        return super().get_serializer_class()
+
+    def filter_queryset(self, queryset):
+        """Defer the body in summary mode, prefetch it otherwise."""
+        queryset = super().filter_queryset(queryset)
+        if self.is_summary():
+            return queryset.defer("legacy_content")
+        return queryset.prefetch_related("body")
+
+
+class SubscriberArticlesAPI(
+    RateLimitHeadersMixin, SummaryViewMixin, generics.ListAPIView
+):
     """
     API endpoint to list articles for the authenticated user.
 
     Readers: Articles from subscribed publishers or journalists (approved only).
     Journalists: Articles authored by the user.
     Editors: All articles.
+
+    ``?view=summary`` returns excerpts instead of full bodies. Requests are
+    throttled per user and per IP and carry ``X-RateLimit-*`` headers.
     """
 
     serializer_class = ArticleSerializer
+    summary_serializer_class = ArticleSummarySerializer
     permission_classes = [permissions.IsAuthenticated]
+    replica_reads = True
 
     def get_queryset(self):
         """
@@ -38,16 +98,9 @@ class SubscriberArticlesAPI(generics.ListAPIView):
         """
         user = self.request.user
         if user.role == "reader":
-            subs_pub = Subscription.objects.filter(
-                user=user, publisher__isnull=False
-            ).values_list("publisher", flat=True)
-            subs_jour = Subscription.objects.filter(
-                user=user, journalist__isnull=False
-            ).values_list("journalist", flat=True)
             return Article.objects.filter(
-                Q(publisher__id__in=subs_pub) | Q(author__id__in=subs_jour),
-                is_approved=True,
-            ).distinct()
+                get_snapshot(user).content_filter(), is_approved=True
+            )
         elif user.role == "journalist":
             return Article.objects.filter(author=user)
         elif user.role == "editor":
@@ -55,17 +108,24 @@ class SubscriberArticlesAPI(generics.ListAPIView):
         return Article.objects.none()
 
 
-class SubscriberNewslettersAPI(generics.ListAPIView):
+class SubscriberNewslettersAPI(
+    RateLimitHeadersMixin, SummaryViewMixin, generics.ListAPIView
+):
     """
     API endpoint to list newsletters for the authenticated user.
 
     Readers: Newsletters from subscribed publishers or journalists (approved only).
     Journalists: Newsletters authored by the user.
     Editors: All newsletters.
+
+    ``?view=summary`` returns excerpts instead of full bodies. Requests are
+    throttled per user and per IP and carry ``X-RateLimit-*`` headers.
     """
 
     serializer_class = NewsletterSerializer
+    summary_serializer_class = NewsletterSummarySerializer
     permission_classes = [permissions.IsAuthenticated]
+    replica_reads = True
 
     def get_queryset(self):
         """
@@ -76,18 +136,218 @@ class SubscriberNewslettersAPI(generics.ListAPIView):
         """
         user = self.request.user
         if user.role == "reader":
-            subs_pub = Subscription.objects.filter(
-                user=user, publisher__isnull=False
-            ).values_list("publisher", flat=True)
-            subs_jour = Subscription.objects.filter(
-                user=user, journalist__isnull=False
-            ).values_list("journalist", flat=True)
             return Newsletter.objects.filter(
-                Q(publisher__id__in=subs_pub) | Q(author__id__in=subs_jour),
-                is_approved=True,
-            ).distinct()
+                get_snapshot(user).content_filter(), is_approved=True
+            )
         elif user.role == "journalist":
             return Newsletter.objects.filter(author=user)
         elif user.role == "editor":
             return Newsletter.objects.all()
         return Newsletter.objects.none()
+
+
+class BulkModerationAPI(APIView):
+    """
+    API endpoint for editors to approve or reject many items at once.
+
+    POST body::
+
+        {"type": "article", "action": "approve", "ids": [1, 2, 3]}
+
+    Responds with the number of items whose approval state changed.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        """
+        Apply the requested approval change.
+
+        Returns:
+            Response: ``{"updated": <int>}``.
+        """
+        if request.user.role != "editor":
+            raise PermissionDenied()
+        serializer = BulkModerationSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        updated = bulk_set_approval(
+            MODERATED_MODELS[data["type"]],
+            data["ids"],
+            approve=data["action"] == "approve",
+        )
+        return Response({"updated": updated})
+
+
+class BulkSubscriptionAPI(APIView):
+    """
+    API endpoint for readers to view and change their subscriptions.
+
+    GET returns the current state. POST body::
+
+        {"follow_publishers": [1, 2], "follow_journalists": [3],
+         "unfollow_publishers": [4], "unfollow_journalists": []}
+
+    Every list is optional. Both methods respond with
+    ``{"publishers": [...], "journalists": [...]}`` (journalist ids).
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_state(self, snapshot):
+        """Return the response body for a subscription snapshot."""
+        return {
+            "publishers": sorted(snapshot.publisher_ids),
+            "journalists": sorted(snapshot.journalist_ids),
+        }
+
+    def get(self, request):
+        """
+        Return the reader's subscriptions.
+
+        Returns:
+            Response: Followed publisher and journalist ids.
+        """
+        if request.user.role != "reader":
+            raise PermissionDenied()
+        return Response(self.get_state(get_snapshot(request.user)))
+
+    def post(self, request):
+        """
+        Follow and unfollow the requested publishers and journalists.
+
+        Returns:
+            Response: Followed publisher and journalist ids after the change.
+        """
+        if request.user.role != "reader":
+            raise PermissionDenied()
+        serializer = BulkSubscriptionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        snapshot = apply_changes(request.user, **serializer.validated_data)
+        return Response(self.get_state(snapshot))
+
+
+class DirectoryAPI(APIView):
+    """
+    API endpoint searching publishers or journalists by name prefix.
+
+    Query parameters: ``type`` (``publisher`` or ``journalist``), ``q``
+    (name prefix), ``ordering`` (``name`` or ``popular``), ``limit`` and
+    ``cursor`` (the ``next_cursor`` of the previous page).
+
+    Responds with ``{"items": [...], "next_cursor": <str or null>}``; each
+    item has ``id``, ``name``, ``subscriber_count`` and, for readers,
+    ``subscribed``. Journalist ids are ``Journalist`` ids.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+    replica_reads = True
+
+    def get(self, request):
+        """
+        Return one page of matching sources.
+
+        Returns:
+            Response: Directory page.
+        """
+        serializer = DirectoryQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+        page = directory.search(
+            params["type"],
+            query=params["q"],
+            ordering=params["ordering"],
+            cursor=params["cursor"] or None,
+            limit=params["limit"],
+        )
+        if request.user.role == "reader":
+            snapshot = get_snapshot(request.user)
+            followed = (
+                snapshot.publisher_ids
+                if params["type"] == "publisher"
+                else snapshot.journalist_ids
+            )
+            page["items"] = [
+                {**item, "subscribed": item["id"] in followed} for item in page["items"]
+            ]
+        return Response(page)
+
+
+class MostReadAPI(APIView):
+    """
+    API endpoint listing the most-read approved articles of a publisher.
+
+    Served from the precomputed per-publisher list maintained by
+    ``articles.view_counts``; responds with
+    ``{"items": [{"id", "title", "views"}, ...]}``, most viewed first.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+    replica_reads = True
+
+    def get(self, request, pk):
+        """
+        Return the publisher's most-read articles.
+
+        Args:
+            pk (int): Publisher primary key.
+
+        Returns:
+            Response: Most-read list (empty for unknown publishers).
+        """
+        return Response(
+            {
+                "items": [
+                    {"id": article_id, "title": title, "views": views}
+                    for article_id, title, views in view_counts.most_read(pk)
+                ]
+            }
+        )
+
+
+class ReadStateAPI(APIView):
+    """
+    API endpoint for a reader's unread counts and read markers.
+
+    GET responds with ``{"sources": [...]}``: for every subscription its
+    ``type``, ``id``, ``name`` and the number of unread ``articles`` and
+    ``newsletters``. POST body::
+
+        {"type": "publisher", "id": 1, "until": "2025-01-31T12:00:00Z"}
+
+    marks the followed source read up to ``until`` (default: now) and
+    responds with the effective ``read_until``.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        """
+        Return unread counts for all of the reader's subscriptions.
+
+        Returns:
+            Response: Unread counts per source.
+        """
+        if request.user.role != "reader":
+            raise PermissionDenied()
+        return Response({"sources": read_state.unread_counts(request.user)})
+
+    def post(self, request):
+        """
+        Mark a followed source read up to a timestamp.
+
+        Returns:
+            Response: ``{"read_until": <datetime>}``.
+        """
+        if request.user.role != "reader":
+            raise PermissionDenied()
+        serializer = MarkReadSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        try:
+            read_until = read_state.mark_read(
+                request.user, data["type"], data["id"], until=data["until"]
+            )
+        except Subscription.DoesNotExist:
+            raise NotFound("You do not follow this source.")
+        return Response({"read_until": read_until})
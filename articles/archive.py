@@ -0,0 +1,153 @@
+"""
+articles.archive
+
+Hot/cold split of articles and newsletters.
+
+``Article`` and ``Newsletter`` keep only recent content. Approved items
+created more than ``ARCHIVE_AFTER_DAYS`` days ago are moved, keeping their
+primary keys, into ``ArchivedArticle`` and ``ArchivedNewsletter`` by the
+``archive_content`` command. Each batch copies the rows and deletes the
+originals in one transaction, and the command pauses between batches so
+replication and the buffer pool keep up.
+
+Lists, feeds, digests, the moderation queue and the APIs query only the
+live tables; exports read both. Detail views look an item up with
+``get_object_or_404``, which falls back to the archive, so old links keep
+working. Pending items are never archived, so the moderation queue is
+unaffected. The view count and revision history of an archived article
+stay in place under its unchanged id (neither cascades from the live row),
+but archived items are no longer counted or marked read.
+"""
+
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.http import Http404
+from django.utils import timezone
+
+from newsletters.models import ArchivedNewsletter, Newsletter
+
+from .models import ArchivedArticle, Article
+
+# live model -> archive model
+ARCHIVES = {Article: ArchivedArticle, Newsletter: ArchivedNewsletter}
+
+
+def is_archived(instance):
+    """Return True if ``instance`` was loaded from an archive table."""
+    return type(instance) in ARCHIVES.values()
+
+
+def get_object_or_404(model, defer_body=False, **filters):
+    """
+    Return a live item, or its archived copy once it has been moved.
+
+    Args:
+        model (Model): ``Article`` or ``Newsletter``.
+        defer_body (bool): Leave the inline body column unloaded; ``content``
+            is then read on first access only.
+        `**filters`: Lookups the item must match, e.g. ``pk``.
+
+    Returns:
+        Model: Live or archived instance.
+
+    Raises:
+        Http404: Neither table has a matching item.
+    """
+    for candidate, body_field in (
+        (model, "legacy_content"),
+        (ARCHIVES[model], "content"),
+    ):
+        queryset = candidate.objects.all()
+        if defer_body:
+            queryset = queryset.defer(body_field)
+        try:
+            return queryset.get(**filters)
+        except candidate.DoesNotExist:
+            continue
+    raise Http404(f"No {model._meta.verbose_name} matches the given query.")
+
+
+def _copied_fields(archive_model):
+    """Return the attribute names copied from a live row to its archive."""
+    return [
+        field.attname
+        for field in archive_model._meta.concrete_fields
+        if field.name != "archived_at"
+    ]
+
+
+def archive_batch(model, cutoff, batch_size):
+    """
+    Move one batch of old approved items into the archive.
+
+    Args:
+        model (Model): ``Article`` or ``Newsletter``.
+        cutoff (datetime): Items created before this are moved.
+        batch_size (int): Maximum number of items to move.
+
+    Returns:
+        int: Number of items moved.
+    """
+    archive_model = ARCHIVES[model]
+    fields = _copied_fields(archive_model)
+    with transaction.atomic():
+        items = list(
+            model.objects.select_for_update(of=("self",))
+            .filter(is_approved=True, created_at__lt=cutoff)
+            # Bodies come from a second query: an outer join in the locking
+            # select would lock them too, and PostgreSQL refuses it.
+            .prefetch_related("body")
+            .order_by("created_at", "pk")[:batch_size]
+        )
+        if not items:
+            return 0
+        archive_model.objects.bulk_create(
+            [
+                archive_model(**{name: getattr(item, name) for name in fields})
+                for item in items
+            ]
+        )
+        # A queryset delete still sends post_delete, which drops the page
+        # cache entry, static page and feed versions. View counts and
+        # revisions are kept for the archived copy.
+        model.objects.filter(pk__in=[item.pk for item in items]).delete()
+    return len(items)
+
+
+def archive(model, days=None, batch_size=None, pause=None, max_batches=None):
+    """
+    Move every approved item older than ``days`` into the archive.
+
+    Args:
+        model (Model): ``Article`` or ``Newsletter``.
+        days (int, optional): Age in days; defaults to ``ARCHIVE_AFTER_DAYS``.
+        batch_size (int, optional): Items per transaction; defaults to
+            ``ARCHIVE_BATCH_SIZE``.
+        pause (float, optional): Seconds to sleep between batches; defaults
+            to ``ARCHIVE_BATCH_PAUSE``.
+        max_batches (int, optional): Stop after this many batches.
+
+    Returns:
+        int: Number of items moved.
+    """
+    if days is None:
+        days = getattr(settings, "ARCHIVE_AFTER_DAYS", 365)
+    if batch_size is None:
+        batch_size = getattr(settings, "ARCHIVE_BATCH_SIZE", 500)
+    if pause is None:
+        pause = getattr(settings, "ARCHIVE_BATCH_PAUSE", 0.5)
+    cutoff = timezone.now() - timedelta(days=days)
+
+    total = batches = 0
+    while max_batches is None or batches < max_batches:
+        moved = archive_batch(model, cutoff, batch_size)
+        total += moved
+        batches += 1
+        if moved < batch_size:
+            break
+        if pause:
+            time.sleep(pause)
+    return total
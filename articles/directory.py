@@ -0,0 +1,255 @@
+"""
+articles.directory
+
+Searchable, paginated directory of publishers and journalists.
+
+Sources are matched on the indexed ``normalized_name`` column with a
+prefix range (``>= 'abc' AND < 'abc\uffff'``) and paginated with keysets on
+``(normalized_name, id)`` or ``(subscriber_count, id)``, so every page is
+an index range scan regardless of how deep the reader has scrolled.
+
+First pages are kept in a small in-process LRU cache for autocomplete.
+When a shorter prefix already returned every match, longer prefixes are
+answered by filtering that result in memory, so typing ``"gua"`` after
+``"gu"`` costs no query. Cached pages expire after
+``DIRECTORY_CACHE_TIMEOUT`` seconds; subscriber counts and new sources
+may lag by that much.
+"""
+
+import base64
+import binascii
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+from subscriptions.models import Subscription
+
+from .models import Journalist, Publisher, normalize_name
+
+DIRECTORY_PAGE_SIZE = 20
+DIRECTORY_MAX_PAGE_SIZE = 100
+PREFIX_CACHE_SIZE = 1024
+
+# kind -> (model, display name field)
+SOURCES = {
+    "publisher": (Publisher, Publisher.DIRECTORY_NAME_FIELD),
+    "journalist": (Journalist, Journalist.DIRECTORY_NAME_FIELD),
+}
+
+# ordering -> (sort field, descending)
+ORDERINGS = {
+    "name": ("normalized_name", False),
+    "popular": ("subscriber_count", True),
+}
+
+
+# ---------------- Subscriber counts ----------------
+
+
+def adjust_subscriber_counts(publisher_ids=(), journalist_ids=(), delta=1):
+    """
+    Add ``delta`` to the subscriber count of the given sources.
+
+    Args:
+        publisher_ids (Iterable[int]): Publishers gaining or losing a follower.
+        journalist_ids (Iterable[int]): ``Journalist`` ids likewise.
+        delta (int): ``1`` for a follow, ``-1`` for an unfollow.
+    """
+    for model, ids in ((Publisher, publisher_ids), (Journalist, journalist_ids)):
+        ids = set(ids)
+        if not ids:
+            continue
+        queryset = model.objects.filter(pk__in=ids)
+        if delta < 0:
+            queryset = queryset.filter(subscriber_count__gte=-delta)
+        queryset.update(subscriber_count=F("subscriber_count") + delta)
+
+
+def recount_subscribers(publisher_ids=(), journalist_ids=()):
+    """
+    Set the subscriber count of the given sources from their subscriptions.
+
+    Unlike ``adjust_subscriber_counts`` the result does not depend on which
+    rows the caller believes it changed, so it is safe after writes such as
+    ``bulk_create(ignore_conflicts=True)`` that do not report what they did.
+
+    Args:
+        publisher_ids (Iterable[int]): Publishers to recount.
+        journalist_ids (Iterable[int]): ``Journalist`` ids likewise.
+    """
+    for model, ids in ((Publisher, publisher_ids), (Journalist, journalist_ids)):
+        ids = set(ids)
+        if not ids:
+            continue
+        field = model._meta.model_name
+        counts = (
+            Subscription.objects.filter(**{field: OuterRef("pk")})
+            .values(field)
+            .annotate(total=Count("pk"))
+            .values("total")
+        )
+        model.objects.filter(pk__in=ids).update(
+            subscriber_count=Coalesce(Subquery(counts), 0)
+        )
+
+
+# ---------------- Cursors ----------------
+
+
+def encode_cursor(value, pk):
+    """Encode a keyset position as an opaque URL-safe token."""
+    raw = f"{value}|{pk}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token, ordering):
+    """
+    Decode a token produced by ``encode_cursor``.
+
+    Returns:
+        tuple or None: ``(value, pk)``, or None if the token is invalid.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode()
+        value, pk = raw.rsplit("|", 1)
+        if ORDERINGS[ordering][1]:
+            value = int(value)
+        return value, int(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+
+
+# ---------------- Prefix cache ----------------
+
+
+class PrefixCache:
+    """
+    Thread-safe LRU of directory first pages with a time-to-live.
+
+    Entries map ``(kind, ordering, limit, prefix)`` to
+    ``(expires, rows, complete)``; ``complete`` means ``rows`` holds every
+    match of the prefix.
+    """
+
+    def __init__(self, size=PREFIX_CACHE_SIZE):
+        """Create an empty cache holding at most ``size`` pages."""
+        self.size = size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, kind, ordering, limit, prefix):
+        """
+        Return cached rows for a prefix, derived from a shorter one if possible.
+
+        Returns:
+            tuple or None: ``(rows, complete)``.
+        """
+        now = time.monotonic()
+        with self._lock:
+            for length in range(len(prefix), -1, -1):
+                key = (kind, ordering, limit, prefix[:length])
+                entry = self._entries.get(key)
+                if entry is None:
+                    continue
+                expires, rows, complete = entry
+                if expires < now:
+                    del self._entries[key]
+                    continue
+                if length == len(prefix):
+                    self._entries.move_to_end(key)
+                    return rows, complete
+                if complete:
+                    return [row for row in rows if row[0].startswith(prefix)], True
+        return None
+
+    def set(self, kind, ordering, limit, prefix, rows, complete):
+        """Store the first page of a prefix."""
+        timeout = getattr(settings, "DIRECTORY_CACHE_TIMEOUT", 60)
+        with self._lock:
+            key = (kind, ordering, limit, prefix)
+            self._entries[key] = (time.monotonic() + timeout, rows, complete)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop every cached page."""
+        with self._lock:
+            self._entries.clear()
+
+
+prefix_cache = PrefixCache()
+
+
+# ---------------- Search ----------------
+
+
+def _fetch(kind, ordering, prefix, position, limit):
+    """Return up to ``limit + 1`` rows after ``position`` from the database."""
+    model, name_field = SOURCES[kind]
+    field, descending = ORDERINGS[ordering]
+    queryset = model.objects.all()
+    if prefix:
+        # A range rather than ``startswith``: MySQL turns the latter into
+        # ``LIKE BINARY``, which cannot use the name index.
+        queryset = queryset.filter(
+            normalized_name__gte=prefix, normalized_name__lt=prefix + "\uffff"
+        )
+    if position:
+        value, pk = position
+        if descending:
+            after = Q(**{f"{field}__lt": value}) | Q(**{field: value, "pk__lt": pk})
+        else:
+            after = Q(**{f"{field}__gt": value}) | Q(**{field: value, "pk__gt": pk})
+        queryset = queryset.filter(after)
+    order = ("-" if descending else "") + field
+    return list(
+        queryset.order_by(order, "-pk" if descending else "pk").values_list(
+            "normalized_name", "pk", name_field, "subscriber_count"
+        )[: limit + 1]
+    )
+
+
+def search(kind, query="", ordering="name", cursor=None, limit=DIRECTORY_PAGE_SIZE):
+    """
+    Return one page of directory entries.
+
+    Args:
+        kind (str): ``publisher`` or ``journalist``.
+        query (str): Name prefix; normalized like the stored names.
+        ordering (str): ``name`` (A-Z) or ``popular`` (most followed first).
+        cursor (str, optional): Token from a previous page's ``next_cursor``.
+        limit (int): Entries per page.
+
+    Returns:
+        dict: ``items`` (list of ``{"id", "name", "subscriber_count"}``) and
+        ``next_cursor`` (str or None).
+    """
+    prefix = normalize_name(query)
+    position = decode_cursor(cursor, ordering) if cursor else None
+
+    cached = None if position else prefix_cache.get(kind, ordering, limit, prefix)
+    if cached is not None:
+        page, complete = cached
+    else:
+        rows = _fetch(kind, ordering, prefix, position, limit)
+        page, complete = rows[:limit], len(rows) <= limit
+        if not position:
+            prefix_cache.set(kind, ordering, limit, prefix, page, complete)
+
+    next_cursor = None
+    if not complete and page:
+        last = page[-1]
+        value = last[3] if ORDERINGS[ordering][1] else last[0]
+        next_cursor = encode_cursor(value, last[1])
+    return {
+        "items": [
+            {"id": pk, "name": name, "subscriber_count": count}
+            for _, pk, name, count in page
+        ],
+        "next_cursor": next_cursor,
+    }
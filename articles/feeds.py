@@ -0,0 +1,266 @@
+"""
+articles.feeds
+
+RSS and Atom syndication feeds per publisher and per journalist.
+
+Feeds list the latest approved articles and newsletters of one source,
+using the stored excerpts. Rendered feeds are cached under a per-source
+version number that is bumped whenever content of that source is saved,
+approved or deleted, so a feed stays cached until the next change. The
+version doubles as the ETag and Last-Modified value, which lets feed
+readers poll with conditional GETs that are answered with a 304 without
+touching the database. Journalist feeds are versioned by ``Journalist``
+id; content saves map their author to it when bumping.
+"""
+
+import time
+from abc import ABC, abstractmethod
+from itertools import chain
+
+from django.conf import settings
+from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.http import http_date, quote_etag
+
+from news_portal.db_router import replica_reads
+from newsletters.models import Newsletter
+
+from .models import Article, Journalist, Publisher
+
+FEED_ITEMS = 30
+
+ITEM_FIELDS = ("id", "title", "excerpt", "created_at", "author__username")
+
+# Item model -> reader-facing detail route linked from feed items.
+READER_DETAIL_ROUTES = {
+    Article: "articles:detail",
+    Newsletter: "newsletters:reader_detail",
+}
+
+
+# ---------------- Versioning ----------------
+
+
+def _version_key(kind, source_id):
+    """Return the cache key holding the version of a source's feed."""
+    return f"feed:version:{kind}:{source_id}"
+
+
+def get_feed_version(kind, source_id):
+    """
+    Return the current feed version of a source, creating it if needed.
+
+    Args:
+        kind (str): ``"publisher"`` or ``"journalist"``.
+        source_id (int): Publisher or ``Journalist`` id.
+
+    Returns:
+        int: Version number (a timestamp in seconds).
+    """
+    key = _version_key(kind, source_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, int(time.time()), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_feed_versions(publisher_ids=(), author_ids=()):
+    """
+    Invalidate the cached feeds of the given sources.
+
+    Args:
+        publisher_ids (Iterable[int]): Publishers whose feeds changed.
+        author_ids (Iterable[int]): Author user ids whose feeds changed;
+            authors without a ``Journalist`` profile have no feed.
+    """
+    now = int(time.time())
+    versions = {}
+    author_ids = set(author_ids)
+    journalist_ids = (
+        Journalist.objects.filter(user_id__in=author_ids).values_list("pk", flat=True)
+        if author_ids
+        else ()
+    )
+    for kind, ids in (("publisher", publisher_ids), ("journalist", journalist_ids)):
+        for source_id in ids:
+            key = _version_key(kind, source_id)
+            # Keep versions strictly increasing even within the same second.
+            versions[key] = max(now, (cache.get(key) or 0) + 1)
+    if versions:
+        cache.set_many(versions, timeout=None)
+
+
+# ---------------- Feeds ----------------
+
+
+class SourceFeed(Feed, ABC):
+    """
+    Base feed listing the latest approved articles and newsletters.
+
+    Subclasses implement ``get_object`` and ``filter_items``.
+    """
+
+    @abstractmethod
+    def filter_items(self, queryset, obj):
+        """Restrict an approved-content queryset to the feed's source."""
+
+    def items(self, obj):
+        """Return the newest approved articles and newsletters, merged."""
+        querysets = [
+            self.filter_items(model.objects.filter(is_approved=True), obj)
+            .select_related("author")
+            .only(*ITEM_FIELDS)
+            .order_by("-created_at")[:FEED_ITEMS]
+            for model in (Article, Newsletter)
+        ]
+        return sorted(
+            chain.from_iterable(querysets), key=lambda i: i.created_at, reverse=True
+        )[:FEED_ITEMS]
+
+    def item_title(self, item):
+        """Return the item title."""
+        return item.title
+
+    def item_description(self, item):
+        """Return the precomputed excerpt."""
+        return item.excerpt
+
+    def item_link(self, item):
+        """Return the reader detail URL of the item."""
+        return reverse(READER_DETAIL_ROUTES[type(item)], args=[item.pk])
+
+    def item_guid(self, item):
+        """Return a GUID unique across articles and newsletters."""
+        return f"{item._meta.model_name}-{item.pk}"
+
+    item_guid_is_permalink = False
+
+    def item_author_name(self, item):
+        """Return the author's username."""
+        return item.author.username
+
+    def item_pubdate(self, item):
+        """Return the creation time of the item."""
+        return item.created_at
+
+
+class PublisherFeed(SourceFeed):
+    """RSS feed of one publisher's approved content."""
+
+    def get_object(self, request, pk):
+        """Return the publisher."""
+        return get_object_or_404(Publisher, pk=pk)
+
+    def title(self, obj):
+        """Return the feed title."""
+        return f"{obj.name} - News Portal"
+
+    def link(self, obj):
+        """Return the feed's home link."""
+        return reverse("articles:home")
+
+    def description(self, obj):
+        """Return the feed description."""
+        return f"Latest articles and newsletters from {obj.name}."
+
+    def filter_items(self, queryset, obj):
+        """Keep items published by the publisher."""
+        return queryset.filter(publisher=obj)
+
+
+class PublisherAtomFeed(PublisherFeed):
+    """Atom feed of one publisher's approved content."""
+
+    feed_type = Atom1Feed
+    subtitle = PublisherFeed.description
+
+
+class JournalistFeed(SourceFeed):
+    """RSS feed of one journalist's approved content."""
+
+    def get_object(self, request, pk):
+        """Return the journalist."""
+        return get_object_or_404(Journalist.objects.select_related("user"), pk=pk)
+
+    def title(self, obj):
+        """Return the feed title."""
+        return f"{obj.user.username} - News Portal"
+
+    def link(self, obj):
+        """Return the feed's home link."""
+        return reverse("articles:home")
+
+    def description(self, obj):
+        """Return the feed description."""
+        return f"Latest articles and newsletters by {obj.user.username}."
+
+    def filter_items(self, queryset, obj):
+        """Keep items written by the journalist."""
+        return queryset.filter(author_id=obj.user_id)
+
+
+class JournalistAtomFeed(JournalistFeed):
+    """Atom feed of one journalist's approved content."""
+
+    feed_type = Atom1Feed
+    subtitle = JournalistFeed.description
+
+
+# ---------------- Cached views ----------------
+
+
+def cached_feed_view(feed, kind):
+    """
+    Wrap a feed in a versioned cache with conditional GET support.
+
+    Args:
+        feed (Feed): Feed instance to render on a cache miss.
+        kind (str): ``"publisher"`` or ``"journalist"``.
+
+    Returns:
+        callable: A view taking ``(request, pk)``.
+    """
+    feed_name = type(feed).__name__
+
+    @replica_reads
+    def view(request, pk):
+        version = get_feed_version(kind, pk)
+        # Bumps within one second run the version ahead of the clock; never
+        # claim a modification time in the future.
+        last_modified = min(version, int(time.time()))
+
+        etag = quote_etag(f"{feed_name}-{pk}-{version}")
+        not_modified = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if not_modified is not None:
+            return not_modified
+
+        key = f"feed:{feed_name}:{pk}:{version}"
+        cached = cache.get(key)
+        if cached is None:
+            rendered = feed(request, pk)
+            cached = (rendered.content, rendered["Content-Type"])
+            cache.set(
+                key, cached, timeout=getattr(settings, "FEED_CACHE_TIMEOUT", 86400)
+            )
+
+        response = HttpResponse(cached[0], content_type=cached[1])
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(last_modified)
+        patch_cache_control(response, public=True, max_age=60)
+        return response
+
+    return view
+
+
+publisher_feed = cached_feed_view(PublisherFeed(), "publisher")
+publisher_atom_feed = cached_feed_view(PublisherAtomFeed(), "publisher")
+journalist_feed = cached_feed_view(JournalistFeed(), "journalist")
+journalist_atom_feed = cached_feed_view(JournalistAtomFeed(), "journalist")
@@ -4,7 +4,8 @@ articles.forms
 Forms module for the Articles app.
 
 Contains form classes for creating and updating articles,
-including custom widgets for better UI/UX.
+including custom widgets for better UI/UX, and the BodyFormMixin used by
+every form editing an article or newsletter body.
 """
 
 from django import forms
@@ -12,12 +13,37 @@ from django import forms
 from .models import Article, Publisher
 
 
-class ArticleForm(forms.ModelForm):
+class BodyFormMixin:
+    """
+    Edit ``content`` on models that store it in a separate body table.
+
+    ``content`` is a model property rather than a field (see
+    ``articles.models.CompressedBodyModel``), so forms declare it
+    explicitly; this mixin fills its initial value from the instance and
+    assigns the cleaned value back before the instance is saved.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """Use the instance's body as the initial ``content``."""
+        super().__init__(*args, **kwargs)
+        if self.instance.pk is not None and "content" not in self.initial:
+            self.initial["content"] = self.instance.content
+
+    def clean(self):
+        """Stage the cleaned ``content`` on the instance."""
+        cleaned_data = super().clean()
+        if "content" in cleaned_data:
+            self.instance.content = cleaned_data["content"]
+        return cleaned_data
+
+
+class ArticleForm(BodyFormMixin, forms.ModelForm):
     """
     Form for creating and updating Article instances.
 
-    Uses custom widgets for title, content, publisher, author, and approval
-    status to enhance form presentation and usability.
+    Uses custom widgets for title, content, publisher, author, release time
+    and approval status to enhance form presentation and usability.
+    Approving an article with a future ``publish_at`` schedules it.
 
     Meta:
         model (Article): The Article model linked to this form.
@@ -25,22 +51,29 @@ class ArticleForm(forms.ModelForm):
         widgets (dict): Custom widgets for form fields.
     """
 
+    content = forms.CharField(
+        widget=forms.Textarea(
+            attrs={
+                "class": "form-control",
+                "rows": 10,
+                "placeholder": "Write the article content here...",
+            }
+        )
+    )
+
     class Meta:
         model = Article
-        fields = ["title", "content", "publisher", "is_approved"]
+        fields = ["title", "content", "publisher", "publish_at", "is_approved"]
         widgets = {
             "title": forms.TextInput(
                 attrs={"class": "form-control", "placeholder": "Enter article title"}
             ),
-            "content": forms.Textarea(
-                attrs={
-                    "class": "form-control",
-                    "rows": 10,
-                    "placeholder": "Write the article content here...",
-                }
-            ),
             "publisher": forms.Select(attrs={"class": "form-select"}),
             "author": forms.Select(attrs={"class": "form-select"}),
+            "publish_at": forms.DateTimeInput(
+                attrs={"class": "form-control", "type": "datetime-local"},
+                format="%Y-%m-%dT%H:%M",
+            ),
             "is_approved": forms.CheckboxInput(attrs={"class": "form-check-input"}),
         }
 
@@ -0,0 +1,111 @@
+"""
+articles.integrations
+
+Registry of optional third-party integrations, loaded lazily.
+
+Importing client libraries such as ``tweepy`` pulls in ``requests``,
+``oauthlib`` and friends, which would slow down every process start
+(``manage.py`` commands, tests, web workers) even when the integration is
+switched off. Integrations therefore register a loader here instead of
+importing their library at module level. The loader runs, and imports the
+library, on the first ``get()`` call only; it returns ``None`` when the
+integration is disabled. Successful results are cached per process.
+"""
+
+import logging
+import threading
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+logger = logging.getLogger(__name__)
+
+_loaders = {}
+_instances = {}
+_lock = threading.Lock()
+
+
+def register(name, settings_prefix=None):
+    """
+    Register a loader for an integration (decorator).
+
+    Args:
+        name (str): Integration name used with ``get()``.
+        settings_prefix (str, optional): Settings whose names start with this
+            prefix reset the cached instance when changed (e.g. in tests).
+
+    Returns:
+        callable: Decorator storing the loader.
+    """
+
+    def decorator(loader):
+        _loaders[name] = (loader, settings_prefix)
+        return loader
+
+    return decorator
+
+
+def get(name):
+    """
+    Return the integration's client, loading it on first use.
+
+    Args:
+        name (str): Registered integration name.
+
+    Returns:
+        object or None: The client, or None if disabled or failing to load.
+    """
+    if name in _instances:
+        return _instances[name]
+    loader, _ = _loaders[name]
+    with _lock:
+        if name not in _instances:
+            try:
+                instance = loader()
+            except Exception:
+                logger.exception("Could not load the %s integration.", name)
+                return None
+            if instance is None:
+                return None
+            _instances[name] = instance
+    return _instances[name]
+
+
+def reset(name=None):
+    """Forget cached clients so the next ``get()`` loads them again."""
+    with _lock:
+        if name is None:
+            _instances.clear()
+        else:
+            _instances.pop(name, None)
+
+
+@receiver(setting_changed)
+def _reset_on_setting_changed(sender, setting, **kwargs):
+    """Drop clients whose settings were overridden."""
+    for name, (_, prefix) in _loaders.items():
+        if prefix and setting.startswith(prefix):
+            reset(name)
+
+
+# ---------------- Integrations ----------------
+
+
+@register("twitter", settings_prefix="TWITTER_")
+def load_twitter():
+    """
+    Return an authenticated Tweepy client, or None if Twitter is disabled.
+
+    ``tweepy`` is only imported when ``TWITTER_ENABLED`` is set.
+    """
+    if not settings.TWITTER_ENABLED:
+        return None
+    import tweepy
+
+    return tweepy.Client(
+        consumer_key=settings.TWITTER_API_KEY,
+        consumer_secret=settings.TWITTER_API_SECRET,
+        access_token=settings.TWITTER_ACCESS_TOKEN,
+        access_token_secret=settings.TWITTER_ACCESS_SECRET,
+    )
@@ -0,0 +1,76 @@
+"""
+articles.management.commands.archive_content
+
+Management command that moves old approved articles and newsletters into
+the archive tables (see ``articles.archive``).
+
+Each batch is one transaction; the command sleeps between batches so a
+large backlog can be archived on a live database.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from articles.archive import archive
+from articles.models import Article
+from newsletters.models import Newsletter
+
+MODELS = {"article": Article, "newsletter": Newsletter}
+
+
+class Command(BaseCommand):
+    """
+    Archive old content in throttled batches.
+
+    Example::
+
+        python manage.py archive_content --days 365 --batch-size 500 --pause 0.5
+    """
+
+    help = "Move approved content older than --days into the archive tables."
+
+    def add_arguments(self, parser):
+        """Register command-line arguments."""
+        parser.add_argument(
+            "--model",
+            choices=sorted(MODELS),
+            action="append",
+            help="Model to archive (repeatable; default: all).",
+        )
+        parser.add_argument(
+            "--days",
+            type=int,
+            help="Minimum age in days (default: ARCHIVE_AFTER_DAYS).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            help="Items per batch (default: ARCHIVE_BATCH_SIZE).",
+        )
+        parser.add_argument(
+            "--pause",
+            type=float,
+            help="Seconds between batches (default: ARCHIVE_BATCH_PAUSE).",
+        )
+        parser.add_argument(
+            "--max-batches",
+            type=int,
+            help="Stop after this many batches per model.",
+        )
+
+    def handle(self, *args, **options):
+        """Archive each selected model."""
+        for name in ("days", "batch_size", "max_batches"):
+            if options[name] is not None and options[name] < 1:
+                raise CommandError(f"--{name.replace('_', '-')} must be at least 1.")
+        if options["pause"] is not None and options["pause"] < 0:
+            raise CommandError("--pause cannot be negative.")
+
+        for name in options["model"] or sorted(MODELS):
+            total = archive(
+                MODELS[name],
+                days=options["days"],
+                batch_size=options["batch_size"],
+                pause=options["pause"],
+                max_batches=options["max_batches"],
+            )
+            self.stdout.write(self.style.SUCCESS(f"Archived {total} {name}(s)."))
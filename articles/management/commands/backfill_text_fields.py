@@ -0,0 +1,85 @@
+"""
+articles.management.commands.backfill_text_fields
+
+Management command that fills the precomputed excerpt, word count and
+reading time columns for existing articles and newsletters.
+
+Rows are processed in primary-key order, one batch per transaction, with
+``bulk_update`` so model ``save()`` and its signals are never triggered.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from articles.models import Article, body_text, derive_text_fields
+from newsletters.models import Newsletter
+
+MODELS = {"article": Article, "newsletter": Newsletter}
+
+DERIVED_FIELDS = ["excerpt", "word_count", "reading_time"]
+
+
+class Command(BaseCommand):
+    """
+    Recompute derived text fields in batches.
+
+    Example::
+
+        python manage.py backfill_text_fields --batch-size 500
+    """
+
+    help = "Backfill excerpt, word_count and reading_time in batches."
+
+    def add_arguments(self, parser):
+        """Register command-line arguments."""
+        parser.add_argument(
+            "--model",
+            choices=sorted(MODELS),
+            action="append",
+            help="Model to backfill (repeatable; default: all).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Rows per batch (default: 500).",
+        )
+
+    def handle(self, *args, **options):
+        """Backfill each selected model."""
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+        for name in options["model"] or sorted(MODELS):
+            total = self._backfill(MODELS[name], options["batch_size"])
+            self.stdout.write(self.style.SUCCESS(f"Backfilled {total} {name}(s)."))
+
+    def _backfill(self, model, batch_size):
+        """Recompute derived fields for every row of ``model``."""
+        last_pk = total = 0
+        while True:
+            rows = list(
+                model.objects.filter(pk__gt=last_pk)
+                .order_by("pk")
+                .values_list("pk", *model.BODY_VALUES)[:batch_size]
+            )
+            if not rows:
+                return total
+
+            objs = []
+            for pk, legacy_content, data in rows:
+                excerpt, word_count, reading_time = derive_text_fields(
+                    body_text(legacy_content, data)
+                )
+                objs.append(
+                    model(
+                        pk=pk,
+                        excerpt=excerpt,
+                        word_count=word_count,
+                        reading_time=reading_time,
+                    )
+                )
+            with transaction.atomic():
+                model.objects.bulk_update(objs, DERIVED_FIELDS)
+
+            total += len(rows)
+            last_pk = rows[-1][0]
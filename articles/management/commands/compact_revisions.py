@@ -0,0 +1,58 @@
+"""
+articles.management.commands.compact_revisions
+
+Management command that applies the article revision retention policy
+(see ``articles.revisions``).
+
+Revisions older than ``--days`` are thinned to the last one of each day
+and the remaining diffs are re-encoded, one article per transaction.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from articles.revisions import compact
+
+
+class Command(BaseCommand):
+    """
+    Compact old article revisions.
+
+    Example::
+
+        python manage.py compact_revisions --days 30
+    """
+
+    help = "Thin article revisions older than --days to one per day."
+
+    def add_arguments(self, parser):
+        """Register command-line arguments."""
+        parser.add_argument(
+            "--days",
+            type=int,
+            help="Minimum age in days (default: REVISION_KEEP_DAYS).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Articles scanned per query (default: 500).",
+        )
+
+    def handle(self, *args, **options):
+        """Compact the revisions and report the space saved."""
+        if options["days"] is not None and options["days"] < 0:
+            raise CommandError("--days cannot be negative.")
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+        totals = compact(days=options["days"], batch_size=options["batch_size"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Dropped {totals['dropped']} revision(s) of "
+                f"{totals['articles']} article(s)."
+            )
+        )
+        if totals["articles"]:
+            self.stdout.write(
+                f"  {totals['bytes_before']} -> {totals['bytes_after']} bytes "
+                "of revision data."
+            )
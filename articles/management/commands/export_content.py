@@ -0,0 +1,81 @@
+"""
+articles.management.commands.export_content
+
+Management command for streaming articles, newsletters or subscriptions to
+NDJSON or CSV, optionally gzipped, with bounded memory use.
+"""
+
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from articles.exports import (
+    DEFAULT_CHUNK_SIZE,
+    EXPORTS,
+    FORMATS,
+    parse_bound,
+    stream_export,
+)
+
+
+class Command(BaseCommand):
+    """
+    Export content to a file or standard output.
+
+    Example::
+
+        python manage.py export_content articles --format csv --gzip \\
+            --since 2025-01-01 --output articles.csv.gz
+    """
+
+    help = "Stream articles, newsletters or subscriptions as NDJSON or CSV."
+
+    def add_arguments(self, parser):
+        """Register command-line arguments."""
+        parser.add_argument("kind", choices=sorted(EXPORTS))
+        parser.add_argument("--format", choices=FORMATS, default="ndjson")
+        parser.add_argument("--gzip", action="store_true", help="Gzip the output.")
+        parser.add_argument("--publisher", type=int, help="Filter by publisher id.")
+        parser.add_argument("--since", help="Created on/after (ISO date/datetime).")
+        parser.add_argument("--until", help="Created on/before (ISO date/datetime).")
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help=f"Rows fetched per query (default: {DEFAULT_CHUNK_SIZE}).",
+        )
+        parser.add_argument(
+            "--output", default="-", help="Output path, or '-' for stdout."
+        )
+
+    def handle(self, *args, **options):
+        """Write the export."""
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size must be at least 1.")
+        try:
+            since = parse_bound(options["since"])
+            until = parse_bound(options["until"], end_of_day=True)
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        chunks = stream_export(
+            options["kind"],
+            fmt=options["format"],
+            compress=options["gzip"],
+            publisher=options["publisher"],
+            since=since,
+            until=until,
+            chunk_size=options["chunk_size"],
+        )
+
+        if options["output"] == "-":
+            out = sys.stdout.buffer
+            for chunk in chunks:
+                out.write(chunk)
+            out.flush()
+            return
+
+        with open(options["output"], "wb") as handle:
+            for chunk in chunks:
+                handle.write(chunk)
+        self.stderr.write(f"Wrote {options['kind']} export to {options['output']}")
@@ -0,0 +1,113 @@
+"""
+articles.management.commands.move_content_bodies
+
+Management command that moves inline article and newsletter bodies into
+their compressed body tables (see ``articles.models.CompressedBodyModel``).
+
+Rows whose ``legacy_content`` column is still filled, from before the
+split or from ``import_content``, are compressed into ``ArticleBody`` /
+``NewsletterBody`` in primary-key order, one batch per transaction, and
+the inline column is cleared. Model ``save()`` and its signals are never
+triggered. The command reports how many bytes the main tables no longer
+carry per row, i.e. what every list query and table scan stops reading.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from articles.models import Article, compress_body
+from newsletters.models import Newsletter
+
+MODELS = {"article": Article, "newsletter": Newsletter}
+
+
+class Command(BaseCommand):
+    """
+    Compress inline bodies into the body tables.
+
+    Example::
+
+        python manage.py move_content_bodies --batch-size 500
+    """
+
+    help = "Move inline content bodies into the compressed body tables."
+
+    def add_arguments(self, parser):
+        """Register command-line arguments."""
+        parser.add_argument(
+            "--model",
+            choices=sorted(MODELS),
+            action="append",
+            help="Model to process (repeatable; default: all).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Rows per batch (default: 500).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report the expected savings; change nothing.",
+        )
+
+    def handle(self, *args, **options):
+        """Move the bodies of each selected model and report the savings."""
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+        for name in options["model"] or sorted(MODELS):
+            model = MODELS[name]
+            rows, raw, compressed = self._move(
+                model, options["batch_size"], options["dry_run"]
+            )
+            total = model.objects.count()
+            verb = "Would move" if options["dry_run"] else "Moved"
+            self.stdout.write(
+                self.style.SUCCESS(f"{verb} the bodies of {rows} {name}(s).")
+            )
+            if rows:
+                self.stdout.write(
+                    f"  {raw} bytes inline -> {compressed} bytes compressed "
+                    f"({compressed / raw:.0%} of the original size)."
+                )
+                self.stdout.write(
+                    f"  {raw / total:.0f} bytes less per {name} row on average "
+                    f"in list queries and table scans ({total} rows)."
+                )
+
+    def _move(self, model, batch_size, dry_run):
+        """
+        Compress the inline bodies of ``model`` batch by batch.
+
+        Returns:
+            tuple: ``(rows, raw_bytes, compressed_bytes)``.
+        """
+        body_model = model._meta.get_field("body").related_model
+        rows = raw = compressed = 0
+        last_pk = 0
+        while True:
+            with transaction.atomic():
+                batch = list(
+                    model.objects.select_for_update()
+                    .filter(pk__gt=last_pk)
+                    .exclude(legacy_content="")
+                    .order_by("pk")
+                    .values_list("pk", "legacy_content")[:batch_size]
+                )
+                if not batch:
+                    return rows, raw, compressed
+                bodies = [
+                    body_model(pk=pk, data=compress_body(content))
+                    for pk, content in batch
+                ]
+                if not dry_run:
+                    pks = [pk for pk, _ in batch]
+                    body_model.objects.filter(pk__in=pks).delete()
+                    body_model.objects.bulk_create(bodies)
+                    model.objects.filter(pk__in=pks).update(legacy_content="")
+
+            rows += len(batch)
+            raw += sum(len(content.encode("utf-8")) for _, content in batch)
+            compressed += sum(len(body.data) for body in bodies)
+            last_pk = batch[-1][0]
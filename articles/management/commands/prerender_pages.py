@@ -0,0 +1,132 @@
+"""
+articles.management.commands.prerender_pages
+
+Management command that rebuilds the pre-rendered static detail pages for
+all approved articles and newsletters across a pool of worker processes,
+and removes files left behind for items that are no longer approved.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from articles import prerender
+
+MODELS = {"article": "articles.Article", "newsletter": "newsletters.Newsletter"}
+
+
+def _init_worker():
+    """Prepare a worker process (needed when processes are spawned)."""
+    django.setup()
+    connections.close_all()
+
+
+def _render_chunk(label, pks):
+    """
+    Render the static pages for one chunk of primary keys.
+
+    Args:
+        label (str): Model label such as ``articles.Article``.
+        pks (list[int]): Primary keys to render.
+
+    Returns:
+        int: Number of pages written.
+    """
+    model = apps.get_model(label)
+    written = 0
+    queryset = model.objects.filter(pk__in=pks, is_approved=True).select_related(
+        "author", "publisher"
+    )
+    for instance in queryset:
+        prerender.write_page(instance)
+        written += 1
+    return written
+
+
+class Command(BaseCommand):
+    """
+    Rebuild static detail pages in parallel.
+
+    Example::
+
+        python manage.py prerender_pages --workers 8
+    """
+
+    help = "Rebuild pre-rendered static pages for approved content."
+
+    def add_arguments(self, parser):
+        """Register command-line arguments."""
+        parser.add_argument(
+            "--model",
+            choices=sorted(MODELS),
+            action="append",
+            help="Model to rebuild (repeatable; default: all).",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Number of worker processes (default: CPU count).",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=200,
+            help="Items rendered per task (default: 200).",
+        )
+
+    def handle(self, *args, **options):
+        """Render every approved item and prune stale files."""
+        if options["workers"] < 1 or options["chunk_size"] < 1:
+            raise CommandError("--workers and --chunk-size must be at least 1.")
+        self.stdout.write(f"Writing static pages to {settings.STATIC_PAGES_ROOT}")
+
+        for name in options["model"] or sorted(MODELS):
+            label = MODELS[name]
+            model = apps.get_model(label)
+            started = time.monotonic()
+            pks = list(
+                model.objects.filter(is_approved=True)
+                .order_by("pk")
+                .values_list("pk", flat=True)
+            )
+            chunks = [
+                pks[i : i + options["chunk_size"]]
+                for i in range(0, len(pks), options["chunk_size"])
+            ]
+
+            written = 0
+            if chunks:
+                # Forked workers must not share the parent's DB connections.
+                connections.close_all()
+                with ProcessPoolExecutor(
+                    max_workers=options["workers"], initializer=_init_worker
+                ) as pool:
+                    for count in pool.map(_render_chunk, [label] * len(chunks), chunks):
+                        written += count
+
+            removed = self._prune(model, set(pks))
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{name}: wrote {written} page(s), removed {removed} stale "
+                    f"page(s) in {time.monotonic() - started:.2f}s."
+                )
+            )
+
+    def _prune(self, model, approved):
+        """Remove files for items that are not (or no longer) approved."""
+        directory = prerender.page_path(model, 0).parent
+        if not directory.is_dir():
+            return 0
+        removed = 0
+        for path in directory.glob("*.html"):
+            if path.stem.isdigit() and int(path.stem) not in approved:
+                prerender.remove_page(model, int(path.stem))
+                removed += 1
+        return removed
@@ -0,0 +1,91 @@
+"""
+articles.management.commands.publish_scheduled
+
+Management command that releases scheduled articles and newsletters once
+their ``publish_at`` has passed (see ``articles.scheduling``).
+
+By default it runs as a long-lived scheduler: after each pass it sleeps
+until the next scheduled release or ``SCHEDULER_INTERVAL`` seconds,
+whichever comes first. ``--once`` makes a single pass, for cron. Several
+schedulers can run at the same time; each due item is claimed by exactly
+one of them. Database connections are recycled around every sleep, as a
+request would, so ``CONN_MAX_AGE`` and server-side timeouts are honoured.
+"""
+
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+from django.utils import timezone
+
+from articles.scheduling import next_release, release_due
+
+# Shortest sleep between passes, so items locked by another scheduler are
+# not polled in a busy loop.
+MIN_SLEEP = 1.0
+
+
+class Command(BaseCommand):
+    """
+    Release due scheduled content.
+
+    Example::
+
+        python manage.py publish_scheduled --interval 30
+    """
+
+    help = "Publish approved content whose publish_at has passed."
+
+    def add_arguments(self, parser):
+        """Register command-line arguments."""
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Make a single pass and exit.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            help="Longest sleep between passes (default: SCHEDULER_INTERVAL).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            help="Items per transaction (default: SCHEDULER_BATCH_SIZE).",
+        )
+        parser.add_argument(
+            "--max-batches",
+            type=int,
+            help="Stop each pass after this many batches per model.",
+        )
+
+    def handle(self, *args, **options):
+        """Run one pass, or keep running passes until interrupted."""
+        for name in ("batch_size", "max_batches"):
+            if options[name] is not None and options[name] < 1:
+                raise CommandError(f"--{name.replace('_', '-')} must be at least 1.")
+        interval = options["interval"]
+        if interval is None:
+            interval = getattr(settings, "SCHEDULER_INTERVAL", 30)
+        if interval < MIN_SLEEP:
+            raise CommandError(f"--interval must be at least {MIN_SLEEP} seconds.")
+
+        while True:
+            close_old_connections()
+            released = release_due(
+                batch_size=options["batch_size"], max_batches=options["max_batches"]
+            )
+            for name, total in released.items():
+                if total or options["once"]:
+                    self.stdout.write(
+                        self.style.SUCCESS(f"Released {total} {name}(s).")
+                    )
+            if options["once"]:
+                return
+            upcoming = next_release()
+            pause = interval
+            if upcoming is not None:
+                pause = min(interval, (upcoming - timezone.now()).total_seconds())
+            close_old_connections()
+            time.sleep(max(MIN_SLEEP, pause))
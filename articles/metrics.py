@@ -0,0 +1,162 @@
+"""
+articles.metrics
+
+Counters and latency histograms for subscriber notifications and
+scheduled releases.
+
+Values are kept in the default cache, like the page cache counters, so all
+worker processes share them when a shared backend (Redis, Memcached) is
+configured. ``render()`` returns every metric in the Prometheus text
+exposition format; it is served by the protected ``metrics`` view.
+
+Only the metrics declared in ``COUNTERS`` and ``HISTOGRAMS`` can be
+recorded, which keeps the set of cache keys fixed and known to
+``render()``.
+"""
+
+import time
+from contextlib import contextmanager
+
+from django.core.cache import cache
+
+from . import page_cache
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+FANOUT_BUCKETS = (0, 1, 10, 50, 100, 500, 1000, 5000, 10000)
+DELAY_BUCKETS = (1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600)
+
+COUNTERS = {
+    "news_portal_notifications_total": (
+        "Approval notifications processed (single items and batches)."
+    ),
+    "news_portal_emails_sent_total": "Notification and digest emails sent.",
+    "news_portal_emails_failed_total": "Notification and digest emails that failed.",
+    "news_portal_tweets_posted_total": "Tweets posted.",
+    "news_portal_tweets_failed_total": "Tweets that failed to post.",
+    "news_portal_scheduled_releases_total": "Scheduled items released.",
+    "news_portal_api_throttled_total": "Subscriber API requests throttled.",
+}
+
+HISTOGRAMS = {
+    "news_portal_subscriber_resolution_seconds": (
+        "Time spent resolving the subscribed readers of a notification.",
+        LATENCY_BUCKETS,
+    ),
+    "news_portal_notification_recipients": (
+        "Readers emailed per notification.",
+        FANOUT_BUCKETS,
+    ),
+    "news_portal_email_send_seconds": (
+        "Time spent in one email send call (single or mass send).",
+        LATENCY_BUCKETS,
+    ),
+    "news_portal_tweet_seconds": ("Time spent posting one tweet.", LATENCY_BUCKETS),
+    "news_portal_release_delay_seconds": (
+        "Delay between an item's publish_at and its actual release.",
+        DELAY_BUCKETS,
+    ),
+}
+
+# Histogram sums are stored as integers so the cache can increment them.
+SUM_SCALE = 1_000_000
+
+
+def _incr(key, amount=1):
+    """Increment a cache counter by ``amount``, creating it if needed."""
+    if not amount:
+        return
+    if cache.add(key, amount, timeout=None):
+        return
+    try:
+        cache.incr(key, amount)
+    except ValueError:
+        # The counter expired or was evicted between add() and incr().
+        cache.add(key, amount, timeout=None)
+
+
+def inc(name, amount=1):
+    """
+    Increment a counter.
+
+    Args:
+        name (str): Name declared in ``COUNTERS``.
+        amount (int): Value to add.
+    """
+    if name not in COUNTERS:
+        raise KeyError(f"Unknown counter {name!r}")
+    _incr(f"metrics:{name}", amount)
+
+
+def observe(name, value):
+    """
+    Record one observation in a histogram.
+
+    Args:
+        name (str): Name declared in ``HISTOGRAMS``.
+        value (float): Observed value (seconds, recipients, ...).
+    """
+    _, buckets = HISTOGRAMS[name]
+    bucket = next((b for b in buckets if value <= b), "+Inf")
+    _incr(f"metrics:{name}:bucket:{bucket}")
+    _incr(f"metrics:{name}:count")
+    _incr(f"metrics:{name}:sum", int(value * SUM_SCALE))
+
+
+@contextmanager
+def timer(name):
+    """Record the duration of the ``with`` block in a histogram."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - started)
+
+
+def _format(value):
+    """Format a number the way Prometheus expects."""
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render():
+    """
+    Return all metrics in the Prometheus text exposition format.
+
+    Returns:
+        str: Exposition text, one metric family after another.
+    """
+    keys = [f"metrics:{name}" for name in COUNTERS]
+    for name, (_, buckets) in HISTOGRAMS.items():
+        keys += [f"metrics:{name}:bucket:{b}" for b in (*buckets, "+Inf")]
+        keys += [f"metrics:{name}:count", f"metrics:{name}:sum"]
+    values = cache.get_many(keys)
+
+    lines = []
+    for name, help_text in COUNTERS.items():
+        lines += [
+            f"# HELP {name} {help_text}",
+            f"# TYPE {name} counter",
+            f"{name} {values.get(f'metrics:{name}', 0)}",
+        ]
+
+    for name, (help_text, buckets) in HISTOGRAMS.items():
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+        cumulative = 0
+        for bucket in (*buckets, "+Inf"):
+            cumulative += values.get(f"metrics:{name}:bucket:{bucket}", 0)
+            lines.append(f'{name}_bucket{{le="{_format(bucket)}"}} {cumulative}')
+        total = values.get(f"metrics:{name}:sum", 0) / SUM_SCALE
+        lines += [
+            f"{name}_sum {_format(total)}",
+            f"{name}_count {values.get(f'metrics:{name}:count', 0)}",
+        ]
+
+    stats = page_cache.stats()
+    lines += [
+        "# HELP news_portal_page_cache_hits_total Detail page cache hits.",
+        "# TYPE news_portal_page_cache_hits_total counter",
+        f"news_portal_page_cache_hits_total {stats['hits']}",
+        "# HELP news_portal_page_cache_misses_total Detail page cache misses.",
+        "# TYPE news_portal_page_cache_misses_total counter",
+        f"news_portal_page_cache_misses_total {stats['misses']}",
+    ]
+    return "\n".join(lines) + "\n"
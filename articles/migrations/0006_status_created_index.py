@@ -0,0 +1,25 @@
+# Generated by Django 5.2.5 on 2026-10-19 09:28
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        (
+            "articles",
+            "0005_remove_newsletter_author_remove_newsletter_publisher_and_more",
+        ),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="article",
+            index=models.Index(
+                fields=["is_approved", "created_at", "id"],
+                name="article_status_created_idx",
+            ),
+        ),
+    ]
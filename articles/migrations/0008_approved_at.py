@@ -0,0 +1,20 @@
+# Generated by Django 5.2.5 on 2026-10-19 09:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("articles", "0007_derived_text_fields"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="article",
+            name="approved_at",
+            field=models.DateTimeField(
+                blank=True, db_index=True, editable=False, null=True
+            ),
+        ),
+    ]
@@ -0,0 +1,96 @@
+# Generated by Django 5.2.5 on 2026-10-19 09:59
+
+import unicodedata
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def normalize_name(name):
+    """
+    Frozen copy of ``articles.models.normalize_name`` as of this migration.
+
+    Kept here so later changes to the live function do not alter what this
+    migration writes.
+    """
+    decomposed = unicodedata.normalize("NFKD", name or "")
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(stripped.casefold().split())[:255]
+
+
+def backfill_directory(apps, schema_editor):
+    """Fill normalized names and subscriber counts of existing sources."""
+    Publisher = apps.get_model("articles", "Publisher")
+    Journalist = apps.get_model("articles", "Journalist")
+    Subscription = apps.get_model("subscriptions", "Subscription")
+
+    for model, name_field in ((Publisher, "name"), (Journalist, "user__username")):
+        field = model._meta.model_name
+        for pk, name in model.objects.values_list("pk", name_field).iterator():
+            model.objects.filter(pk=pk).update(normalized_name=normalize_name(name))
+        counts = (
+            Subscription.objects.filter(**{field: OuterRef("pk")})
+            .values(field)
+            .annotate(total=Count("pk"))
+            .values("total")
+        )
+        model.objects.update(subscriber_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("articles", "0008_approved_at"),
+        ("subscriptions", "0004_subscription_constraints"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="journalist",
+            name="normalized_name",
+            field=models.CharField(blank=True, editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name="journalist",
+            name="subscriber_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="publisher",
+            name="normalized_name",
+            field=models.CharField(blank=True, editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name="publisher",
+            name="subscriber_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_directory, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="journalist",
+            index=models.Index(
+                fields=["normalized_name", "id"], name="journalist_dir_name"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="journalist",
+            index=models.Index(
+                fields=["subscriber_count", "id"], name="journalist_dir_popular"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="publisher",
+            index=models.Index(
+                fields=["normalized_name", "id"], name="publisher_dir_name"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="publisher",
+            index=models.Index(
+                fields=["subscriber_count", "id"], name="publisher_dir_popular"
+            ),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.5 on 2026-10-19 10:05
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("articles", "0009_directory_fields"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArticleViewCount",
+            fields=[
+                (
+                    "article",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="view_count",
+                        serialize=False,
+                        to="articles.article",
+                    ),
+                ),
+                ("views", models.PositiveBigIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(default=django.utils.timezone.now)),
+                (
+                    "publisher",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="articles.publisher",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Article view count",
+                "verbose_name_plural": "Article view counts",
+                "indexes": [
+                    models.Index(
+                        fields=["publisher", "views"], name="viewcount_publisher_views"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.5 on 2026-10-19 10:33
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("articles", "0013_article_revision"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="article",
+            name="is_scheduled",
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.AddField(
+            model_name="article",
+            name="publish_at",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="Release time; leave empty to publish on approval.",
+                null=True,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="article",
+            index=models.Index(
+                fields=["is_scheduled", "publish_at"], name="article_scheduled_idx"
+            ),
+        ),
+    ]
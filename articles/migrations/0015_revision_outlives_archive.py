@@ -0,0 +1,24 @@
+# Generated by Django 5.2.5 on 2026-10-19 10:51
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("articles", "0014_scheduled_publishing"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="articlerevision",
+            name="article",
+            field=models.ForeignKey(
+                db_constraint=False,
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="revisions",
+                to="articles.article",
+            ),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.5 on 2026-10-19 10:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("articles", "0015_revision_outlives_archive"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="articleviewcount",
+            name="article",
+            field=models.OneToOneField(
+                db_constraint=False,
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                primary_key=True,
+                related_name="view_count",
+                serialize=False,
+                to="articles.article",
+            ),
+        ),
+    ]
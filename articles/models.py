@@ -3,19 +3,399 @@ articles.models
 
 Models module for the Articles app.
 
-Defines Publisher, Article, and Journalist models with their fields,
-relationships, and string representations. Supports editor/journalist
-assignments and article management.
+Defines Publisher, Article, ArticleBody, ArticleRevision,
+ArchivedArticle, ArticleViewCount and Journalist models with their
+fields, relationships, and string representations. Supports
+editor/journalist assignments and article management. Also provides the
+DerivedTextModel, ApprovalStampModel, ScheduledPublishModel,
+CompressedBodyModel, ContentBodyModel and ArchivedContentModel bases
+shared with newsletters, and the DirectoryEntryModel base backing the
+publisher/journalist directory.
 """
 
+import math
+import unicodedata
+import zlib
+
 from django.conf import settings
-from django.db import models
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import models, transaction
+from django.utils import timezone
+from django.utils.text import Truncator
+
+EXCERPT_WORDS = 50
+EXCERPT_MAX_LENGTH = 500
+WORDS_PER_MINUTE = 200
+DIRECTORY_NAME_LENGTH = 255
+BODY_COMPRESSION_LEVEL = 6
+
+
+def derive_text_fields(content):
+    """
+    Compute the excerpt, word count and reading time for a body of text.
+
+    Args:
+        content (str): Full article or newsletter body.
+
+    Returns:
+        tuple: ``(excerpt, word_count, reading_time_minutes)``.
+    """
+    content = content or ""
+    word_count = len(content.split())
+    excerpt = Truncator(Truncator(content).words(EXCERPT_WORDS)).chars(
+        EXCERPT_MAX_LENGTH
+    )
+    reading_time = math.ceil(word_count / WORDS_PER_MINUTE) if word_count else 0
+    return excerpt, word_count, reading_time
+
+
+def normalize_name(name):
+    """
+    Return the search key of a publisher or journalist name.
+
+    Accents are stripped, case is folded and whitespace is collapsed, so
+    ``"  Le  Monde"`` and ``"le monde"`` share the key ``"le monde"``.
+
+    Args:
+        name (str): Display name.
+
+    Returns:
+        str: Normalized name used for prefix search and ordering.
+    """
+    decomposed = unicodedata.normalize("NFKD", name or "")
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(stripped.casefold().split())[:DIRECTORY_NAME_LENGTH]
+
+
+# ----------------------------
+# Derived text fields
+# ----------------------------
+class DerivedTextModel(models.Model):
+    """
+    Abstract base storing small fields derived from ``content``.
+
+    Lists, emails and API summaries read these columns instead of loading
+    and truncating the full body. ``save()`` refreshes them whenever the
+    content may have changed: when it has been assigned or loaded, or is
+    listed in ``update_fields``. A save that never touched the body does not
+    read it. Paths that bypass ``save()`` (``bulk_create``) must call
+    ``refresh_derived_text()`` themselves, and existing rows can be filled
+    with the ``backfill_text_fields`` command.
+
+    Attributes:
+        excerpt (CharField): First words of the content.
+        word_count (PositiveIntegerField): Number of words in the content.
+        reading_time (PositiveSmallIntegerField): Estimated minutes to read.
+    """
+
+    excerpt = models.CharField(
+        max_length=EXCERPT_MAX_LENGTH, blank=True, editable=False
+    )
+    word_count = models.PositiveIntegerField(default=0, editable=False)
+    reading_time = models.PositiveSmallIntegerField(
+        default=0, editable=False, help_text="Estimated reading time in minutes."
+    )
+
+    class Meta:
+        abstract = True
+
+    def refresh_derived_text(self):
+        """Recompute the derived fields from the current ``content``."""
+        self.excerpt, self.word_count, self.reading_time = derive_text_fields(
+            self.content
+        )
+
+    def content_is_loaded(self):
+        """Return True if ``content`` is in memory (assigned or loaded)."""
+        if "content" in self.get_deferred_fields():
+            return False
+        # CompressedBodyModel keeps the lazily read body in ``_content``.
+        return getattr(self, "_content", "") is not None
+
+    def save(self, *args, **kwargs):
+        """Refresh the derived fields before saving if ``content`` may differ."""
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None:
+            if self.content_is_loaded():
+                self.refresh_derived_text()
+        elif "content" in update_fields:
+            self.refresh_derived_text()
+            kwargs["update_fields"] = set(update_fields) | {
+                "excerpt",
+                "word_count",
+                "reading_time",
+            }
+        super().save(*args, **kwargs)
+
+
+# ----------------------------
+# Approval timestamp
+# ----------------------------
+class ApprovalStampModel(models.Model):
+    """
+    Abstract base recording when an item was approved.
+
+    ``approved_at`` is set the first time an item is saved as approved and
+    cleared when it is rejected. Digest emails use it to find the items
+    approved within a delivery window. Paths that bypass ``save()`` (queryset
+    ``update`` and ``bulk_create``) must set it themselves.
+
+    Attributes:
+        approved_at (DateTimeField): When the item was last approved.
+    """
+
+    approved_at = models.DateTimeField(
+        null=True, blank=True, editable=False, db_index=True
+    )
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        """Stamp or clear ``approved_at`` to match ``is_approved``."""
+        if self.is_approved and self.approved_at is None:
+            self.approved_at = timezone.now()
+        elif not self.is_approved:
+            self.approved_at = None
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "is_approved" in update_fields:
+            kwargs["update_fields"] = set(update_fields) | {"approved_at"}
+        super().save(*args, **kwargs)
+
+
+# ----------------------------
+# Scheduled publishing
+# ----------------------------
+class ScheduledPublishModel(models.Model):
+    """
+    Abstract base letting an approved item wait for a release time.
+
+    Approving an item whose ``publish_at`` lies in the future does not
+    publish it: ``is_approved`` stays False and ``is_scheduled`` is set, so
+    readers, feeds and notifications do not see it yet. The
+    ``publish_scheduled`` command releases due items in batches (see
+    ``articles.scheduling``). Clearing ``publish_at`` cancels the schedule.
+    Must come before ``ApprovalStampModel`` in the bases so the approval is
+    held back before it is stamped.
+
+    Attributes:
+        publish_at (DateTimeField): Requested release time, if any.
+        is_scheduled (BooleanField): Approved and waiting for ``publish_at``.
+    """
+
+    publish_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Release time; leave empty to publish on approval.",
+    )
+    is_scheduled = models.BooleanField(default=False, editable=False)
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        """Hold back an approval until ``publish_at``."""
+        if self.is_approved and self.publish_at and self.publish_at > timezone.now():
+            self.is_approved = False
+            self.is_scheduled = True
+        elif self.is_approved or self.publish_at is None:
+            self.is_scheduled = False
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"is_approved", "publish_at"} & set(
+            update_fields
+        ):
+            kwargs["update_fields"] = set(update_fields) | {
+                "is_approved",
+                "is_scheduled",
+            }
+        super().save(*args, **kwargs)
+
+
+# ----------------------------
+# Compressed body storage
+# ----------------------------
+def compress_body(text):
+    """Return the zlib-compressed UTF-8 encoding of a body."""
+    return zlib.compress((text or "").encode("utf-8"), BODY_COMPRESSION_LEVEL)
+
+
+def body_text(legacy_content, data):
+    """
+    Return a body from the columns listed in ``CompressedBodyModel.BODY_VALUES``.
+
+    Args:
+        legacy_content (str): Inline body not moved yet (may be empty).
+        data (bytes or None): Compressed body, or None without a body row.
+
+    Returns:
+        str: The body text.
+    """
+    if legacy_content:
+        return legacy_content
+    return zlib.decompress(data).decode("utf-8") if data is not None else ""
+
+
+class ContentBodyModel(models.Model):
+    """
+    Abstract base for the 1:1 table holding a compressed body.
+
+    Attributes:
+        data (BinaryField): zlib-compressed UTF-8 body.
+    """
+
+    data = models.BinaryField()
+
+    class Meta:
+        abstract = True
+
+    @property
+    def text(self):
+        """Return the decompressed body."""
+        return body_text("", self.data)
+
+
+class CompressedBodyModel(models.Model):
+    """
+    Abstract base keeping ``content`` out of the main table.
+
+    The body lives zlib-compressed in a 1:1 ``ContentBodyModel`` reached as
+    ``body``, so list queries, admin changelists and ``SELECT *`` on the
+    main table never carry it. ``content`` stays a plain attribute: it is
+    read lazily from the body row (one query, or none after
+    ``select_related("body")`` / ``prefetch_related("body")``), can be
+    passed to the constructor and ``create()``, and is written to the body
+    row by ``save()``, including ``save(update_fields=["content"])``.
+
+    Rows written before the split, or by ``bulk_create``, keep the body
+    inline in ``legacy_content`` (the original ``content`` column) until
+    the ``move_content_bodies`` command compresses it. Queries that need the
+    text in bulk read ``BODY_VALUES`` and decode them with ``body_text()``.
+    ``content`` cannot be used in lookups, ``values()`` or ``defer()``;
+    defer ``legacy_content`` instead.
+
+    Attributes:
+        legacy_content (TextField): Inline body not moved to ``body`` yet.
+    """
+
+    BODY_VALUES = ("legacy_content", "body__data")
+
+    legacy_content = models.TextField(
+        db_column="content", blank=True, default="", editable=False
+    )
+
+    class Meta:
+        abstract = True
+
+    _content = None
+    _content_changed = False
+
+    @property
+    def content(self):
+        """Return the body, loading it on first access."""
+        if self._content is None:
+            if self.legacy_content:
+                self._content = self.legacy_content
+            else:
+                try:
+                    self._content = self.body.text
+                except ObjectDoesNotExist:
+                    self._content = ""
+        return self._content
+
+    @content.setter
+    def content(self, value):
+        """Stage a new body for the next ``save()``."""
+        self._content = value or ""
+        self._content_changed = True
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        """Drop the loaded body on a full reload."""
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+        if fields is None:
+            self._content = None
+            self._content_changed = False
+            self._state.fields_cache.pop("body", None)
+
+    def save(self, *args, **kwargs):
+        """Save the row, then write a changed body to the body table."""
+        write_body = self._content_changed
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "content" in update_fields:
+            update_fields = set(update_fields) - {"content"}
+            write_body = True
+        if write_body:
+            self.legacy_content = ""
+            if update_fields is not None:
+                update_fields = set(update_fields) | {"legacy_content"}
+        if update_fields is not None:
+            kwargs["update_fields"] = update_fields
+
+        with transaction.atomic(using=kwargs.get("using")):
+            super().save(*args, **kwargs)
+            if write_body:
+                body_model = self._meta.get_field("body").related_model
+                body, _ = body_model.objects.update_or_create(
+                    pk=self.pk, defaults={"data": compress_body(self.content)}
+                )
+                self._state.fields_cache["body"] = body
+        self._content_changed = False
+
+
+# ----------------------------
+# Directory entries
+# ----------------------------
+class DirectoryEntryModel(models.Model):
+    """
+    Abstract base for sources listed in the publisher/journalist directory.
+
+    ``normalized_name`` is refreshed on every ``save()`` from
+    ``directory_name()``, the value at ``DIRECTORY_NAME_FIELD`` (a lookup
+    path such as ``"user__username"``), and indexed for prefix search.
+    ``subscriber_count`` is kept up to date by the subscription signal
+    handlers and the bulk subscription API; both are indexed together with
+    ``id`` for keyset pagination (see ``articles.directory``).
+
+    Attributes:
+        normalized_name (CharField): Search key of the display name.
+        subscriber_count (PositiveIntegerField): Number of subscribed users.
+    """
+
+    DIRECTORY_NAME_FIELD = "name"
+
+    normalized_name = models.CharField(
+        max_length=DIRECTORY_NAME_LENGTH, blank=True, editable=False
+    )
+    subscriber_count = models.PositiveIntegerField(default=0, editable=False)
+
+    class Meta:
+        abstract = True
+        indexes = [
+            models.Index(fields=["normalized_name", "id"], name="%(class)s_dir_name"),
+            models.Index(
+                fields=["subscriber_count", "id"], name="%(class)s_dir_popular"
+            ),
+        ]
+
+    def directory_name(self):
+        """Return the display name shown in the directory."""
+        value = self
+        for name in self.DIRECTORY_NAME_FIELD.split("__"):
+            value = getattr(value, name)
+        return value
+
+    def save(self, *args, **kwargs):
+        """Refresh the normalized name before saving."""
+        self.normalized_name = normalize_name(self.directory_name())
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = set(update_fields) | {"normalized_name"}
+        super().save(*args, **kwargs)
 
 
 # ----------------------------
 # Publisher
 # ----------------------------
-class Publisher(models.Model):
+class Publisher(DirectoryEntryModel):
     """
     Represents a publishing entity.
 
@@ -43,7 +423,9 @@ class Publisher(models.Model):
 # ----------------------------
 # Article
 # ----------------------------
-class Article(models.Model):
+class Article(
+    DerivedTextModel, ScheduledPublishModel, ApprovalStampModel, CompressedBodyModel
+):
     """
     Represents a news article.
 
@@ -52,15 +434,18 @@ class Article(models.Model):
 
     Attributes:
         title (CharField): Title of the article.
-        content (TextField): Content/body of the article.
+        content (str): Content/body of the article, stored in ``ArticleBody``.
         publisher (ForeignKey): Publisher associated with the article.
         author (ForeignKey): User who authored the article.
         is_approved (BooleanField): Approval status of the article.
         created_at (DateTimeField): Timestamp when the article was created.
         updated_at (DateTimeField): Timestamp when the article was last updated.
+        excerpt, word_count, reading_time: See DerivedTextModel.
+        approved_at: See ApprovalStampModel.
+        publish_at, is_scheduled: See ScheduledPublishModel.
+        legacy_content: See CompressedBodyModel.
     """
     title = models.CharField(max_length=255)
-    content = models.TextField()
     publisher = models.ForeignKey(
         "Publisher", on_delete=models.CASCADE, related_name="articles"
     )
@@ -71,15 +456,202 @@ class Article(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Editor moderation queue: status filter + keyset pagination.
+            models.Index(
+                fields=["is_approved", "created_at", "id"],
+                name="article_status_created_idx",
+            ),
+            # Release scheduler: due scheduled items.
+            models.Index(
+                fields=["is_scheduled", "publish_at"],
+                name="article_scheduled_idx",
+            ),
+        ]
+
+    def __str__(self):
+        """String representation."""
+        return self.title
+
+
+class ArticleBody(ContentBodyModel):
+    """
+    Compressed body of an article (see CompressedBodyModel).
+
+    Attributes:
+        article (OneToOneField): The article; also the primary key.
+        data: See ContentBodyModel.
+    """
+
+    article = models.OneToOneField(
+        Article, on_delete=models.CASCADE, primary_key=True, related_name="body"
+    )
+
+
+# ----------------------------
+# Archive
+# ----------------------------
+class ArchivedContentModel(DerivedTextModel, ApprovalStampModel):
+    """
+    Abstract base for cold copies of old articles and newsletters.
+
+    ``articles.archive`` moves approved items past ``ARCHIVE_AFTER_DAYS``
+    out of the live tables into these ones, keeping their primary keys, so
+    lists, feeds and moderation only scan recent rows while detail URLs keep
+    working. Fields mirror the live models; nothing points back at an
+    archived row.
+
+    Attributes:
+        id (BigIntegerField): Primary key of the original item.
+        title, content, publisher, author, is_approved, created_at,
+            updated_at: Copied from the original item.
+        archived_at (DateTimeField): When the item was moved.
+        excerpt, word_count, reading_time: See DerivedTextModel.
+        approved_at: See ApprovalStampModel.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    title = models.CharField(max_length=255)
+    content = models.TextField()
+    publisher = models.ForeignKey(
+        "articles.Publisher", on_delete=models.CASCADE, related_name="+"
+    )
+    author = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+"
+    )
+    is_approved = models.BooleanField(default=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        abstract = True
+
     def __str__(self):
         """String representation."""
         return self.title
 
 
+class ArchivedArticle(ArchivedContentModel):
+    """An article moved out of ``Article`` by the archiver."""
+
+    class Meta:
+        verbose_name = "Archived article"
+        verbose_name_plural = "Archived articles"
+
+
+# ----------------------------
+# Article view counts
+# ----------------------------
+class ArticleViewCount(models.Model):
+    """
+    Number of times an article's detail page was viewed.
+
+    Kept apart from ``Article`` so counting never locks article rows. Hits
+    are buffered per worker and added in batches (see
+    ``articles.view_counts``); ``publisher`` is copied from the article so
+    the most-read list of a publisher is an index range scan. As with
+    ``ArticleRevision``, the link is not enforced by the database, so the
+    total survives archiving under the same id.
+
+    Attributes:
+        article (OneToOneField): Counted article (primary key).
+        publisher (ForeignKey): Publisher of the article.
+        views (PositiveBigIntegerField): Total detail page views.
+        updated_at (DateTimeField): Time of the last flush.
+    """
+
+    article = models.OneToOneField(
+        Article,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        primary_key=True,
+        related_name="view_count",
+    )
+    publisher = models.ForeignKey(
+        Publisher, on_delete=models.CASCADE, related_name="+"
+    )
+    views = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name = "Article view count"
+        verbose_name_plural = "Article view counts"
+        indexes = [
+            models.Index(
+                fields=["publisher", "views"], name="viewcount_publisher_views"
+            ),
+        ]
+
+    def __str__(self):
+        """String representation."""
+        return f"{self.article_id}: {self.views} view(s)"
+
+
+# ----------------------------
+# Article revisions
+# ----------------------------
+class ArticleRevision(models.Model):
+    """
+    One saved version of an article (see ``articles.revisions``).
+
+    The newest revision of an article, and every
+    ``REVISION_SNAPSHOT_EVERY``-th one below it, hold the full text; the
+    others hold a compressed reverse diff against the next newer revision.
+
+    The link to the article is not enforced by the database: archived
+    articles keep their id, so the history stays attached to them when the
+    live row is moved out. It is deleted with articles that are deleted
+    outright (see ``articles.signals``).
+
+    Attributes:
+        article (ForeignKey): Revised article.
+        number (PositiveIntegerField): Version number, increasing per article.
+        title (CharField): Title of this version.
+        data (BinaryField): zlib-compressed full text or reverse diff.
+        is_snapshot (BooleanField): Whether ``data`` holds the full text.
+        edited_by (ForeignKey): User who saved this version, if known.
+        created_at (DateTimeField): When this version was saved.
+    """
+
+    article = models.ForeignKey(
+        Article,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="revisions",
+    )
+    number = models.PositiveIntegerField()
+    title = models.CharField(max_length=255)
+    data = models.BinaryField()
+    is_snapshot = models.BooleanField(default=False)
+    edited_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name = "Article revision"
+        verbose_name_plural = "Article revisions"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["article", "number"], name="unique_article_revision"
+            ),
+        ]
+
+    def __str__(self):
+        """String representation."""
+        return f"{self.article_id} r{self.number}"
+
+
 # ----------------------------
 # Journalist
 # ----------------------------
-class Journalist(models.Model):
+class Journalist(DirectoryEntryModel):
     """
     Links additional info to a user.
 
@@ -88,6 +660,8 @@ class Journalist(models.Model):
     Attributes:
         user (OneToOneField): User associated with this journalist profile.
     """
+    DIRECTORY_NAME_FIELD = "user__username"
+
     user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
 
     def __str__(self):
@@ -0,0 +1,276 @@
+"""
+articles.moderation
+
+Moderation helpers shared by the editor views and the moderation API.
+
+The editor queue is filtered and paginated in the database: status and
+publisher filters, keyset pagination on ``(created_at, id)``, the stored
+``excerpt`` column instead of the full ``content``, and per-status counts
+from a single aggregate query.
+
+Approving or rejecting many items at once issues one queryset ``update`` per
+batch instead of a full model save per item. Because ``update`` does not send
+``post_save``, the per-item notification handlers are bypassed and
+subscribers are notified afterwards in one grouped pass per
+publisher/journalist, and the feeds and most-read lists of the affected
+sources are expired. Approved items with a future ``publish_at`` are only
+scheduled; the release scheduler (``articles.scheduling``) publishes them
+later through the same helpers.
+"""
+
+import base64
+import binascii
+
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from newsletters.models import Newsletter
+
+from . import feeds, prerender, view_counts
+from .models import Article, Journalist, Publisher
+from .signals import notify_subscribers_batch
+
+MODERATED_MODELS = {"article": Article, "newsletter": Newsletter}
+
+BULK_BATCH_SIZE = 500
+
+# Bulk actions of the editor lists -> past tense for the success message.
+BULK_ACTIONS = {"approve": "approved", "reject": "rejected"}
+
+# Titles listed per grouped notification.
+NOTIFY_SAMPLE_SIZE = 10
+
+QUEUE_STATUSES = ("all", "approved", "unapproved")
+QUEUE_PAGE_SIZE = 25
+
+
+def bulk_set_approval(model, ids, approve=True, batch_size=BULK_BATCH_SIZE):
+    """
+    Approve or reject many articles/newsletters at once.
+
+    Rejecting clears ``is_approved`` (and any pending schedule) so the item
+    returns to the review queue; nothing is deleted. Approving an item whose
+    ``publish_at`` is in the future schedules it instead of publishing it.
+    Items already in the requested state are skipped and are not notified
+    again.
+
+    Args:
+        model (Model): ``Article`` or ``Newsletter``.
+        ids (Iterable[int]): Primary keys to update.
+        approve (bool): True to approve, False to reject.
+        batch_size (int): Rows updated per transaction.
+
+    Returns:
+        int: Number of items whose approval state changed.
+    """
+    ids = sorted({int(pk) for pk in ids})
+    changed = 0
+    groups = {}
+
+    for start in range(0, len(ids), batch_size):
+        chunk = ids[start : start + batch_size]
+        with transaction.atomic():
+            pending = (
+                Q(is_approved=False, is_scheduled=False)
+                if approve
+                else Q(is_approved=True) | Q(is_scheduled=True)
+            )
+            rows = list(
+                model.objects.select_for_update()
+                .filter(pending, pk__in=chunk)
+                .values_list("pk", "publisher_id", "author_id", "title", "publish_at")
+            )
+            if not rows:
+                continue
+            now = timezone.now()
+            held = {row[0] for row in rows if approve and row[4] and row[4] > now}
+            if held:
+                model.objects.filter(pk__in=held).update(
+                    is_scheduled=True, updated_at=now
+                )
+            rows = [row[:4] for row in rows if row[0] not in held]
+            model.objects.filter(pk__in=[row[0] for row in rows]).update(
+                is_approved=approve,
+                is_scheduled=False,
+                approved_at=now if approve else None,
+                updated_at=now,
+            )
+
+        changed += len(rows) + len(held)
+        expire_sources(model, rows)
+        if approve:
+            add_to_groups(groups, rows)
+
+    if groups:
+        notify_approved_groups(groups)
+    return changed
+
+
+def expire_sources(model, rows):
+    """
+    Expire what depends on items whose approval state changed in bulk.
+
+    Bumps the feed versions and most-read lists of their sources and syncs
+    their static pages.
+
+    Args:
+        model (Model): ``Article`` or ``Newsletter``.
+        rows (list[tuple]): ``(pk, publisher_id, author_id, title)`` per item.
+    """
+    if not rows:
+        return
+    feeds.bump_feed_versions({row[1] for row in rows}, {row[2] for row in rows})
+    if model is Article:
+        for publisher_id in {row[1] for row in rows}:
+            view_counts.invalidate_top(publisher_id)
+    if prerender.is_enabled():
+        prerender.sync_pages(model, [row[0] for row in rows])
+
+
+def add_to_groups(groups, rows):
+    """
+    Add newly published items to the pending grouped notifications.
+
+    Args:
+        groups (dict): Maps ``(publisher_id, author_id)`` to
+            ``(total, sample_titles)``; updated in place.
+        rows (list[tuple]): ``(pk, publisher_id, author_id, title)`` per item.
+    """
+    for _, publisher_id, author_id, title in rows:
+        count, titles = groups.get((publisher_id, author_id), (0, []))
+        if len(titles) < NOTIFY_SAMPLE_SIZE:
+            titles.append(title)
+        groups[(publisher_id, author_id)] = (count + 1, titles)
+
+
+def notify_approved_groups(groups):
+    """
+    Send one grouped notification per publisher/author pair.
+
+    Args:
+        groups (dict): Maps ``(publisher_id, author_id)`` to
+            ``(total, sample_titles)``.
+    """
+    publishers = Publisher.objects.in_bulk({key[0] for key in groups})
+    journalists = {
+        journalist.user_id: journalist
+        for journalist in Journalist.objects.filter(
+            user_id__in={key[1] for key in groups}, user__role="journalist"
+        )
+    }
+    for (publisher_id, author_id), (total, titles) in groups.items():
+        notify_subscribers_batch(
+            publisher=publishers[publisher_id],
+            journalist=journalists.get(author_id),
+            titles=titles,
+            total=total,
+        )
+
+
+# ---------------- Moderation queue ----------------
+
+
+def encode_cursor(created_at, pk):
+    """Encode a keyset position as an opaque URL-safe token."""
+    raw = f"{created_at.isoformat()}|{pk}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token):
+    """
+    Decode a token produced by ``encode_cursor``.
+
+    Returns:
+        tuple or None: ``(created_at, pk)``, or None if the token is invalid.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode()
+        created_at, pk = raw.rsplit("|", 1)
+        created_at = parse_datetime(created_at)
+        return (created_at, int(pk)) if created_at else None
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+
+
+def queue_params(params):
+    """
+    Extract moderation queue filters from a query dict.
+
+    Args:
+        params (QueryDict): Typically ``request.GET``.
+
+    Returns:
+        dict: ``status``, ``publisher`` and ``cursor`` keyword arguments for
+        ``moderation_queue``; invalid values fall back to defaults.
+    """
+    status = params.get("status", "all")
+    publisher = params.get("publisher", "")
+    return {
+        "status": status if status in QUEUE_STATUSES else "all",
+        "publisher": int(publisher) if publisher.isdigit() else None,
+        "cursor": params.get("cursor") or None,
+    }
+
+
+def moderation_queue(
+    model, status="all", publisher=None, cursor=None, page_size=QUEUE_PAGE_SIZE
+):
+    """
+    Return one page of the editor moderation queue.
+
+    Args:
+        model (Model): ``Article`` or ``Newsletter``.
+        status (str): ``all``, ``approved`` or ``unapproved``.
+        publisher (int, optional): Restrict to one publisher id.
+        cursor (str, optional): Token from a previous page's ``next_cursor``.
+        page_size (int): Items per page.
+
+    Returns:
+        dict: ``items`` (list of model instances without ``content``
+        loaded), ``next_cursor`` (str or None) and ``counts`` (dict with
+        ``all``, ``approved`` and ``unapproved`` totals).
+    """
+    queryset = model.objects.all()
+    if publisher is not None:
+        queryset = queryset.filter(publisher_id=publisher)
+
+    counts = queryset.aggregate(
+        all=Count("pk"), approved=Count("pk", filter=Q(is_approved=True))
+    )
+    counts["unapproved"] = counts["all"] - counts["approved"]
+
+    if status == "approved":
+        queryset = queryset.filter(is_approved=True)
+    elif status == "unapproved":
+        queryset = queryset.filter(is_approved=False)
+
+    position = decode_cursor(cursor) if cursor else None
+    if position:
+        created_at, pk = position
+        queryset = queryset.filter(
+            Q(created_at__lt=created_at) | Q(created_at=created_at, pk__lt=pk)
+        )
+
+    items = list(
+        queryset.select_related("publisher", "author")
+        .only(
+            "id",
+            "title",
+            "excerpt",
+            "is_approved",
+            "is_scheduled",
+            "publish_at",
+            "created_at",
+            "publisher__name",
+            "author__username",
+        )
+        .order_by("-created_at", "-pk")[: page_size + 1]
+    )
+
+    next_cursor = None
+    if len(items) > page_size:
+        items = items[:page_size]
+        next_cursor = encode_cursor(items[-1].created_at, items[-1].pk)
+    return {"items": items, "next_cursor": next_cursor, "counts": counts}
@@ -0,0 +1,144 @@
+"""
+articles.page_cache
+
+Rendered-HTML cache for article and newsletter detail pages.
+
+Only the role-independent body (title, byline and content) is cached; the
+detail templates splice it into the per-user chrome on every request. Cache
+keys include the object's primary key and ``updated_at``, so an edit made
+through a queryset ``update`` still produces a fresh key. Saves and deletes
+also remove the previous entry explicitly (see ``articles.signals``).
+
+The byline shows the publisher's name and the author's username, which can
+change without the item being saved. Keys therefore also carry a byline
+version per publisher and per author, which is bumped when either is
+renamed, so every page showing the old name gets a new key.
+
+Hit and miss counters are kept in the same cache and exposed through
+``stats()``.
+"""
+
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+HITS_KEY = "page_cache:hits"
+MISSES_KEY = "page_cache:misses"
+
+
+def _byline_key(kind, source_id):
+    """Return the cache key holding the byline version of a source."""
+    return f"page:byline:{kind}:{source_id}"
+
+
+def _byline_version(instance):
+    """Return the byline versions of an item's publisher and author."""
+    keys = [
+        _byline_key("publisher", instance.publisher_id),
+        _byline_key("author", instance.author_id),
+    ]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # A fresh value, so an evicted version never falls back to an
+            # older one.
+            cache.add(key, time.time_ns(), timeout=None)
+            versions[key] = cache.get(key)
+    return ".".join(str(versions[key]) for key in keys)
+
+
+def bump_bylines(publisher_ids=(), author_ids=()):
+    """
+    Invalidate the cached pages of renamed publishers and authors.
+
+    Args:
+        publisher_ids (Iterable[int]): Renamed publishers.
+        author_ids (Iterable[int]): Author user ids whose username changed.
+    """
+    version = time.time_ns()
+    keys = [_byline_key("publisher", pk) for pk in publisher_ids]
+    keys += [_byline_key("author", pk) for pk in author_ids]
+    if keys:
+        cache.set_many(dict.fromkeys(keys, version), timeout=None)
+
+
+def cache_key(instance):
+    """
+    Return the cache key for an article or newsletter.
+
+    Args:
+        instance (Model): Saved object with ``pk`` and ``updated_at``.
+
+    Returns:
+        str: Key built from the model label, pk, ``updated_at`` and the
+        byline version.
+    """
+    return (
+        f"page:{instance._meta.label_lower}:{instance.pk}:"
+        f"{instance.updated_at.timestamp():.6f}:{_byline_version(instance)}"
+    )
+
+
+def _incr(key):
+    """Increment a counter, creating it if needed."""
+    if cache.add(key, 1, timeout=None):
+        return
+    try:
+        cache.incr(key)
+    except ValueError:
+        # The counter expired or was evicted between add() and incr().
+        cache.add(key, 1, timeout=None)
+
+
+def render_body(instance, template_name, context_name):
+    """
+    Return the rendered body fragment for ``instance``, using the cache.
+
+    The object may be loaded with ``content`` deferred: on a cache hit the
+    body column is never read.
+
+    Args:
+        instance (Model): Article or newsletter to render.
+        template_name (str): Fragment template rendering the body.
+        context_name (str): Name of the object in the template context.
+
+    Returns:
+        SafeString: The rendered HTML fragment.
+    """
+    key = cache_key(instance)
+    html = cache.get(key)
+    if html is not None:
+        _incr(HITS_KEY)
+        return mark_safe(html)
+
+    _incr(MISSES_KEY)
+    html = render_to_string(template_name, {context_name: instance})
+    cache.set(key, str(html), timeout=getattr(settings, "PAGE_CACHE_TIMEOUT", 3600))
+    return html
+
+
+def invalidate(instance):
+    """Remove the cached body for the given (pk, updated_at) version."""
+    if instance.pk is not None and instance.updated_at is not None:
+        cache.delete(cache_key(instance))
+
+
+def stats():
+    """
+    Return the page cache counters.
+
+    Returns:
+        dict: ``hits``, ``misses`` and ``hit_ratio``.
+    """
+    values = cache.get_many([HITS_KEY, MISSES_KEY])
+    hits = values.get(HITS_KEY, 0)
+    misses = values.get(MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": round(hits / total, 4) if total else 0.0,
+    }
@@ -0,0 +1,131 @@
+"""
+articles.prerender
+
+Static pre-rendering of approved article and newsletter detail pages.
+
+When ``STATIC_PAGES_ENABLED`` is set, approved items are written as
+standalone HTML files (plus a precompressed ``.gz`` copy) under
+``STATIC_PAGES_ROOT``::
+
+    <root>/articles/<pk>.html
+    <root>/articles/<pk>.html.gz
+    <root>/newsletters/<pk>.html
+    <root>/newsletters/<pk>.html.gz
+
+A front web server can serve these without touching Django or MySQL.
+Files are written atomically, refreshed when an item is approved or
+edited, and removed when it is unapproved or deleted. The
+``prerender_pages`` command rebuilds everything in parallel.
+"""
+
+import gzip
+import os
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.template.loader import render_to_string
+
+from . import page_cache
+
+# model label -> (directory, body template, context name)
+PAGE_TYPES = {
+    "articles.article": ("articles", "articles/_article_body.html", "article"),
+    "newsletters.newsletter": (
+        "newsletters",
+        "newsletters/_newsletter_body.html",
+        "newsletter",
+    ),
+}
+
+
+def is_enabled():
+    """Return True if static pre-rendering is switched on."""
+    return getattr(settings, "STATIC_PAGES_ENABLED", False)
+
+
+def page_path(model, pk):
+    """
+    Return the path of the static HTML file for an item.
+
+    Args:
+        model (Model): ``Article`` or ``Newsletter`` class.
+        pk (int): Primary key of the item.
+
+    Returns:
+        Path: Location of the uncompressed HTML file.
+    """
+    directory = PAGE_TYPES[model._meta.label_lower][0]
+    return Path(settings.STATIC_PAGES_ROOT) / directory / f"{pk}.html"
+
+
+def render_page(instance):
+    """Render the anonymous, standalone detail page for ``instance``."""
+    _, template_name, context_name = PAGE_TYPES[instance._meta.label_lower]
+    return render_to_string(
+        "articles/static_detail.html",
+        {
+            "object": instance,
+            "body_html": page_cache.render_body(instance, template_name, context_name),
+        },
+    )
+
+
+def _atomic_write(path, data):
+    """Write bytes to ``path`` via a temporary file and an atomic rename."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def write_page(instance):
+    """
+    Write the HTML and precompressed ``.gz`` files for an approved item.
+
+    Returns:
+        Path: Location of the uncompressed HTML file.
+    """
+    html = render_page(instance).encode("utf-8")
+    path = page_path(type(instance), instance.pk)
+    # mtime=0 keeps the .gz byte-identical across rebuilds of unchanged pages.
+    _atomic_write(path.with_name(path.name + ".gz"), gzip.compress(html, mtime=0))
+    _atomic_write(path, html)
+    return path
+
+
+def remove_page(model, pk):
+    """Delete the static files for an item, if present."""
+    path = page_path(model, pk)
+    for target in (path, path.with_name(path.name + ".gz")):
+        try:
+            target.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def sync_page(instance):
+    """Write the page if the item is approved, otherwise remove it."""
+    if instance.is_approved:
+        write_page(instance)
+    else:
+        remove_page(type(instance), instance.pk)
+
+
+def sync_pages(model, pks):
+    """Synchronise the static pages of several items of one model."""
+    missing = set(pks)
+    for instance in model.objects.filter(pk__in=missing).select_related(
+        "author", "publisher"
+    ):
+        sync_page(instance)
+        missing.discard(instance.pk)
+    for pk in missing:
+        remove_page(model, pk)
@@ -0,0 +1,344 @@
+"""
+articles.revisions
+
+Space-efficient revision history of articles.
+
+Every edit saved through the editor and journalist edit views appends an
+``ArticleRevision``. Only the newest revision keeps the full text
+(zlib-compressed). When a newer one is added, the previous newest is
+rewritten as a reverse diff: the line operations that rebuild it from the
+newer text. Unchanged lines cost a pair of line numbers, so a small edit
+to a long article costs a few bytes instead of another full copy.
+
+To keep reconstruction fast, one revision in every
+``REVISION_SNAPSHOT_EVERY`` also keeps its full text. Any version is then
+rebuilt from the nearest snapshot above it by applying fewer than that many
+diffs, with two queries.
+
+Titles are short and stored as they are. Edits made elsewhere (admin, API)
+are picked up on the next recorded edit: the pre-edit version is added as a
+revision of its own when it differs from the newest one.
+
+``compact`` (the ``compact_revisions`` command) applies the retention
+policy: revisions older than ``REVISION_KEEP_DAYS`` are thinned to the last
+one of each day, and the diffs of the survivors are re-encoded, one article
+per transaction.
+"""
+
+import difflib
+import json
+import zlib
+from datetime import datetime, timedelta
+from typing import NamedTuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import BODY_COMPRESSION_LEVEL, ArticleRevision, body_text, compress_body
+
+
+class Version(NamedTuple):
+    """Title and body of an article at one point in time."""
+
+    title: str
+    content: str
+    saved_at: datetime
+
+
+def _snapshot_every():
+    """Return the maximum distance between two full-text revisions."""
+    return max(1, getattr(settings, "REVISION_SNAPSHOT_EVERY", 20))
+
+
+# ---------------- Encoding ----------------
+
+
+def _lines(text):
+    """Split a body into lines, keeping the line endings."""
+    return text.splitlines(keepends=True)
+
+
+def make_delta(newer, older):
+    """
+    Return the compressed reverse diff that rebuilds ``older`` from ``newer``.
+
+    The diff is a JSON list of ``[start, end]`` line ranges copied from
+    ``newer`` and strings inserted verbatim.
+
+    Args:
+        newer (str): Text of the next newer revision.
+        older (str): Text to encode.
+
+    Returns:
+        bytes: zlib-compressed diff.
+    """
+    newer_lines, older_lines = _lines(newer), _lines(older)
+    matcher = difflib.SequenceMatcher(None, newer_lines, older_lines, autojunk=False)
+    ops = []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append([i1, i2])
+        elif j1 < j2:
+            ops.append("".join(older_lines[j1:j2]))
+    encoded = json.dumps(ops, separators=(",", ":")).encode("utf-8")
+    return zlib.compress(encoded, BODY_COMPRESSION_LEVEL)
+
+
+def apply_delta(newer, delta):
+    """
+    Rebuild the older text encoded by ``make_delta``.
+
+    Args:
+        newer (str): Text of the next newer revision.
+        delta (bytes): Diff returned by ``make_delta``.
+
+    Returns:
+        str: The older text.
+    """
+    newer_lines = _lines(newer)
+    parts = []
+    for op in json.loads(zlib.decompress(delta)):
+        if isinstance(op, str):
+            parts.append(op)
+        else:
+            parts.extend(newer_lines[op[0] : op[1]])
+    return "".join(parts)
+
+
+# ---------------- Recording ----------------
+
+
+def capture(article):
+    """Return the current version of ``article``, before it is edited."""
+    return Version(article.title, article.content, article.updated_at)
+
+
+def _keeps_full_text(latest):
+    """Return True if ``latest`` must stay a snapshot once it is superseded."""
+    every = _snapshot_every()
+    below = list(
+        ArticleRevision.objects.filter(
+            article_id=latest.article_id, number__lt=latest.number
+        )
+        .order_by("-number")
+        .values_list("is_snapshot", flat=True)[: every - 1]
+    )
+    return len(below) == every - 1 and not any(below)
+
+
+def _append(article, latest, version, user):
+    """Add ``version`` on top of ``latest`` unless it is the same text."""
+    if latest is not None:
+        latest_text = body_text("", latest.data)
+        if (latest.title, latest_text) == (version.title, version.content):
+            return latest
+        if not _keeps_full_text(latest):
+            latest.data = make_delta(version.content, latest_text)
+            latest.is_snapshot = False
+            latest.save(update_fields=["data", "is_snapshot"])
+    return ArticleRevision.objects.create(
+        article=article,
+        number=latest.number + 1 if latest is not None else 1,
+        title=version.title,
+        data=compress_body(version.content),
+        is_snapshot=True,
+        edited_by=user,
+        created_at=version.saved_at,
+    )
+
+
+def record(article, previous=None, user=None):
+    """
+    Append the saved state of ``article`` to its history.
+
+    Call it in the transaction that saved the article; the row lock taken by
+    the save serializes concurrent edits of the same article.
+
+    Args:
+        article (Article): The article, just saved.
+        previous (Version, optional): The version before the edit, from
+            ``capture``. It is recorded first when the history does not end
+            with it (the first edit, or after an edit made elsewhere).
+        user (CustomUser, optional): User who made the edit.
+
+    Returns:
+        ArticleRevision or None: The new revision, or None if neither the
+        title nor the body changed.
+    """
+    latest = (
+        ArticleRevision.objects.select_for_update()
+        .filter(article=article)
+        .order_by("-number")
+        .first()
+    )
+    if previous is not None:
+        latest = _append(article, latest, previous, None)
+    current = Version(article.title, article.content, timezone.now())
+    revision = _append(article, latest, current, user)
+    return None if revision is latest else revision
+
+
+# ---------------- Reading ----------------
+
+
+def get_text(revision):
+    """
+    Return the full text of a revision.
+
+    Args:
+        revision (ArticleRevision): Revision to rebuild.
+
+    Returns:
+        str: The article body as of that revision.
+    """
+    if revision.is_snapshot:
+        return body_text("", revision.data)
+    history = ArticleRevision.objects.filter(article_id=revision.article_id)
+    top = (
+        history.filter(is_snapshot=True, number__gt=revision.number)
+        .order_by("number")
+        .values_list("number", flat=True)
+        .first()
+    )
+    chain = list(
+        history.filter(number__gt=revision.number, number__lte=top)
+        .order_by("-number")
+        .values_list("data", flat=True)
+    )
+    text = body_text("", chain[0])
+    for delta in chain[1:]:
+        text = apply_delta(text, delta)
+    return apply_delta(text, revision.data)
+
+
+def diff_lines(older, newer):
+    """
+    Return a unified diff between two texts for display.
+
+    Args:
+        older (str): Text of the older revision.
+        newer (str): Text of the newer revision.
+
+    Returns:
+        list[tuple]: ``(kind, line)`` pairs, where ``kind`` is ``"add"``,
+        ``"remove"``, ``"hunk"`` or ``"context"``.
+    """
+    kinds = {"+": "add", "-": "remove", "@": "hunk"}
+    lines = difflib.unified_diff(
+        older.splitlines(), newer.splitlines(), lineterm="", n=3
+    )
+    return [
+        (kinds.get(line[:1], "context"), line)
+        for line in lines
+        if not line.startswith(("---", "+++"))
+    ]
+
+
+# ---------------- Retention ----------------
+
+
+def compact_article(article_id, cutoff):
+    """
+    Thin one article's old revisions and re-encode the ones that are kept.
+
+    Revisions created before ``cutoff`` are reduced to the last one of each
+    day. The newest revision is always kept.
+
+    Args:
+        article_id (int): Article id.
+        cutoff (datetime): Revisions older than this are thinned.
+
+    Returns:
+        tuple: ``(dropped, bytes_before, bytes_after)``.
+    """
+    with transaction.atomic():
+        rows = list(
+            ArticleRevision.objects.select_for_update()
+            .filter(article_id=article_id)
+            .order_by("-number")
+        )
+        kept, dropped, days = [], [], set()
+        text = None
+        for row in rows:
+            text = (
+                body_text("", row.data)
+                if row.is_snapshot
+                else apply_delta(text, row.data)
+            )
+            if row.created_at < cutoff:
+                day = timezone.localdate(row.created_at)
+                if day in days:  # a later revision of that day is kept
+                    dropped.append(row)
+                    continue
+                days.add(day)
+            kept.append((row, text))
+
+        before = sum(len(row.data) for row in rows)
+        changed = []
+        newer = None
+        run = 0  # diffs since the last snapshot above
+        for row, text in kept:
+            if newer is None or run == _snapshot_every() - 1:
+                data, is_snapshot, run = compress_body(text), True, 0
+            else:
+                data, is_snapshot, run = make_delta(newer, text), False, run + 1
+            newer = text
+            if (data, is_snapshot) != (bytes(row.data), row.is_snapshot):
+                row.data, row.is_snapshot = data, is_snapshot
+                changed.append(row)
+        if dropped:
+            ArticleRevision.objects.filter(pk__in=[row.pk for row in dropped]).delete()
+        if changed:
+            ArticleRevision.objects.bulk_update(changed, ["data", "is_snapshot"])
+        after = sum(len(row.data) for row, _ in kept)
+    return len(dropped), before, after
+
+
+def compact(days=None, batch_size=500):
+    """
+    Apply the retention policy to every article with old revisions.
+
+    Articles are scanned in id order, ``batch_size`` at a time; only those
+    with several old revisions on the same day are rewritten.
+
+    Args:
+        days (int, optional): Age after which revisions are thinned;
+            defaults to ``REVISION_KEEP_DAYS``.
+        batch_size (int): Articles scanned per query.
+
+    Returns:
+        dict: ``articles``, ``dropped``, ``bytes_before`` and ``bytes_after``.
+    """
+    if days is None:
+        days = getattr(settings, "REVISION_KEEP_DAYS", 30)
+    cutoff = timezone.now() - timedelta(days=days)
+    old = ArticleRevision.objects.filter(created_at__lt=cutoff)
+    totals = dict.fromkeys(("articles", "dropped", "bytes_before", "bytes_after"), 0)
+    last_id = 0
+    while True:
+        ids = list(
+            old.filter(article_id__gt=last_id)
+            .order_by("article_id")
+            .values_list("article_id", flat=True)
+            .distinct()[:batch_size]
+        )
+        if not ids:
+            return totals
+        crowded = set(
+            old.filter(article_id__in=ids)
+            .annotate(day=TruncDate("created_at"))
+            .values("article_id", "day")
+            .annotate(count=Count("pk"))
+            .filter(count__gt=1)
+            .values_list("article_id", flat=True)
+        )
+        for article_id in sorted(crowded):
+            dropped, before, after = compact_article(article_id, cutoff)
+            totals["articles"] += 1
+            totals["dropped"] += dropped
+            totals["bytes_before"] += before
+            totals["bytes_after"] += after
+        last_id = ids[-1]
@@ -0,0 +1,116 @@
+"""
+articles.scheduling
+
+Release scheduler for articles and newsletters with a ``publish_at``.
+
+Approved items whose release time lies in the future are only marked
+``is_scheduled`` (see ``articles.models.ScheduledPublishModel``). The
+``publish_scheduled`` command calls ``release_due`` whenever it wakes up.
+Each batch claims due items with ``SELECT ... FOR UPDATE SKIP LOCKED``, so
+several schedulers can run side by side without releasing an item twice,
+and publishes the batch with one queryset ``update``. Feeds, most-read
+lists and static pages are expired per batch. Subscribers are notified
+once per run, in one grouped pass per publisher/journalist, as with bulk
+approval.
+
+Every release records its delay against the scheduled time in the
+``news_portal_release_delay_seconds`` histogram.
+"""
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from newsletters.models import Newsletter
+
+from . import metrics
+from .models import Article
+from .moderation import add_to_groups, expire_sources, notify_approved_groups
+
+SCHEDULED_MODELS = (Article, Newsletter)
+
+
+def release_batch(model, batch_size, now=None):
+    """
+    Publish one batch of due scheduled items.
+
+    Args:
+        model (Model): ``Article`` or ``Newsletter``.
+        batch_size (int): Maximum number of items to release.
+        now (datetime, optional): Release time; defaults to now.
+
+    Returns:
+        list[tuple]: ``(pk, publisher_id, author_id, title)`` per released
+        item.
+    """
+    with transaction.atomic():
+        now = now or timezone.now()
+        claimed = list(
+            model.objects.select_for_update(skip_locked=True)
+            .filter(is_scheduled=True, publish_at__lte=now)
+            .order_by("publish_at", "pk")
+            .values_list("pk", "publisher_id", "author_id", "title", "publish_at")[
+                :batch_size
+            ]
+        )
+        if not claimed:
+            return []
+        model.objects.filter(pk__in=[row[0] for row in claimed]).update(
+            is_approved=True, is_scheduled=False, approved_at=now, updated_at=now
+        )
+    for row in claimed:
+        metrics.observe(
+            "news_portal_release_delay_seconds", (now - row[4]).total_seconds()
+        )
+    metrics.inc("news_portal_scheduled_releases_total", len(claimed))
+    return [row[:4] for row in claimed]
+
+
+def release_due(batch_size=None, max_batches=None):
+    """
+    Publish every due scheduled item, then notify subscribers once.
+
+    Args:
+        batch_size (int, optional): Items per transaction; defaults to
+            ``SCHEDULER_BATCH_SIZE``.
+        max_batches (int, optional): Stop after this many batches per model.
+
+    Returns:
+        dict: Maps each model's ``model_name`` to the number released.
+    """
+    if batch_size is None:
+        batch_size = getattr(settings, "SCHEDULER_BATCH_SIZE", 200)
+    released = {}
+    for model in SCHEDULED_MODELS:
+        groups = {}
+        total = batches = 0
+        while max_batches is None or batches < max_batches:
+            rows = release_batch(model, batch_size)
+            batches += 1
+            total += len(rows)
+            expire_sources(model, rows)
+            add_to_groups(groups, rows)
+            if len(rows) < batch_size:
+                break
+        if groups:
+            notify_approved_groups(groups)
+        released[model._meta.model_name] = total
+    return released
+
+
+def next_release():
+    """
+    Return the earliest pending release time, or None if nothing is scheduled.
+
+    Returns:
+        datetime or None: Smallest ``publish_at`` of all scheduled items.
+    """
+    times = [
+        model.objects.filter(is_scheduled=True)
+        .order_by("publish_at")
+        .values_list("publish_at", flat=True)
+        .first()
+        for model in SCHEDULED_MODELS
+    ]
+    times = [t for t in times if t is not None]
+    return min(times) if times else None
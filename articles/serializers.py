@@ -10,7 +10,8 @@ model instances into JSON format for REST API responses.
 from rest_framework import serializers
 
 from newsletters.models import Newsletter
-from .models import Article
+from .directory import DIRECTORY_MAX_PAGE_SIZE, DIRECTORY_PAGE_SIZE, ORDERINGS, SOURCES
+from .models import Article, Journalist, Publisher
 
 
 class ArticleSerializer(serializers.ModelSerializer):
@@ -20,10 +21,12 @@ class ArticleSerializer(serializers.ModelSerializer):
     Converts Article instances to JSON and returns user and publisher as IDs.
 
     Attributes:
+        content (CharField): Body of the article, stored in a separate table.
         author (PrimaryKeyRelatedField): Read-only field returning the author's ID.
         publisher (PrimaryKeyRelatedField): Read-only field returning the publisher's ID.
     """
 
+    content = serializers.CharField()
     author = serializers.PrimaryKeyRelatedField(read_only=True)
     publisher = serializers.PrimaryKeyRelatedField(read_only=True)
 
@@ -40,6 +43,9 @@ class ArticleSerializer(serializers.ModelSerializer):
             "id",
             "title",
             "content",
+            "excerpt",
+            "word_count",
+            "reading_time",
             "author",
             "publisher",
             "is_approved",
@@ -48,6 +54,9 @@ class ArticleSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = [
             "id",
+            "excerpt",
+            "word_count",
+            "reading_time",
             "author",
             "publisher",
             "created_at",
@@ -62,10 +71,12 @@ class NewsletterSerializer(serializers.ModelSerializer):
     Converts Newsletter instances to JSON and returns user and publisher as IDs.
 
     Attributes:
+        content (CharField): Body of the newsletter, stored in a separate table.
         author (PrimaryKeyRelatedField): Read-only field returning the author's ID.
         publisher (PrimaryKeyRelatedField): Read-only field returning the publisher's ID.
     """
 
+    content = serializers.CharField()
     author = serializers.PrimaryKeyRelatedField(read_only=True)
     publisher = serializers.PrimaryKeyRelatedField(read_only=True)
 
@@ -82,9 +93,145 @@ class NewsletterSerializer(serializers.ModelSerializer):
             "id",
             "title",
             "content",
+            "excerpt",
+            "word_count",
+            "reading_time",
             "author",
             "publisher",
             "is_approved",
             "created_at",
         ]
-        read_only_fields = ["id", "author", "publisher", "created_at"]
+        read_only_fields = [
+            "id",
+            "excerpt",
+            "word_count",
+            "reading_time",
+            "author",
+            "publisher",
+            "created_at",
+        ]
+
+
+class ArticleSummarySerializer(ArticleSerializer):
+    """
+    Lightweight Article serializer for list views.
+
+    Omits ``content`` and exposes the precomputed excerpt, word count and
+    reading time instead.
+    """
+
+    class Meta(ArticleSerializer.Meta):
+        fields = [f for f in ArticleSerializer.Meta.fields if f != "content"]
+
+
+class NewsletterSummarySerializer(NewsletterSerializer):
+    """
+    Lightweight Newsletter serializer for list views.
+
+    Omits ``content`` and exposes the precomputed excerpt, word count and
+    reading time instead.
+    """
+
+    class Meta(NewsletterSerializer.Meta):
+        fields = [f for f in NewsletterSerializer.Meta.fields if f != "content"]
+
+
+class BulkModerationSerializer(serializers.Serializer):
+    """
+    Serializer validating a bulk approve/reject request.
+
+    Attributes:
+        type (ChoiceField): ``article`` or ``newsletter``.
+        action (ChoiceField): ``approve`` or ``reject``.
+        ids (ListField): Primary keys of the items to update.
+    """
+
+    type = serializers.ChoiceField(choices=["article", "newsletter"])
+    action = serializers.ChoiceField(choices=["approve", "reject"])
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=5000
+    )
+
+
+def _id_list():
+    """Return a list field of primary keys for the bulk subscription API."""
+    return serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        default=list,
+        max_length=1000,
+    )
+
+
+class BulkSubscriptionSerializer(serializers.Serializer):
+    """
+    Serializer validating a bulk follow/unfollow request.
+
+    Journalists are identified by their ``Journalist`` id. Every id to follow
+    must exist, and no target may be followed and unfollowed at once.
+
+    Attributes:
+        follow_publishers (ListField): Publisher ids to follow.
+        follow_journalists (ListField): Journalist ids to follow.
+        unfollow_publishers (ListField): Publisher ids to unfollow.
+        unfollow_journalists (ListField): Journalist ids to unfollow.
+    """
+
+    follow_publishers = _id_list()
+    follow_journalists = _id_list()
+    unfollow_publishers = _id_list()
+    unfollow_journalists = _id_list()
+
+    def validate(self, attrs):
+        """Reject unknown targets and targets both followed and unfollowed."""
+        errors = {}
+        for kind, model in (("publishers", Publisher), ("journalists", Journalist)):
+            follow = set(attrs[f"follow_{kind}"])
+            if follow & set(attrs[f"unfollow_{kind}"]):
+                errors[f"unfollow_{kind}"] = ["Ids cannot be followed and unfollowed."]
+            missing = follow - set(
+                model.objects.filter(pk__in=follow).values_list("pk", flat=True)
+            )
+            if missing:
+                errors[f"follow_{kind}"] = [f"Unknown ids: {sorted(missing)}."]
+        if errors:
+            raise serializers.ValidationError(errors)
+        return attrs
+
+
+class DirectoryQuerySerializer(serializers.Serializer):
+    """
+    Serializer validating the query parameters of the directory API.
+
+    Attributes:
+        type (ChoiceField): ``publisher`` or ``journalist``.
+        q (CharField): Optional name prefix.
+        ordering (ChoiceField): ``name`` or ``popular``.
+        cursor (CharField): Token from a previous page.
+        limit (IntegerField): Entries per page.
+    """
+
+    type = serializers.ChoiceField(choices=sorted(SOURCES))
+    q = serializers.CharField(
+        required=False, default="", allow_blank=True, max_length=255
+    )
+    ordering = serializers.ChoiceField(choices=sorted(ORDERINGS), default="name")
+    cursor = serializers.CharField(required=False, default=None, allow_blank=True)
+    limit = serializers.IntegerField(
+        min_value=1, max_value=DIRECTORY_MAX_PAGE_SIZE, default=DIRECTORY_PAGE_SIZE
+    )
+
+
+class MarkReadSerializer(serializers.Serializer):
+    """
+    Serializer validating a request to mark a followed source read.
+
+    Attributes:
+        type (ChoiceField): ``publisher`` or ``journalist``.
+        id (IntegerField): Publisher or ``Journalist`` id.
+        until (DateTimeField): Optional mark; defaults to now.
+    """
+
+    type = serializers.ChoiceField(choices=sorted(SOURCES))
+    id = serializers.IntegerField(min_value=1)
+    until = serializers.DateTimeField(required=False, default=None)
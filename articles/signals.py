@@ -3,51 +3,140 @@ articles.signals
 
 Signals module for the Articles app.
 
-Handles post-save signals for Article and Newsletter models.
-Sends notifications to subscribers via email and optionally posts updates
-to Twitter. Includes utility functions for Twitter client authentication
-and notification logic.
+Handles save/delete signals for Article and Newsletter models.
+Sends notifications to subscribers via email, optionally posts updates
+to Twitter, invalidates cached detail pages, syndication feeds and
+most-read lists, keeps pre-rendered static pages in sync and deletes the
+revision history and view count of deleted (not archived) articles. Also
+records subscription changes in the reverse audience index and keeps the
+directory's subscriber counts and journalist search names current.
+Includes utility functions for Twitter client authentication and
+notification logic; notifications record timings and failures in
+``articles.metrics``.
 """
 
-import os
-import tweepy
+import logging
+
 from django.conf import settings
-from django.core.mail import send_mail
-from django.db.models.signals import post_save
+from django.core.mail import send_mail, send_mass_mail
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
+from django.utils.text import Truncator
 
-from accounts.models import CustomUser
+from accounts.models import DELIVERY_IMMEDIATE, CustomUser
 from newsletters.models import Newsletter
+from subscriptions import audience
 from subscriptions.models import Subscription
-from .models import Article
+from . import (
+    directory,
+    feeds,
+    integrations,
+    metrics,
+    page_cache,
+    prerender,
+    view_counts,
+)
+from .models import (
+    ArchivedArticle,
+    Article,
+    ArticleRevision,
+    ArticleViewCount,
+    Journalist,
+    Publisher,
+    normalize_name,
+)
+
+logger = logging.getLogger(__name__)
 
 
 def get_twitter_client():
     """
-    Return an authenticated Tweepy client if environment variables are set.
+    Return an authenticated Tweepy client if Twitter is enabled.
 
-    Checks the TWITTER_ENABLED environment variable. If not enabled or
-    authentication fails, returns None.
+    The client comes from the lazy integrations registry, so ``tweepy`` is
+    only imported when ``settings.TWITTER_ENABLED`` is set.
 
     Returns:
         tweepy.Client or None: Authenticated Twitter client or None.
     """
-    if not os.getenv("TWITTER_ENABLED"):
-        return None
+    return integrations.get("twitter")
+
+
+def get_subscribed_readers(publisher, journalist=None, delivery=None):
+    """
+    Return the readers subscribed to a publisher or a journalist.
+
+    Args:
+        publisher (Publisher): Publisher whose subscribers are wanted.
+        journalist (Journalist or None): Journalist whose subscribers are wanted.
+        delivery (str, optional): Only return readers with this
+            ``email_delivery`` preference.
+
+    Follower ids come from the memory-mapped audience index when one has
+    been built, otherwise from ``Subscription``.
+
+    Returns:
+        QuerySet: Reader users following either source.
+    """
+    user_ids = audience.audience(publisher.pk, journalist.pk if journalist else None)
+    if user_ids is None:
+        publisher_sub_ids = Subscription.objects.filter(
+            publisher=publisher
+        ).values_list("user_id", flat=True)
+
+        journalist_sub_ids = []
+        if journalist:
+            journalist_sub_ids = Subscription.objects.filter(
+                journalist=journalist
+            ).values_list("user_id", flat=True)
+
+        user_ids = set(publisher_sub_ids) | set(journalist_sub_ids)
+    readers = CustomUser.objects.filter(id__in=user_ids, role="reader")
+    if delivery:
+        readers = readers.filter(email_delivery=delivery)
+    return readers
+
+
+def record_email_result(attempted, sent):
+    """
+    Count sent and failed emails and log failures.
 
+    ``send_mail``/``send_mass_mail`` run with ``fail_silently=True`` so one
+    bad address cannot abort a notification; their return value (messages
+    actually sent) is the only signal of failure.
+
+    Args:
+        attempted (int): Number of messages handed to the mail backend.
+        sent (int): Number the backend reported as sent.
+    """
+    metrics.inc("news_portal_emails_sent_total", sent)
+    if sent < attempted:
+        metrics.inc("news_portal_emails_failed_total", attempted - sent)
+        logger.warning("Failed to send %d of %d email(s).", attempted - sent, attempted)
+
+
+def post_tweet(text):
+    """
+    Post a tweet if Twitter is enabled, recording timing and failures.
+
+    Args:
+        text (str): Tweet text.
+    """
+    twitter_client = get_twitter_client()
+    if not twitter_client:
+        return
     try:
-        client = tweepy.Client(
-            consumer_key=os.getenv("TWITTER_API_KEY"),
-            consumer_secret=os.getenv("TWITTER_API_SECRET"),
-            access_token=os.getenv("TWITTER_ACCESS_TOKEN"),
-            access_token_secret=os.getenv("TWITTER_ACCESS_SECRET"),
-        )
-        return client
+        with metrics.timer("news_portal_tweet_seconds"):
+            twitter_client.create_tweet(text=text)
     except Exception:
-        return None
+        metrics.inc("news_portal_tweets_failed_total")
+        logger.exception("Could not tweet.")
+    else:
+        metrics.inc("news_portal_tweets_posted_total")
 
 
-def notify_subscribers_and_twitter(publisher, journalist, title, content):
+def notify_subscribers_and_twitter(publisher, journalist, title, excerpt):
     """
     Notify all subscribers via email and optionally post the update to Twitter.
 
@@ -55,49 +144,93 @@ def notify_subscribers_and_twitter(publisher, journalist, title, content):
         - A publisher (organization)
         - A journalist (specific author)
 
+    Only readers who chose immediate delivery are emailed; the others get
+    the item in their next digest (see ``subscriptions.digests``).
+
     Args:
         publisher (Publisher): Publisher instance of the article/newsletter.
         journalist (Journalist or None): Journalist instance if applicable.
         title (str): Title of the article/newsletter.
-        content (str): Content of the article/newsletter.
+        excerpt (str): Precomputed excerpt of the article/newsletter.
     """
-    # ---------------- FETCH SUBSCRIBERS ----------------
-    publisher_sub_ids = Subscription.objects.filter(
-        publisher=publisher
-    ).values_list("user_id", flat=True)
-
-    journalist_sub_ids = []
-    if journalist:
-        journalist_sub_ids = Subscription.objects.filter(
-            journalist=journalist
-        ).values_list("user_id", flat=True)
+    metrics.inc("news_portal_notifications_total")
 
-    user_ids = set(publisher_sub_ids) | set(journalist_sub_ids)
-    readers = CustomUser.objects.filter(id__in=user_ids, role="reader")
+    # ---------------- FETCH SUBSCRIBERS ----------------
+    with metrics.timer("news_portal_subscriber_resolution_seconds"):
+        emails = list(
+            get_subscribed_readers(
+                publisher, journalist, DELIVERY_IMMEDIATE
+            ).values_list("email", flat=True)
+        )
+    metrics.observe("news_portal_notification_recipients", len(emails))
 
     # ---------------- EMAIL NOTIFICATIONS ----------------
-    for reader in readers:
-        send_mail(
-            subject=f"New Publication: {title}",
-            message=content[:500] + "..." if len(content) > 500 else content,
-            from_email=getattr(
-                settings, "DEFAULT_FROM_EMAIL", "noreply@newsportal.com"
-            ),
-            recipient_list=[reader.email],
-            fail_silently=True,
-        )
+    from_email = getattr(settings, "DEFAULT_FROM_EMAIL", "noreply@newsportal.com")
+    for email in emails:
+        with metrics.timer("news_portal_email_send_seconds"):
+            sent = send_mail(
+                subject=f"New Publication: {title}",
+                message=excerpt,
+                from_email=from_email,
+                recipient_list=[email],
+                fail_silently=True,
+            )
+        record_email_result(1, sent)
 
     # ---------------- TWITTER NOTIFICATION ----------------
-    twitter_client = get_twitter_client()
-    if twitter_client:
-        tweet_text = (
-            f"📰 {title} by {journalist.user.username if journalist else 'Unknown'} "
-            f"via {publisher.name}\n\n{content[:200]}..."
+    post_tweet(
+        f"📰 {title} by {journalist.user.username if journalist else 'Unknown'} "
+        f"via {publisher.name}\n\n{Truncator(excerpt).chars(200)}"
+    )
+
+
+def notify_subscribers_batch(publisher, journalist, titles, total=None):
+    """
+    Send one consolidated notification about several new publications.
+
+    Used by bulk paths (imports, bulk approval) instead of firing
+    notify_subscribers_and_twitter once per item. Each subscriber receives a
+    single email listing the titles, and at most one tweet is posted.
+    Readers on digest delivery are skipped, as in
+    notify_subscribers_and_twitter.
+
+    Args:
+        publisher (Publisher): Publisher the publications belong to.
+        journalist (Journalist or None): Journalist if all items share one.
+        titles (list[str]): Titles to list in the message (may be a sample).
+        total (int, optional): Total number of publications; defaults to
+            ``len(titles)``.
+    """
+    total = len(titles) if total is None else total
+    if not total:
+        return
+
+    metrics.inc("news_portal_notifications_total")
+
+    with metrics.timer("news_portal_subscriber_resolution_seconds"):
+        emails = list(
+            get_subscribed_readers(publisher, journalist, DELIVERY_IMMEDIATE)
+            .exclude(email="")
+            .values_list("email", flat=True)
         )
-        try:
-            twitter_client.create_tweet(text=tweet_text)
-        except Exception as e:
-            print(f"[Twitter Error] Could not tweet: {e}")
+    metrics.observe("news_portal_notification_recipients", len(emails))
+
+    # ---------------- EMAIL NOTIFICATIONS ----------------
+    subject = f"{total} new publications from {publisher.name}"
+    message = "\n".join(f"- {title}" for title in titles)
+    if total > len(titles):
+        message += f"\n...and {total - len(titles)} more."
+    from_email = getattr(settings, "DEFAULT_FROM_EMAIL", "noreply@newsportal.com")
+    if emails:
+        with metrics.timer("news_portal_email_send_seconds"):
+            sent = send_mass_mail(
+                ((subject, message, from_email, [email]) for email in emails),
+                fail_silently=True,
+            )
+        record_email_result(len(emails), sent)
+
+    # ---------------- TWITTER NOTIFICATION ----------------
+    post_tweet(f"📰 {total} new publications via {publisher.name}")
 
 
 # ---------------- SIGNALS ----------------
@@ -125,7 +258,7 @@ def article_approved_handler(sender, instance, created, **kwargs):
             publisher=instance.publisher,
             journalist=journalist_instance,
             title=instance.title,
-            content=instance.content,
+            excerpt=instance.excerpt,
         )
 
 
@@ -153,5 +286,188 @@ def newsletter_approved_handler(sender, instance, created, **kwargs):
             publisher=instance.publisher,
             journalist=journalist_instance,
             title=instance.title,
-            content=instance.content,
+            excerpt=instance.excerpt,
         )
+
+
+@receiver(pre_save, sender=Article)
+@receiver(pre_save, sender=Newsletter)
+@receiver(post_delete, sender=Article)
+@receiver(post_delete, sender=Newsletter)
+def invalidate_page_cache_handler(sender, instance, **kwargs):
+    """
+    Drop the cached detail body of the version being replaced or deleted.
+
+    On ``pre_save`` the instance still carries the ``updated_at`` it was
+    loaded with, which identifies the cache entry about to go stale.
+
+    Args:
+        sender (Model): The model class.
+        instance (Article or Newsletter): The instance being saved or deleted.
+        `**kwargs`: Additional keyword arguments.
+    """
+    page_cache.invalidate(instance)
+
+
+@receiver(post_save, sender=Article)
+@receiver(post_save, sender=Newsletter)
+@receiver(post_delete, sender=Article)
+@receiver(post_delete, sender=Newsletter)
+def invalidate_feeds_handler(sender, instance, **kwargs):
+    """
+    Expire the cached feeds of the item's publisher and author.
+
+    Args:
+        sender (Model): The model class.
+        instance (Article or Newsletter): The saved or deleted instance.
+        `**kwargs`: Additional keyword arguments.
+    """
+    feeds.bump_feed_versions([instance.publisher_id], [instance.author_id])
+
+
+@receiver(post_save, sender=Article)
+@receiver(post_delete, sender=Article)
+def invalidate_most_read_handler(sender, instance, **kwargs):
+    """
+    Rebuild the publisher's most-read list after an article changed.
+
+    Args:
+        sender (Model): The model class.
+        instance (Article): The saved or deleted article.
+        `**kwargs`: Additional keyword arguments.
+    """
+    view_counts.invalidate_top(instance.publisher_id)
+
+
+@receiver(post_save, sender=Article)
+@receiver(post_save, sender=Newsletter)
+def prerender_page_handler(sender, instance, **kwargs):
+    """
+    Write or remove the static detail page once the save is committed.
+
+    Args:
+        sender (Model): The model class.
+        instance (Article or Newsletter): The saved instance.
+        `**kwargs`: Additional keyword arguments.
+    """
+    if prerender.is_enabled():
+        transaction.on_commit(lambda: prerender.sync_page(instance))
+
+
+@receiver(post_delete, sender=Article)
+@receiver(post_delete, sender=Newsletter)
+def remove_prerendered_page_handler(sender, instance, **kwargs):
+    """
+    Remove the static detail page of a deleted item once committed.
+
+    Args:
+        sender (Model): The model class.
+        instance (Article or Newsletter): The deleted instance.
+        `**kwargs`: Additional keyword arguments.
+    """
+    if prerender.is_enabled():
+        pk = instance.pk
+        transaction.on_commit(lambda: prerender.remove_page(sender, pk))
+
+
+@receiver(post_delete, sender=Article)
+def delete_article_history_handler(sender, instance, **kwargs):
+    """
+    Delete the revision history and view count of a deleted article.
+
+    Archived articles keep their id, history and view count, so nothing is
+    deleted when the article was moved to ``ArchivedArticle``.
+
+    Args:
+        sender (Model): The model class.
+        instance (Article): The deleted article.
+        `**kwargs`: Additional keyword arguments.
+    """
+    if not ArchivedArticle.objects.filter(pk=instance.pk).exists():
+        ArticleRevision.objects.filter(article_id=instance.pk).delete()
+        ArticleViewCount.objects.filter(article_id=instance.pk).delete()
+
+
+@receiver(post_save, sender=Subscription)
+@receiver(post_delete, sender=Subscription)
+def audience_index_handler(sender, instance, created=False, **kwargs):
+    """
+    Record a new or deleted subscription in the audience index once committed.
+
+    Args:
+        sender (Model): The model class.
+        instance (Subscription): The saved or deleted subscription.
+        created (bool): True if a new subscription was created.
+        `**kwargs`: Additional keyword arguments.
+    """
+    if kwargs.get("signal") is post_delete:
+        transaction.on_commit(lambda: audience.record_changes([instance], False))
+    elif created:
+        transaction.on_commit(lambda: audience.record_changes([instance], True))
+
+
+@receiver(post_save, sender=Subscription)
+@receiver(post_delete, sender=Subscription)
+def subscriber_count_handler(sender, instance, created=False, **kwargs):
+    """
+    Keep the followed source's ``subscriber_count`` in step.
+
+    Args:
+        sender (Model): The model class.
+        instance (Subscription): The saved or deleted subscription.
+        created (bool): True if a new subscription was created.
+        `**kwargs`: Additional keyword arguments.
+    """
+    if kwargs.get("signal") is post_delete:
+        delta = -1
+    elif created:
+        delta = 1
+    else:
+        return
+    directory.adjust_subscriber_counts(
+        [instance.publisher_id] if instance.publisher_id else [],
+        [instance.journalist_id] if instance.journalist_id else [],
+        delta,
+    )
+
+
+@receiver(post_save, sender=CustomUser)
+def journalist_name_handler(sender, instance, update_fields=None, **kwargs):
+    """
+    Refresh a journalist's directory search name after a username change.
+
+    Args:
+        sender (Model): The model class.
+        instance (CustomUser): The saved user.
+        update_fields (frozenset or None): Fields passed to ``save()``.
+        `**kwargs`: Additional keyword arguments.
+    """
+    if update_fields is not None and "username" not in update_fields:
+        return
+    name = normalize_name(instance.username)
+    Journalist.objects.filter(user=instance).exclude(normalized_name=name).update(
+        normalized_name=name
+    )
+
+
+@receiver(post_save, sender=Publisher)
+@receiver(post_save, sender=CustomUser)
+def byline_version_handler(sender, instance, update_fields=None, **kwargs):
+    """
+    Expire the cached detail pages showing a renamed publisher or author.
+
+    Args:
+        sender (Model): The model class.
+        instance (Publisher or CustomUser): The saved instance.
+        update_fields (frozenset or None): Fields passed to ``save()``.
+        `**kwargs`: Additional keyword arguments.
+    """
+    field = "name" if sender is Publisher else "username"
+    if kwargs.get("created") or (
+        update_fields is not None and field not in update_fields
+    ):
+        return
+    if sender is Publisher:
+        page_cache.bump_bylines(publisher_ids=[instance.pk])
+    else:
+        page_cache.bump_bylines(author_ids=[instance.pk])
@@ -4,24 +4,92 @@ articles.tests
 Tests module for the Articles app.
 
 Contains unit tests and API tests for:
-- Editor functionality (approving content, access control)
+- Editor functionality (approving content, bulk moderation, moderation
+  queue, access control)
 - Subscriber-facing API endpoints for articles and newsletters
 - Subscription functionality (subscribe/unsubscribe)
 - Mocked external services (e.g., Twitter)
+- Management commands (bulk import, export, backfills)
+- Precomputed excerpt/word count/reading time
+- Detail page cache and static pre-rendering
+- Staff-only streaming exports
+- Cached RSS/Atom feeds, digest emails and notification metrics
+- Slow-query capture, request profiling and lazy integrations
+- Per-request subscription snapshots and bulk subscription changes
+- Memory-mapped reverse subscription (audience) index
+- Publisher/journalist directory search and subscriber counts
+- Read-replica routing with read-your-writes pinning
+- Buffered article view counts and most-read lists
+- Per-reader read state (high-water marks) and unread counts
+- Hot/cold archiving of old articles and newsletters
+- Compressed article/newsletter bodies in separate 1:1 tables
+- Article revision history (reverse diffs, diff view, compaction)
+- Scheduled publishing and the batched release scheduler
+- Token-bucket throttling of the subscriber APIs
 """
 
+import gzip
+import json
+import re
+import tempfile
+import time
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
 from unittest.mock import patch
 
 from django.contrib.auth import get_user_model
-from django.test import TestCase
-from django.urls import reverse
+from django.core import mail
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import DatabaseError, connection, router
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve, reverse
+from django.utils import timezone
+from django.utils.http import parse_http_date
 from rest_framework import status
 from rest_framework.test import APIClient
 
-from newsletters.models import Newsletter
-from subscriptions.models import Subscription
+from monitoring.management.commands.benchmark_startup import parse_importtime
+from monitoring.models import RequestProfile, SlowQuery
+from monitoring.slow_queries import normalize_sql
+from news_portal.db_router import PIN_COOKIE, ReplicaRoutingMiddleware, replica_reads
+from newsletters.models import ArchivedNewsletter, Newsletter
+from subscriptions import audience, read_state
+from subscriptions.bulk import apply_changes
+from subscriptions.digests import send_digests
+from subscriptions.models import AudienceChange, DigestRun, Subscription
+from subscriptions.snapshot import get_snapshot
 
-from .models import Article, Journalist, Publisher
+from . import (
+    archive,
+    directory,
+    exports,
+    feeds,
+    integrations,
+    metrics,
+    page_cache,
+    prerender,
+    revisions,
+    scheduling,
+    throttling,
+    view_counts,
+)
+from .models import (
+    ArchivedArticle,
+    Article,
+    ArticleBody,
+    ArticleRevision,
+    ArticleViewCount,
+    Journalist,
+    Publisher,
+)
+from .moderation import bulk_set_approval, moderation_queue
+from .signals import get_subscribed_readers
 
 # Get the custom user model
 User = get_user_model()
@@ -41,10 +109,19 @@ class BaseTestCase(TestCase):
             "articles.signals.get_twitter_client", return_value=None
         )
         cls._twitter_patch.start()
+        # Tests flush buffered article views explicitly.
+        cls._flusher_patch = patch("articles.view_counts.flusher.start")
+        cls._flusher_patch.start()
+
+    def tearDown(self):
+        # Do not leak buffered article views into other tests.
+        view_counts.buffer.drain()
+        super().tearDown()
 
     @classmethod
     def tearDownClass(cls):
         cls._twitter_patch.stop()
+        cls._flusher_patch.stop()
         super().tearDownClass()
 
 
@@ -236,3 +313,1903 @@ class SubscriberAPITests(BaseTestCase):
         self.assertTrue(
             Subscription.objects.filter(user=self.reader, journalist=self.journalist).exists()
         )
+
+
+class ImportContentCommandTests(BaseTestCase):
+    """Tests for the ``import_content`` bulk import command."""
+
+    def setUp(self):
+        self.journalist_user = User.objects.create_user(
+            username="wire", password="pass123", role="journalist"
+        )
+        self.reader = User.objects.create_user(
+            username="reader",
+            password="pass123",
+            role="reader",
+            email="reader@example.com",
+        )
+        self.publisher = Publisher.objects.create(name="Wire Service")
+        Subscription.objects.create(user=self.reader, publisher=self.publisher)
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def _write(self, name, text):
+        path = Path(self.tmpdir.name) / name
+        path.write_text(text, encoding="utf-8")
+        return str(path)
+
+    def test_jsonl_import_skips_invalid_rows_and_per_row_emails(self):
+        """Valid rows are inserted in batches without per-row notifications."""
+        rows = [
+            {
+                "title": f"Story {i}",
+                "content": "Body",
+                "publisher": "Wire Service",
+                "author": "wire",
+            }
+            for i in range(5)
+        ]
+        rows.append({"title": "", "content": "Body", "publisher": 1, "author": 1})
+        path = self._write("wire.jsonl", "\n".join(json.dumps(r) for r in rows))
+
+        out = StringIO()
+        call_command(
+            "import_content",
+            path,
+            "--approved",
+            "--batch-size",
+            "2",
+            stdout=out,
+            stderr=StringIO(),
+        )
+
+        self.assertEqual(Article.objects.filter(is_approved=True).count(), 5)
+        self.assertIn("5 rows (1 skipped)", out.getvalue())
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_csv_import_sends_one_consolidated_notification(self):
+        """``--notify`` sends one email per subscriber for the whole import."""
+        path = self._write(
+            "wire.csv",
+            "title,content,publisher,author\n"
+            f"A,Body,{self.publisher.pk},wire\n"
+            f"B,Body,{self.publisher.pk},wire\n",
+        )
+
+        call_command(
+            "import_content",
+            path,
+            "--model",
+            "newsletter",
+            "--approved",
+            "--notify",
+            stdout=StringIO(),
+        )
+
+        self.assertEqual(Newsletter.objects.count(), 2)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ["reader@example.com"])
+
+    def test_notifications_are_grouped_per_author(self):
+        """Followers of a journalist hear about that journalist's rows only."""
+        other = User.objects.create_user(
+            username="other", password="pass123", role="journalist"
+        )
+        Journalist.objects.create(user=self.journalist_user)
+        fan = User.objects.create_user(
+            username="fan", role="reader", email="fan@example.com"
+        )
+        Subscription.objects.create(
+            user=fan, journalist=self.journalist_user.journalist
+        )
+        path = self._write(
+            "wire.csv",
+            "title,content,publisher,author\n"
+            f"A,Body,{self.publisher.pk},wire\n"
+            f"B,Body,{self.publisher.pk},{other.pk}\n",
+        )
+
+        call_command(
+            "import_content", path, "--approved", "--notify", stdout=StringIO()
+        )
+
+        fan_mail = [m for m in mail.outbox if m.to == ["fan@example.com"]]
+        self.assertEqual(len(fan_mail), 1)
+        self.assertIn("- A", fan_mail[0].body)
+        self.assertNotIn("- B", fan_mail[0].body)
+
+    def test_approved_rows_are_prerendered(self):
+        """Imported approved rows get static pages like approved saves."""
+        path = self._write(
+            "wire.csv",
+            "title,content,publisher,author,is_approved\n"
+            f"A,Static body,{self.publisher.pk},wire,1\n"
+            f"B,Draft body,{self.publisher.pk},wire,0\n",
+        )
+        with override_settings(
+            STATIC_PAGES_ENABLED=True, STATIC_PAGES_ROOT=self.tmpdir.name
+        ):
+            with self.captureOnCommitCallbacks(execute=True):
+                call_command("import_content", path, stdout=StringIO())
+
+            approved, draft = Article.objects.order_by("title")
+            self.assertIn(
+                "Static body", prerender.page_path(Article, approved.pk).read_text()
+            )
+            self.assertFalse(prerender.page_path(Article, draft.pk).exists())
+
+
+class ExportContentTests(BaseTestCase):
+    """Tests for the streaming export command and endpoint."""
+
+    def setUp(self):
+        self.staff = User.objects.create_user(
+            username="staff", password="pass123", role="editor", is_staff=True
+        )
+        self.editor = User.objects.create_user(
+            username="editor", password="pass123", role="editor"
+        )
+        self.publisher = Publisher.objects.create(name="Tech Daily")
+        self.other = Publisher.objects.create(name="Other")
+        for i in range(3):
+            Article.objects.create(
+                title=f"Story {i}",
+                content="Body",
+                publisher=self.publisher,
+                author=self.editor,
+            )
+        Article.objects.create(
+            title="Elsewhere", content="Body", publisher=self.other, author=self.editor
+        )
+
+    def test_command_writes_filtered_ndjson(self):
+        """The command streams only rows matching the publisher filter."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "articles.ndjson"
+            call_command(
+                "export_content",
+                "articles",
+                "--publisher",
+                str(self.publisher.pk),
+                "--chunk-size",
+                "2",
+                "--output",
+                str(path),
+                stderr=StringIO(),
+            )
+            rows = [json.loads(line) for line in path.read_text().splitlines()]
+        self.assertEqual(
+            [row["title"] for row in rows], [f"Story {i}" for i in range(3)]
+        )
+
+    def test_command_rejects_chunk_size_below_one(self):
+        """A chunk size of zero is refused instead of exporting nothing."""
+        with self.assertRaisesMessage(CommandError, "--chunk-size"):
+            call_command("export_content", "articles", "--chunk-size", "0")
+
+    def test_staff_endpoint_streams_gzipped_csv(self):
+        """Staff users receive a gzipped CSV streaming response."""
+        self.client.login(username="staff", password="pass123")
+        response = self.client.get(
+            reverse("articles:export", args=["articles"]),
+            {"format": "csv", "gzip": "1"},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        body = gzip.decompress(b"".join(response.streaming_content)).decode()
+        self.assertEqual(len(body.strip().splitlines()), 5)
+
+    def test_non_staff_cannot_export(self):
+        """Non-staff users are denied."""
+        self.client.login(username="editor", password="pass123")
+        response = self.client.get(reverse("articles:export", args=["articles"]))
+        self.assertEqual(response.status_code, 403)
+
+
+class BulkModerationTests(BaseTestCase):
+    """Tests for bulk approve/reject in the editor UI and the API."""
+
+    def setUp(self):
+        self.client_api = APIClient()
+        self.editor = User.objects.create_user(
+            username="editor", password="pass123", role="editor"
+        )
+        self.reader = User.objects.create_user(
+            username="reader",
+            password="pass123",
+            role="reader",
+            email="reader@example.com",
+        )
+        self.publisher = Publisher.objects.create(name="Tech Daily")
+        Subscription.objects.create(user=self.reader, publisher=self.publisher)
+        self.articles = [
+            Article.objects.create(
+                title=f"Draft {i}",
+                content="Body",
+                publisher=self.publisher,
+                author=self.editor,
+            )
+            for i in range(3)
+        ]
+
+    def test_editor_bulk_approves_with_one_grouped_email(self):
+        """Selected articles are approved and subscribers get one email."""
+        self.client.login(username="editor", password="pass123")
+        response = self.client.post(
+            reverse("articles:editor_bulk"),
+            {"action": "approve", "ids": [a.pk for a in self.articles[:2]]},
+        )
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(Article.objects.filter(is_approved=True).count(), 2)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertIn("Draft 0", mail.outbox[0].body)
+
+    def test_editor_bulk_reject_messages(self):
+        """Bulk rejection reports the right verb on both editor lists."""
+        self.client.login(username="editor", password="pass123")
+        Article.objects.filter(pk=self.articles[0].pk).update(is_approved=True)
+        newsletter = Newsletter.objects.create(
+            title="Weekly",
+            content="Body",
+            publisher=self.publisher,
+            author=self.editor,
+            is_approved=True,
+        )
+        for url, ids, text in (
+            ("articles:editor_bulk", [self.articles[0].pk], "1 article(s) rejected."),
+            ("newsletters:editor_bulk", [newsletter.pk], "1 newsletter(s) rejected."),
+        ):
+            response = self.client.post(
+                reverse(url), {"action": "reject", "ids": ids}, follow=True
+            )
+            self.assertEqual(
+                [str(message) for message in response.context["messages"]], [text]
+            )
+
+    def test_api_bulk_reject_and_approve_newsletters(self):
+        """The API approves and rejects newsletters in bulk."""
+        newsletter = Newsletter.objects.create(
+            title="Weekly",
+            content="Body",
+            publisher=self.publisher,
+            author=self.editor,
+            is_approved=True,
+        )
+        mail.outbox.clear()
+        self.client_api.force_authenticate(user=self.editor)
+        url = reverse("articles:api_bulk_moderation")
+
+        response = self.client_api.post(
+            url,
+            {"type": "newsletter", "action": "reject", "ids": [newsletter.pk]},
+            format="json",
+        )
+        self.assertEqual(response.json(), {"updated": 1})
+        newsletter.refresh_from_db()
+        self.assertFalse(newsletter.is_approved)
+        self.assertEqual(len(mail.outbox), 0)
+
+        response = self.client_api.post(
+            url,
+            {"type": "newsletter", "action": "approve", "ids": [newsletter.pk]},
+            format="json",
+        )
+        self.assertEqual(response.json(), {"updated": 1})
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_api_bulk_moderation_requires_editor(self):
+        """Readers cannot use the bulk moderation API."""
+        self.client_api.force_authenticate(user=self.reader)
+        response = self.client_api.post(
+            reverse("articles:api_bulk_moderation"),
+            {"type": "article", "action": "approve", "ids": [self.articles[0].pk]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class ModerationQueueTests(BaseTestCase):
+    """Tests for the filtered, keyset-paginated moderation queue."""
+
+    def setUp(self):
+        self.editor = User.objects.create_user(
+            username="editor", password="pass123", role="editor"
+        )
+        self.publisher = Publisher.objects.create(name="Tech Daily")
+        self.other = Publisher.objects.create(name="Other")
+        for i in range(5):
+            Article.objects.create(
+                title=f"Story {i}",
+                content="word " * 100,
+                publisher=self.publisher,
+                author=self.editor,
+                is_approved=i % 2 == 0,
+            )
+        Article.objects.create(
+            title="Elsewhere", content="Body", publisher=self.other, author=self.editor
+        )
+
+    def test_status_filter_is_applied_by_the_view(self):
+        """``?status=unapproved`` only lists unapproved articles."""
+        self.client.login(username="editor", password="pass123")
+        response = self.client.get(
+            reverse("articles:editor_list"), {"status": "unapproved"}
+        )
+        titles = {article.title for article in response.context["articles"]}
+        self.assertEqual(titles, {"Story 1", "Story 3", "Elsewhere"})
+        self.assertEqual(
+            response.context["counts"], {"all": 6, "approved": 3, "unapproved": 3}
+        )
+
+    def test_keyset_pagination_walks_every_row_once(self):
+        """Following ``next_cursor`` visits each item exactly once."""
+        seen, cursor = [], None
+        while True:
+            page = moderation_queue(
+                Article, publisher=self.publisher.pk, cursor=cursor, page_size=2
+            )
+            seen.extend(article.title for article in page["items"])
+            cursor = page["next_cursor"]
+            if not cursor:
+                break
+        self.assertEqual(sorted(seen), [f"Story {i}" for i in range(5)])
+
+    def test_queue_does_not_load_content(self):
+        """Rows carry a short excerpt and leave the body deferred."""
+        page = moderation_queue(Article, publisher=self.publisher.pk, page_size=1)
+        article = page["items"][0]
+        self.assertIn("legacy_content", article.get_deferred_fields())
+        self.assertNotIn("body", article._state.fields_cache)
+        self.assertTrue(article.excerpt.startswith("word word"))
+
+
+class DerivedTextFieldTests(BaseTestCase):
+    """Tests for the precomputed excerpt, word count and reading time."""
+
+    def setUp(self):
+        self.client_api = APIClient()
+        self.editor = User.objects.create_user(
+            username="editor", password="pass123", role="editor"
+        )
+        self.publisher = Publisher.objects.create(name="Tech Daily")
+
+    def test_fields_are_refreshed_on_save(self):
+        """Saving computes the derived fields and recomputes them on edit."""
+        article = Article.objects.create(
+            title="Long read",
+            content="word " * 450,
+            publisher=self.publisher,
+            author=self.editor,
+        )
+        self.assertEqual(article.word_count, 450)
+        self.assertEqual(article.reading_time, 3)
+        self.assertEqual(len(article.excerpt.split()), 50)
+        self.assertTrue(article.excerpt.endswith("…"))
+
+        article.content = "short"
+        article.save(update_fields=["content"])
+        article.refresh_from_db()
+        self.assertEqual((article.excerpt, article.word_count), ("short", 1))
+
+    def test_saves_that_skip_content_do_not_read_the_body(self):
+        """Saving other fields neither loads the body nor resets the fields."""
+        article = Article.objects.create(
+            title="Story",
+            content="one two three",
+            publisher=self.publisher,
+            author=self.editor,
+        )
+        article = Article.objects.get(pk=article.pk)
+        article.title = "Renamed"
+        with CaptureQueriesContext(connection) as queries:
+            article.save(update_fields=["title"])
+            article.save()
+        self.assertFalse(
+            [q["sql"] for q in queries if "articles_articlebody" in q["sql"]]
+        )
+        article.refresh_from_db()
+        self.assertEqual((article.excerpt, article.word_count), ("one two three", 3))
+
+    def test_backfill_command_updates_stale_rows(self):
+        """The backfill command fills rows written without ``save()``."""
+        newsletter = Newsletter.objects.create(
+            title="Weekly",
+            content="one two three",
+            publisher=self.publisher,
+            author=self.editor,
+        )
+        Newsletter.objects.filter(pk=newsletter.pk).update(excerpt="", word_count=0)
+
+        call_command("backfill_text_fields", "--batch-size", "1", stdout=StringIO())
+
+        newsletter.refresh_from_db()
+        self.assertEqual(newsletter.excerpt, "one two three")
+        self.assertEqual(newsletter.word_count, 3)
+
+    def test_summary_api_omits_content(self):
+        """``?view=summary`` returns excerpts without the body."""
+        Article.objects.create(
+            title="Story",
+            content="Body text",
+            publisher=self.publisher,
+            author=self.editor,
+        )
+        self.client_api.force_authenticate(user=self.editor)
+        response = self.client_api.get(
+            reverse("articles:api_articles"), {"view": "summary"}
+        )
+        item = response.json()[0]
+        self.assertNotIn("content", item)
+        self.assertEqual(item["excerpt"], "Body text")
+
+
+class PageCacheTests(BaseTestCase):
+    """Tests for the rendered detail page cache."""
+
+    def setUp(self):
+        cache.clear()
+        self.reader = User.objects.create_user(
+            username="reader", password="pass123", role="reader"
+        )
+        self.editor = User.objects.create_user(
+            username="editor", password="pass123", role="editor"
+        )
+        self.publisher = Publisher.objects.create(name="Tech Daily")
+        self.article = Article.objects.create(
+            title="Viral",
+            content="Original body",
+            publisher=self.publisher,
+            author=self.editor,
+            is_approved=True,
+        )
+        self.client.login(username="reader", password="pass123")
+        self.url = reverse("articles:detail", args=[self.article.pk])
+
+    def test_second_hit_is_served_from_cache(self):
+        """The body is rendered once and then served from the cache."""
+        self.client.get(self.url)
+        response = self.client.get(self.url)
+        self.assertContains(response, "Original body")
+        self.assertEqual(page_cache.stats()["hits"], 1)
+        self.assertEqual(page_cache.stats()["misses"], 1)
+
+    def test_save_invalidates_cached_body(self):
+        """Editing an article renders the new body on the next request."""
+        self.client.get(self.url)
+        article = Article.objects.get(pk=self.article.pk)
+        article.content = "Updated body"
+        article.save()
+        self.assertFalse(cache.has_key(page_cache.cache_key(self.article)))
+        self.assertContains(self.client.get(self.url), "Updated body")
+
+    def test_renames_refresh_the_cached_byline(self):
+        """Renaming the publisher or author re-renders the cached body."""
+        self.client.get(self.url)
+        publisher = self.article.publisher
+        publisher.name = "Renamed Daily"
+        publisher.save()
+        self.assertContains(self.client.get(self.url), "Renamed Daily")
+
+        author = self.article.author
+        author.username = "renamed_author"
+        author.save()
+        self.assertContains(self.client.get(self.url), "renamed_author")
+
+        author.save(update_fields=["last_login"])
+        self.client.get(self.url)
+        self.assertEqual(page_cache.stats()["misses"], 3)
+
+    def test_stats_endpoint_is_staff_only(self):
+        """Only staff users can read the counters."""
+        response = self.client.get(reverse("articles:page_cache_stats"))
+        self.assertEqual(response.status_code, 403)
+        self.reader.is_staff = True
+        self.reader.save()
+        response = self.client.get(reverse("articles:page_cache_stats"))
+        self.assertEqual(set(response.json()), {"hits", "misses", "hit_ratio"})
+
+
+class PrerenderTests(BaseTestCase):
+    """Tests for static pre-rendering of approved detail pages."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        override = override_settings(
+            STATIC_PAGES_ENABLED=True, STATIC_PAGES_ROOT=self.tmpdir.name
+        )
+        override.enable()
+        self.addCleanup(override.disable)
+        self.editor = User.objects.create_user(
+            username="editor", password="pass123", role="editor"
+        )
+        self.publisher = Publisher.objects.create(name="Tech Daily")
+
+    def _create(self, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Article.objects.create(
+                title="Static",
+                content="Static body",
+                publisher=self.publisher,
+                author=self.editor,
+                **kwargs,
+            )
+
+    def test_approved_article_is_written_with_gzip_copy(self):
+        """Approving writes the HTML page and its precompressed twin."""
+        article = self._create(is_approved=True)
+        path = prerender.page_path(Article, article.pk)
+        self.assertIn("Static body", path.read_text())
+        gz_path = path.with_name(path.name + ".gz")
+        self.assertEqual(gzip.decompress(gz_path.read_bytes()), path.read_bytes())
+
+    def test_unapproved_and_deleted_articles_have_no_page(self):
+        """Unapproved items are not written and deletes remove the files."""
+        draft = self._create()
+        self.assertFalse(prerender.page_path(Article, draft.pk).exists())
+
+        article = self._create(is_approved=True)
+        with self.captureOnCommitCallbacks(execute=True):
+            article.delete()
+        self.assertFalse(prerender.page_path(Article, article.pk).exists())
+
+    def test_bulk_approval_writes_pages(self):
+        """Bulk approval, which bypasses save(), still writes the pages."""
+        draft = self._create()
+        bulk_set_approval(Article, [draft.pk])
+        self.assertTrue(prerender.page_path(Article, draft.pk).exists())
+
+
+class FeedTests(BaseTestCase):
+    """Tests for the cached publisher and journalist feeds."""
+
+    def setUp(self):
+        cache.clear()
+        self.journalist_user = User.objects.create_user(
+            username="journo", password="pass123", role="journalist"
+        )
+        self.journalist = Journalist.objects.create(user=self.journalist_user)
+        self.publisher = Publisher.objects.create(name="Tech Daily")
+        Article.objects.create(
+            title="Published story",
+            content="Approved body",
+            publisher=self.publisher,
+            author=self.journalist_user,
+            is_approved=True,
+        )
+        Newsletter.objects.create(
+            title="Weekly letter",
+            content="Letter body",
+            publisher=self.publisher,
+            author=self.journalist_user,
+            is_approved=True,
+        )
+        self.draft = Article.objects.create(
+            title="Pending story",
+            content="Draft body",
+            publisher=self.publisher,
+            author=self.journalist_user,
+        )
+        self.url = reverse("articles:publisher_feed", args=[self.publisher.pk])
+
+    def test_feed_lists_approved_items_only(self):
+        """Approved articles and newsletters appear, drafts do not."""
+        response = self.client.get(self.url)
+        self.assertContains(response, "Published story")
+        self.assertContains(response, "Weekly letter")
+        self.assertNotContains(response, "Pending story")
+
+    def test_items_link_to_reader_detail_pages(self):
+        """Article and newsletter items both link to the reader detail views."""
+        response = self.client.get(self.url)
+        links = re.findall(
+            r"<item>.*?<link>http://testserver([^<]*)</link>",
+            response.content.decode(),
+            re.S,
+        )
+        self.assertEqual(len(links), 2)
+        self.assertEqual(
+            {resolve(link).func.__name__ for link in links},
+            {"reader_article_detail", "reader_newsletter_detail"},
+        )
+
+    def test_journalist_atom_feed(self):
+        """The Atom feed of a journalist lists their approved items."""
+        response = self.client.get(
+            reverse("articles:journalist_atom_feed", args=[self.journalist.pk])
+        )
+        self.assertContains(response, "Published story")
+        self.assertIn("atom", response["Content-Type"])
+
+    def test_cached_feed_answers_conditional_get(self):
+        """A repeat request with the ETag gets a 304 without queries."""
+        etag = self.client.get(self.url)["ETag"]
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_journalist_feed_conditional_get_without_queries(self):
+        """Journalist feeds also answer a repeat request without the database."""
+        url = reverse("articles:journalist_feed", args=[self.journalist.pk])
+        etag = self.client.get(url)["ETag"]
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        bulk_set_approval(Article, [self.draft.pk])
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_last_modified_is_never_in_the_future(self):
+        """Versions bumped ahead of the clock are reported as now."""
+        for _ in range(3):
+            feeds.bump_feed_versions([self.publisher.pk])
+        response = self.client.get(self.url)
+        self.assertLessEqual(
+            parse_http_date(response["Last-Modified"]), int(time.time())
+        )
+
+    def test_approval_expires_cached_feed(self):
+        """Approving an item changes the ETag and shows the new item."""
+        etag = self.client.get(self.url)["ETag"]
+        bulk_set_approval(Article, [self.draft.pk])
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Pending story")
+
+
+class DigestTests(BaseTestCase):
+    """Tests for the per-reader email delivery preference and digests."""
+
+    def setUp(self):
+        self.publisher = Publisher.objects.create(name="Tech Daily")
+        self.editor = User.objects.create_user(
+            username="editor", password="pass123", role="editor"
+        )
+        self.instant = User.objects.create_user(
+            username="instant", email="instant@example.com", role="reader"
+        )
+        self.daily = User.objects.create_user(
+            username="daily",
+            password="pass123",
+            email="daily@example.com",
+            role="reader",
+            email_delivery="daily",
+        )
+        for reader in (self.instant, self.daily):
+            Subscription.objects.create(user=reader, publisher=self.publisher)
+
+    def _approve(self, title):
+        return Article.objects.create(
+            title=title,
+            content="Body",
+            publisher=self.publisher,
+            author=self.editor,
+            is_approved=True,
+        )
+
+    def test_digest_readers_skip_immediate_emails(self):
+        """Only readers on immediate delivery are emailed on approval."""
+        article = self._approve("Breaking")
+        self.assertIsNotNone(article.approved_at)
+        self.assertEqual([m.to for m in mail.outbox], [["instant@example.com"]])
+
+    def test_daily_digest_groups_items_per_reader(self):
+        """One digest lists every item and the next run starts after it."""
+        self._approve("First story")
+        self._approve("Second story")
+        mail.outbox = []
+
+        run = send_digests("daily")
+        self.assertEqual((run.recipients, run.items), (1, 2))
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ["daily@example.com"])
+        self.assertIn("First story", mail.outbox[0].body)
+        self.assertIn("Second story", mail.outbox[0].body)
+
+        self.assertEqual(send_digests("daily").items, 0)
+        self.assertEqual(DigestRun.objects.filter(frequency="daily").count(), 2)
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_bulk_approval_is_included_in_digest(self):
+        """Items approved in bulk carry an approval time for the digest."""
+        draft = Article.objects.create(
+            title="Queued", content="Body", publisher=self.publisher, author=self.editor
+        )
+        bulk_set_approval(Article, [draft.pk])
+        mail.outbox = []
+        send_digests("daily")
+        self.assertIn("Queued", mail.outbox[0].body)
+
+    def test_reader_can_change_preference(self):
+        """Readers switch between immediate and digest delivery."""
+        self.client.login(username="daily", password="pass123")
+        response = self.client.post(
+            reverse("accounts:email_preferences"), {"email_delivery": "hourly"}
+        )
+        self.assertEqual(response.status_code, 302)
+        self.daily.refresh_from_db()
+        self.assertEqual(self.daily.email_delivery, "hourly")
+
+
+@override_settings(METRICS_TOKEN="scrape-secret")
+class MetricsTests(BaseTestCase):
+    """Tests for notification metrics and the Prometheus endpoint."""
+
+    def setUp(self):
+        cache.clear()
+        self.publisher = Publisher.objects.create(name="Tech Daily")
+        self.editor = User.objects.create_user(
+            username="editor", password="pass123", role="editor"
+        )
+        reader = User.objects.create_user(
+            username="reader", email="reader@example.com", role="reader"
+        )
+        Subscription.objects.create(user=reader, publisher=self.publisher)
+        self.url = reverse("articles:metrics")
+
+    def _approve(self):
+        Article.objects.create(
+            title="Story",
+            content="Body",
+            publisher=self.publisher,
+            author=self.editor,
+            is_approved=True,
+        )
+
+    def test_notification_records_counters_and_fanout(self):
+        """Approving an item counts emails and the recipient histogram."""
+        self._approve()
+        text = metrics.render()
+        self.assertIn("news_portal_emails_sent_total 1\n", text)
+        self.assertIn("news_portal_notification_recipients_count 1\n", text)
+        self.assertIn('news_portal_notification_recipients_bucket{le="1"} 1\n', text)
+
+    def test_tweet_failures_are_counted(self):
+        """A failing tweet increments the failure counter instead of printing."""
+        client = patch("articles.signals.get_twitter_client").start()
+        self.addCleanup(patch.stopall)
+        client.return_value.create_tweet.side_effect = RuntimeError("down")
+        with self.assertLogs("articles.signals", level="ERROR"):
+            self._approve()
+        self.assertIn("news_portal_tweets_failed_total 1\n", metrics.render())
+
+    def test_endpoint_requires_token_or_staff(self):
+        """Anonymous scrapes are refused; the bearer token is accepted."""
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+        response = self.client.get(
+            self.url, HTTP_AUTHORIZATION="Bearer scrape-secret"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "# TYPE news_portal_email_send_seconds histogram")
+
+
+class SlowQueryTests(BaseTestCase):
+    """Tests for the slow-query execute wrapper and middleware."""
+
+    def test_normalize_sql_merges_literals_and_in_lists(self):
+        """Queries differing only in values share one normalized form."""
+        self.assertEqual(
+            normalize_sql(
+                "SELECT *  FROM t WHERE id IN (%s, %s, %s) AND n = 'x' LIMIT 21"
+            ),
+            "SELECT * FROM t WHERE id IN (...) AND n = ? LIMIT ?",
+        )
+
+    @override_settings(SLOW_QUERY_ENABLED=True, SLOW_QUERY_THRESHOLD_MS=0)
+    def test_middleware_records_queries_with_caller(self):
+        """Captured queries carry the URL name and the issuing code."""
+        cache.clear()
+        publisher = Publisher.objects.create(name="Tech Daily")
+        self.client.get(reverse("articles:publisher_feed", args=[publisher.pk]))
+        queries = SlowQuery.objects.filter(last_url_name="articles:publisher_feed")
+        self.assertTrue(queries.exists())
+        self.assertTrue(
+            any(q.last_frame.startswith("articles/feeds.py:") for q in queries)
+        )
+
+    def test_middleware_is_off_by_default(self):
+        """Nothing is recorded unless SLOW_QUERY_ENABLED is set."""
+        self.client.get(reverse("articles:home"))
+        self.assertFalse(SlowQuery.objects.exists())
+
+
+class ProfilingTests(BaseTestCase):
+    """Tests for on-demand and sampled request profiling."""
+
+    def setUp(self):
+        self.staff = User.objects.create_user(
+            username="staff", password="pass123", role="editor", is_staff=True
+        )
+        self.reader = User.objects.create_user(
+            username="reader", password="pass123", role="reader"
+        )
+        self.url = reverse("articles:home")
+
+    def test_staff_flag_returns_report_and_stores_profile(self):
+        """``?prof`` returns a breakdown and the stats can be downloaded."""
+        self.client.login(username="staff", password="pass123")
+        response = self.client.get(self.url + "?prof")
+        self.assertContains(response, "sql ")
+        self.assertContains(response, "templates ")
+        profile = RequestProfile.objects.get()
+        self.assertTrue(profile.requested)
+        self.assertEqual(profile.url_name, "articles:home")
+
+        download = self.client.get(
+            reverse("monitoring:profile_download", args=[profile.pk])
+        )
+        self.assertEqual(bytes(download.content), bytes(profile.stats))
+
+    def test_flag_is_ignored_for_non_staff(self):
+        """Other users get the normal page and nothing is stored."""
+        self.client.login(username="reader", password="pass123")
+        response = self.client.get(self.url + "?prof")
+        self.assertContains(response, "Welcome to News Portal")
+        self.assertFalse(RequestProfile.objects.exists())
+
+    @override_settings(PROFILE_SAMPLE_RATE=1.0, PROFILE_MAX_STORED=2)
+    def test_sampled_requests_are_stored_and_pruned(self):
+        """Sampled requests render normally and only the newest are kept."""
+        for _ in range(3):
+            response = self.client.get(self.url)
+            self.assertContains(response, "Welcome to News Portal")
+        self.assertEqual(RequestProfile.objects.filter(requested=False).count(), 2)
+
+
+class IntegrationTests(TestCase):
+    """Tests for the lazy integrations registry and startup benchmark."""
+
+    @override_settings(TWITTER_ENABLED=False)
+    def test_disabled_twitter_returns_none(self):
+        """No client is created while Twitter is switched off."""
+        self.assertIsNone(integrations.get("twitter"))
+
+    @override_settings(TWITTER_ENABLED=True, TWITTER_API_KEY="key")
+    def test_enabled_twitter_client_is_loaded_once(self):
+        """The client is built on first use and then reused."""
+        with patch("tweepy.Client") as client_class:
+            first = integrations.get("twitter")
+            self.assertIs(integrations.get("twitter"), first)
+        client_class.assert_called_once()
+        self.assertEqual(client_class.call_args.kwargs["consumer_key"], "key")
+
+    def test_parse_importtime_keeps_top_level_modules(self):
+        """Only top-level imports are reported, slowest first."""
+        stderr = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       100 |        100 |   nested\n"
+            "import time:       200 |       1500 | django.urls\n"
+            "import time:       300 |       3000 | tweepy\n"
+        )
+        self.assertEqual(
+            parse_importtime(stderr, 5), [["tweepy", 3.0], ["django.urls", 1.5]]
+        )
+
+
+class SubscriptionSnapshotTests(BaseTestCase):
+    """Tests for the memoized per-request subscription snapshot."""
+
+    def setUp(self):
+        self.reader = User.objects.create_user(
+            username="reader", password="pass123", role="reader"
+        )
+        self.journalist_user = User.objects.create_user(
+            username="journo", password="pass123", role="journalist"
+        )
+        self.journalist = Journalist.objects.create(user=self.journalist_user)
+        self.publisher = Publisher.objects.create(name="Tech Daily")
+        other = Publisher.objects.create(name="Other")
+        Subscription.objects.create(user=self.reader, publisher=self.publisher)
+        Subscription.objects.create(user=self.reader, journalist=self.journalist)
+        for title, publisher in (("Followed", self.publisher), ("By journo", other)):
+            Article.objects.create(
+                title=title,
+                content="Body",
+                publisher=publisher,
+                author=self.journalist_user,
+                is_approved=True,
+            )
+
+    def test_snapshot_is_loaded_once(self):
+        """Repeated lookups reuse the sets stored on the user."""
+        with self.assertNumQueries(1):
+            snapshot = get_snapshot(self.reader)
+            self.assertIs(self.reader.subscription_snapshot, snapshot)
+        self.assertEqual(snapshot.publisher_ids, {self.publisher.pk})
+        self.assertEqual(snapshot.journalist_user_ids, {self.journalist_user.pk})
+
+    def test_home_queries_subscriptions_once(self):
+        """
+        The home page loads subscriptions and read state with one query; the
+        only other subscription query is the grouped unread count.
+        """
+        self.client.login(username="reader", password="pass123")
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("articles:home"))
+        self.assertContains(response, "Followed")
+        self.assertContains(response, "By journo")
+        subscription_queries = [
+            q for q in queries if 'FROM "subscriptions_subscription"' in q["sql"]
+        ]
+        self.assertEqual(len(subscription_queries), 2)
+
+
+class BulkSubscriptionAPITests(BaseTestCase):
+    """Tests for following and unfollowing many sources in one request."""
+
+    def setUp(self):
+        self.client_api = APIClient()
+        self.reader = User.objects.create_user(
+            username="reader", password="pass123", role="reader"
+        )
+        self.publishers = [
+            Publisher.objects.create(name=f"Publisher {i}") for i in range(3)
+        ]
+        self.journalist = Journalist.objects.create(
+            user=User.objects.create_user(
+                username="journo", password="pass123", role="journalist"
+            )
+        )
+        Subscription.objects.create(user=self.reader, publisher=self.publishers[0])
+        self.client_api.force_authenticate(self.reader)
+        self.url = reverse("articles:api_subscriptions")
+
+    def test_follow_and_unfollow_in_one_request(self):
+        """Existing follows are ignored, new ones added and others removed."""
+        response = self.client_api.post(
+            self.url,
+            {
+                "follow_publishers": [self.publishers[1].pk, self.publishers[2].pk],
+                "follow_journalists": [self.journalist.pk],
+                "unfollow_publishers": [self.publishers[0].pk],
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data,
+            {
+                "publishers": [self.publishers[1].pk, self.publishers[2].pk],
+                "journalists": [self.journalist.pk],
+            },
+        )
+        self.assertEqual(Subscription.objects.filter(user=self.reader).count(), 3)
+
+    def test_repeated_follow_does_not_duplicate(self):
+        """Following an already followed publisher keeps a single row."""
+        for _ in range(2):
+            response = self.client_api.post(
+                self.url,
+                {"follow_publishers": [self.publishers[0].pk]},
+                format="json",
+            )
+            self.assertEqual(response.data["publishers"], [self.publishers[0].pk])
+        self.assertEqual(Subscription.objects.filter(user=self.reader).count(), 1)
+
+    def test_unknown_ids_are_rejected(self):
+        """Following a missing publisher fails without changing anything."""
+        response = self.client_api.post(
+            self.url,
+            {"follow_publishers": [9999], "unfollow_publishers": [1]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("follow_publishers", response.data)
+        self.assertEqual(Subscription.objects.filter(user=self.reader).count(), 1)
+
+    def test_only_readers_can_use_the_api(self):
+        """Journalists are refused."""
+        self.client_api.force_authenticate(self.journalist.user)
+        response = self.client_api.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class AudienceIndexTests(BaseTestCase):
+    """Tests for the memory-mapped reverse subscription index."""
+
+    def setUp(self):
+        cache.clear()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings_override = override_settings(
+            AUDIENCE_INDEX_PATH=Path(directory.name) / "audience.idx"
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.publisher = Publisher.objects.create(name="Tech Daily")
+        self.journalist = Journalist.objects.create(
+            user=User.objects.create_user(
+                username="journo", password="pass123", role="journalist"
+            )
+        )
+        self.readers = [
+            User.objects.create_user(
+                username=f"reader{i}", password="pass123", role="reader"
+            )
+            for i in range(4)
+        ]
+        Subscription.objects.create(user=self.readers[0], publisher=self.publisher)
+        Subscription.objects.create(user=self.readers[1], publisher=self.publisher)
+        Subscription.objects.create(user=self.readers[1], journalist=self.journalist)
+        Subscription.objects.create(user=self.readers[2], journalist=self.journalist)
+
+    def ids(self, *readers):
+        """Return the sorted ids of the given readers."""
+        return sorted(reader.pk for reader in readers)
+
+    def test_sorted_array_operations(self):
+        """Union and difference keep the result sorted and distinct."""
+        self.assertEqual(
+            list(audience.union(array("q", [1, 4, 9]), [2, 4, 10])), [1, 2, 4, 9, 10]
+        )
+        self.assertEqual(
+            list(audience.difference(array("q", [1, 4, 9]), [4, 5])), [1, 9]
+        )
+
+    def test_build_and_lookup(self):
+        """Audiences come from the index file plus one change-log query."""
+        self.assertIsNone(audience.audience(self.publisher.pk))
+        call_command("build_audience_index", stdout=StringIO())
+        with self.assertNumQueries(1):
+            followers = audience.audience(self.publisher.pk, self.journalist.pk)
+        self.assertEqual(list(followers), self.ids(*self.readers[:3]))
+        self.assertEqual(
+            list(audience.audience(journalist_id=self.journalist.pk)),
+            self.ids(*self.readers[1:3]),
+        )
+
+    def test_changes_after_build_are_applied(self):
+        """Follows and unfollows made after the build are merged on lookup."""
+        audience.build()
+        with self.captureOnCommitCallbacks(execute=True):
+            Subscription.objects.create(user=self.readers[3], publisher=self.publisher)
+            Subscription.objects.filter(
+                user=self.readers[0], publisher=self.publisher
+            ).delete()
+        self.assertEqual(
+            list(audience.audience(self.publisher.pk)),
+            self.ids(self.readers[1], self.readers[3]),
+        )
+        readers = get_subscribed_readers(self.publisher, self.journalist)
+        self.assertEqual(
+            sorted(readers.values_list("pk", flat=True)), self.ids(*self.readers[1:])
+        )
+
+    def test_changes_do_not_depend_on_the_cache(self):
+        """Changes are logged in the database; a rebuild prunes the old ones."""
+        audience.build()
+        with self.captureOnCommitCallbacks(execute=True):
+            Subscription.objects.create(user=self.readers[3], publisher=self.publisher)
+        cache.clear()
+        self.assertEqual(
+            list(audience.audience(self.publisher.pk)),
+            self.ids(*self.readers[:2], self.readers[3]),
+        )
+
+        audience.build()
+        audience.build()
+        self.assertFalse(AudienceChange.objects.exists())
+        self.assertEqual(
+            list(audience.audience(self.publisher.pk)),
+            self.ids(*self.readers[:2], self.readers[3]),
+        )
+
+    def test_rebuild_leaves_the_old_mapping_readable(self):
+        """A replaced index stays usable by threads that still hold it."""
+        audience.build()
+        first = audience.get_index()
+        audience.build()
+        audience.build()
+        self.assertIsNot(audience.get_index(), first)
+        self.assertFalse(first._map.closed)
+        self.assertEqual(
+            list(first.lookup(audience.PUBLISHER, self.publisher.pk)),
+            list(audience.get_index().lookup(audience.PUBLISHER, self.publisher.pk)),
+        )
+
+
+class DirectoryTests(BaseTestCase):
+    """Tests for the searchable publisher/journalist directory."""
+
+    def setUp(self):
+        directory.prefix_cache.clear()
+        self.client_api = APIClient()
+        self.reader = User.objects.create_user(
+            username="reader", password="pass123", role="reader"
+        )
+        self.client_api.force_authenticate(self.reader)
+        names = ["Guardian", "Gulf News", "Le Mondé", "BBC", "Guernsey Press"]
+        self.publishers = {
+            name: Publisher.objects.create(name=name) for name in names
+        }
+        self.url = reverse("articles:api_directory")
+
+    def names(self, response):
+        """Return the names listed in a directory response."""
+        return [item["name"] for item in response.data["items"]]
+
+    def test_normalized_name_and_subscriber_count(self):
+        """Names are normalized on save and follows update the count."""
+        publisher = self.publishers["Le Mondé"]
+        self.assertEqual(publisher.normalized_name, "le monde")
+        subscription = Subscription.objects.create(
+            user=self.reader, publisher=publisher
+        )
+        publisher.refresh_from_db()
+        self.assertEqual(publisher.subscriber_count, 1)
+        subscription.delete()
+        publisher.refresh_from_db()
+        self.assertEqual(publisher.subscriber_count, 0)
+
+    def test_prefix_search_with_keyset_pagination(self):
+        """Pages follow each other through the cursor without overlap."""
+        response = self.client_api.get(
+            self.url, {"type": "publisher", "q": "GU", "limit": 2}
+        )
+        self.assertEqual(self.names(response), ["Guardian", "Guernsey Press"])
+        response = self.client_api.get(
+            self.url,
+            {
+                "type": "publisher",
+                "q": "gu",
+                "limit": 2,
+                "cursor": response.data["next_cursor"],
+            },
+        )
+        self.assertEqual(self.names(response), ["Gulf News"])
+        self.assertIsNone(response.data["next_cursor"])
+
+    def test_prefix_is_an_indexable_range(self):
+        """The prefix is a range on normalized_name, not a LIKE pattern."""
+        with CaptureQueriesContext(connection) as queries:
+            page = directory.search("publisher", "gu")
+        self.assertEqual(len(page["items"]), 3)
+        sql = queries[-1]["sql"]
+        self.assertIn('"normalized_name" >= ', sql)
+        self.assertIn('"normalized_name" < ', sql)
+        self.assertNotIn("LIKE", sql.upper())
+
+    def test_popular_ordering_and_subscribed_flag(self):
+        """Most followed sources come first and readers see what they follow."""
+        apply_changes(self.reader, follow_publishers=[self.publishers["BBC"].pk])
+        response = self.client_api.get(
+            self.url, {"type": "publisher", "ordering": "popular", "limit": 1}
+        )
+        self.assertEqual(response.data["items"][0]["name"], "BBC")
+        self.assertEqual(response.data["items"][0]["subscriber_count"], 1)
+        self.assertTrue(response.data["items"][0]["subscribed"])
+
+    def test_bulk_follow_recounts_subscribers(self):
+        """Repeated bulk follows do not double count and fix drifted counts."""
+        publisher = self.publishers["BBC"]
+        Publisher.objects.filter(pk=publisher.pk).update(subscriber_count=7)
+        apply_changes(self.reader, follow_publishers=[publisher.pk])
+        apply_changes(self.reader, follow_publishers=[publisher.pk])
+        publisher.refresh_from_db()
+        self.assertEqual(publisher.subscriber_count, 1)
+        apply_changes(self.reader, unfollow_publishers=[publisher.pk])
+        publisher.refresh_from_db()
+        self.assertEqual(publisher.subscriber_count, 0)
+
+    def test_longer_prefix_served_from_cache(self):
+        """A complete shorter-prefix result answers longer prefixes in memory."""
+        directory.search("publisher", "g")
+        with self.assertNumQueries(0):
+            page = directory.search("publisher", "gue")
+        self.assertEqual([item["name"] for item in page["items"]], ["Guernsey Press"])
+
+
+@override_settings(DATABASE_REPLICAS=["replica_0"])
+class ReplicaRoutingTests(SimpleTestCase):
+    """Tests for replica routing decisions and primary pinning."""
+
+    def run_view(self, view, method="get", cookies=None):
+        """Run ``view`` through the middleware and return the routed aliases."""
+        request = getattr(RequestFactory(), method)("/")
+        request.COOKIES.update(cookies or {})
+        routed = []
+
+        def get_response(request):
+            middleware.process_view(request, view, (), {})
+            return view(request, routed)
+
+        middleware = ReplicaRoutingMiddleware(get_response)
+        return middleware(request), routed
+
+    @staticmethod
+    @replica_reads
+    def reading_view(request, routed):
+        routed.append(router.db_for_read(Publisher))
+        return HttpResponse()
+
+    @staticmethod
+    @replica_reads
+    def writing_view(request, routed):
+        routed.append(router.db_for_write(Publisher))
+        routed.append(router.db_for_read(Publisher))
+        return HttpResponse()
+
+    def test_marked_get_views_read_from_replica(self):
+        """Safe requests to replica-safe views read from a replica."""
+        response, routed = self.run_view(self.reading_view)
+        self.assertEqual(routed, ["replica_0"])
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+        self.assertEqual(router.db_for_read(Publisher), "default")
+
+    def test_unsafe_methods_read_from_primary(self):
+        """POST requests never use a replica."""
+        _, routed = self.run_view(self.reading_view, method="post")
+        self.assertEqual(routed, ["default"])
+
+    def test_writes_pin_the_client_to_primary(self):
+        """After a write, reads use the primary now and on the next request."""
+        response, routed = self.run_view(self.writing_view)
+        self.assertEqual(routed, ["default", "default"])
+        self.assertIn(PIN_COOKIE, response.cookies)
+
+        _, routed = self.run_view(
+            self.reading_view, cookies={PIN_COOKIE: response.cookies[PIN_COOKIE].value}
+        )
+        self.assertEqual(routed, ["default"])
+
+
+class ViewCountTests(BaseTestCase):
+    """Tests for buffered view counting and the most-read endpoint."""
+
+    def setUp(self):
+        cache.clear()
+        self.reader = User.objects.create_user(
+            username="reader", password="pass123", role="reader"
+        )
+        self.publisher = Publisher.objects.create(name="Tech Daily")
+        self.articles = [
+            Article.objects.create(
+                title=f"Story {i}",
+                content="Body",
+                publisher=self.publisher,
+                author=self.reader,
+                is_approved=True,
+            )
+            for i in range(3)
+        ]
+
+    def view(self, article, times):
+        """Open an article's detail page ``times`` times."""
+        for _ in range(times):
+            self.client.get(reverse("articles:detail", args=[article.pk]))
+
+    def test_views_are_buffered_then_flushed_in_one_batch(self):
+        """Hits are not written per request; a flush adds them all."""
+        self.client.login(username="reader", password="pass123")
+        self.view(self.articles[0], 3)
+        self.view(self.articles[1], 1)
+        self.assertFalse(ArticleViewCount.objects.exists())
+
+        # Live-article check, upsert, update and top-list read, plus the
+        # savepoint pair of the write transaction inside the test case.
+        with self.assertNumQueries(6):
+            self.assertEqual(view_counts.flush(), 4)
+        self.view(self.articles[0], 2)
+        view_counts.flush()
+        self.assertEqual(
+            dict(ArticleViewCount.objects.values_list("article_id", "views")),
+            {self.articles[0].pk: 5, self.articles[1].pk: 1},
+        )
+
+    @override_settings(VIEW_COUNT_FLUSH_HITS=2)
+    def test_buffer_flushes_after_enough_hits(self):
+        """The buffer is written once it holds VIEW_COUNT_FLUSH_HITS hits."""
+        self.client.login(username="reader", password="pass123")
+        self.view(self.articles[2], 2)
+        self.assertEqual(ArticleViewCount.objects.get().views, 2)
+
+    def test_most_read_list_is_merged_on_flush(self):
+        """The cached top list follows new totals without re-sorting the table."""
+        for article, times in zip(self.articles, (1, 3, 2)):
+            for _ in range(times):
+                view_counts.buffer.add(article.pk, self.publisher.pk)
+        view_counts.flush()
+
+        client = APIClient()
+        client.force_authenticate(self.reader)
+        url = reverse("articles:api_most_read", args=[self.publisher.pk])
+        response = client.get(url)
+        self.assertEqual(
+            [item["title"] for item in response.data["items"]],
+            ["Story 1", "Story 2", "Story 0"],
+        )
+
+        for _ in range(5):
+            view_counts.buffer.add(self.articles[0].pk, self.publisher.pk)
+        view_counts.flush()
+        with self.assertNumQueries(0):
+            top = view_counts.most_read(self.publisher.pk)
+        self.assertEqual(top[0], (self.articles[0].pk, "Story 0", 6))
+
+    def test_flush_skips_deleted_articles_and_keeps_hits_on_failure(self):
+        """Hits of vanished articles are dropped; failed writes are re-buffered."""
+        for article in self.articles[:2]:
+            view_counts.buffer.add(article.pk, self.publisher.pk)
+        self.articles[1].delete()
+        self.assertEqual(view_counts.flush(), 1)
+        self.assertEqual(
+            list(ArticleViewCount.objects.values_list("article_id", flat=True)),
+            [self.articles[0].pk],
+        )
+
+        view_counts.buffer.add(self.articles[2].pk, self.publisher.pk)
+        with patch(
+            "articles.view_counts._write", side_effect=DatabaseError("down")
+        ), self.assertLogs("articles.view_counts", "ERROR"):
+            self.assertEqual(view_counts.safe_flush(), 0)
+        self.assertEqual(
+            view_counts.buffer.drain(), {self.articles[2].pk: [self.publisher.pk, 1]}
+        )
+
+
+class ReadStateTests(BaseTestCase):
+    """Tests for high-water mark read state and unread counts."""
+
+    def setUp(self):
+        self.reader = User.objects.create_user(
+            username="reader", password="pass123", role="reader"
+        )
+        writer = User.objects.create_user(
+            username="journo", password="pass123", role="journalist"
+        )
+        self.journalist = Journalist.objects.create(user=writer)
+        self.publisher = Publisher.objects.create(name="Tech Daily")
+        Subscription.objects.create(user=self.reader, publisher=self.publisher)
+        Subscription.objects.create(user=self.reader, journalist=self.journalist)
+        now = timezone.now()
+        Subscription.objects.update(created_at=now - timedelta(days=1))
+
+        self.articles = []
+        for hours, author in ((3, writer), (2, self.reader), (1, self.reader)):
+            article = Article.objects.create(
+                title=f"Story {hours}",
+                content="Body",
+                publisher=self.publisher,
+                author=author,
+                is_approved=True,
+            )
+            Article.objects.filter(pk=article.pk).update(
+                approved_at=now - timedelta(hours=hours)
+            )
+            article.refresh_from_db()
+            self.articles.append(article)
+        Newsletter.objects.create(
+            title="Weekly",
+            content="Body",
+            publisher=self.publisher,
+            author=writer,
+            is_approved=True,
+        )
+        self.client.login(username="reader", password="pass123")
+
+    def counts(self):
+        """Return unread (articles, newsletters) per source type."""
+        user = User.objects.get(pk=self.reader.pk)
+        return {
+            source["type"]: (source["articles"], source["newsletters"])
+            for source in read_state.unread_counts(user)
+        }
+
+    def test_reads_are_recorded_as_exceptions_in_every_source(self):
+        """Opening an item marks it read for its publisher and journalist."""
+        user = User.objects.get(pk=self.reader.pk)
+        with self.assertNumQueries(2):
+            read_state.unread_counts(user)
+        self.assertEqual(self.counts(), {"publisher": (3, 1), "journalist": (1, 1)})
+
+        for article in (self.articles[2], self.articles[0]):
+            self.client.get(reverse("articles:detail", args=[article.pk]))
+        self.assertEqual(self.counts(), {"publisher": (1, 1), "journalist": (0, 1)})
+        self.assertEqual(
+            Subscription.objects.get(publisher=self.publisher).read_exceptions,
+            {"article": [self.articles[0].pk, self.articles[2].pk]},
+        )
+
+        response = self.client.get(reverse("articles:reader_list"))
+        self.assertEqual(response.context["unread_articles"], {self.articles[1].pk})
+        response = self.client.get(reverse("articles:home"))
+        self.assertEqual(len(response.context["unread_sources"]), 2)
+
+    def test_mark_source_read_through_api(self):
+        """The mark only moves forward and absorbs the exceptions it covers."""
+        self.client.get(reverse("articles:detail", args=[self.articles[0].pk]))
+        client = APIClient()
+        client.force_authenticate(self.reader)
+        url = reverse("articles:api_read_state")
+
+        response = client.post(
+            url,
+            {
+                "type": "publisher",
+                "id": self.publisher.pk,
+                "until": self.articles[1].approved_at.isoformat(),
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        subscription = Subscription.objects.get(publisher=self.publisher)
+        self.assertEqual(subscription.read_until, self.articles[1].approved_at)
+        self.assertEqual(subscription.read_exceptions, {})
+
+        response = client.post(
+            url,
+            {"type": "publisher", "id": self.publisher.pk, "until": "2000-01-01"},
+            format="json",
+        )
+        self.assertEqual(response.data["read_until"], self.articles[1].approved_at)
+        response = client.get(url)
+        self.assertEqual(
+            [(s["type"], s["articles"]) for s in response.data["sources"]],
+            [("publisher", 1), ("journalist", 0)],
+        )
+        response = client.post(url, {"type": "publisher", "id": 999}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    @patch("subscriptions.read_state.READ_EXCEPTIONS_MAX", 1)
+    def test_oversized_exception_set_is_folded_into_the_mark(self):
+        """Items read up to the oldest unread one move the mark instead."""
+        for article in (self.articles[1], self.articles[0]):
+            self.client.get(reverse("articles:detail", args=[article.pk]))
+        subscription = Subscription.objects.get(publisher=self.publisher)
+        self.assertEqual(subscription.read_until, self.articles[1].approved_at)
+        self.assertEqual(subscription.read_exceptions, {})
+        self.assertEqual(self.counts()["publisher"], (1, 1))
+
+
+class ArchiveTests(BaseTestCase):
+    """Tests for moving old content into the archive tables."""
+
+    def setUp(self):
+        self.reader = User.objects.create_user(
+            username="reader", password="pass123", role="reader"
+        )
+        self.publisher = Publisher.objects.create(name="Tech Daily")
+        self.old, self.pending, self.recent = [
+            Article.objects.create(
+                title=title,
+                content="Old news " * 10,
+                publisher=self.publisher,
+                author=self.reader,
+                is_approved=approved,
+            )
+            for title, approved in (("Old", True), ("Pending", False), ("New", True))
+        ]
+        self.newsletter = Newsletter.objects.create(
+            title="Old letter",
+            content="Body",
+            publisher=self.publisher,
+            author=self.reader,
+            is_approved=True,
+        )
+        long_ago = timezone.now() - timedelta(days=400)
+        for model, pks in (
+            (Article, [self.old.pk, self.pending.pk]),
+            (Newsletter, [self.newsletter.pk]),
+        ):
+            model.objects.filter(pk__in=pks).update(created_at=long_ago)
+
+    def test_command_moves_old_approved_items_in_batches(self):
+        """Only approved items past the age limit move; ids are kept."""
+        out = StringIO()
+        call_command(
+            "archive_content", "--batch-size", "1", "--pause", "0", stdout=out
+        )
+        self.assertIn("Archived 1 article(s).", out.getvalue())
+        self.assertIn("Archived 1 newsletter(s).", out.getvalue())
+
+        self.assertEqual(
+            set(Article.objects.values_list("title", flat=True)), {"Pending", "New"}
+        )
+        archived = ArchivedArticle.objects.get()
+        self.assertEqual((archived.pk, archived.title), (self.old.pk, "Old"))
+        self.assertEqual(archived.excerpt, self.old.excerpt)
+        self.assertEqual(archived.approved_at, self.old.approved_at)
+        self.assertTrue(
+            ArchivedNewsletter.objects.filter(pk=self.newsletter.pk).exists()
+        )
+
+    def test_detail_views_fall_back_to_the_archive(self):
+        """Archived items stay reachable at their old URLs but are not counted."""
+        archive.archive(Article, pause=0)
+        archive.archive(Newsletter, pause=0)
+        self.client.login(username="reader", password="pass123")
+
+        response = self.client.get(reverse("articles:detail", args=[self.old.pk]))
+        self.assertContains(response, "Old news")
+        response = self.client.get(
+            reverse("newsletters:reader_detail", args=[self.newsletter.pk])
+        )
+        self.assertContains(response, "Old letter")
+        self.assertEqual(view_counts.buffer.drain(), {})
+
+        Subscription.objects.create(user=self.reader, publisher=self.publisher)
+        response = self.client.get(reverse("articles:reader_list"))
+        self.assertEqual(list(response.context["articles"]), [self.recent])
+        response = self.client.get(reverse("articles:detail", args=[999]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_view_counts_and_exports_cover_archived_items(self):
+        """Archiving keeps view totals, and exports still include the rows."""
+        for _ in range(3):
+            view_counts.buffer.add(self.old.pk, self.publisher.pk)
+        view_counts.buffer.add(self.recent.pk, self.publisher.pk)
+        view_counts.flush()
+        archive.archive(Article, pause=0)
+        archive.archive(Newsletter, pause=0)
+
+        self.assertEqual(ArticleViewCount.objects.get(article_id=self.old.pk).views, 3)
+        rows = list(exports.export_rows("articles", chunk_size=1))
+        self.assertEqual(
+            [(row["id"], row["title"]) for row in rows],
+            [
+                (self.old.pk, "Old"),
+                (self.pending.pk, "Pending"),
+                (self.recent.pk, "New"),
+            ],
+        )
+        self.assertEqual(rows[0]["content"], "Old news " * 10)
+        rows = list(exports.export_rows("newsletters"))
+        self.assertEqual([row["id"] for row in rows], [self.newsletter.pk])
+
+        self.recent.delete()
+        self.assertFalse(
+            ArticleViewCount.objects.filter(article_id=self.recent.pk).exists()
+        )
+
+
+class BodyStorageTests(BaseTestCase):
+    """Tests for compressed bodies stored outside the main tables."""
+
+    def setUp(self):
+        self.editor = User.objects.create_user(
+            username="editor", password="pass123", role="editor"
+        )
+        self.publisher = Publisher.objects.create(name="Tech Daily")
+        self.article = Article.objects.create(
+            title="Story",
+            content="Breaking news " * 200,
+            publisher=self.publisher,
+            author=self.editor,
+            is_approved=True,
+        )
+
+    def test_body_is_compressed_and_read_transparently(self):
+        """The body row is compressed and ``content`` reads it back lazily."""
+        body = ArticleBody.objects.get(pk=self.article.pk)
+        self.assertLess(len(body.data), len("Breaking news " * 200) // 10)
+        article = Article.objects.get(pk=self.article.pk)
+        self.assertEqual(article.legacy_content, "")
+        with self.assertNumQueries(1):
+            self.assertEqual(article.content, "Breaking news " * 200)
+
+        article.content = "Rewritten"
+        article.save(update_fields=["content"])
+        self.assertEqual(Article.objects.get(pk=article.pk).content, "Rewritten")
+        self.assertEqual(ArticleBody.objects.count(), 1)
+
+    def test_lists_do_not_read_the_body_table(self):
+        """Reader lists and summary API pages never query the body table."""
+        reader = User.objects.create_user(
+            username="reader", password="pass123", role="reader"
+        )
+        Subscription.objects.create(user=reader, publisher=self.publisher)
+        self.client.login(username="reader", password="pass123")
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("articles:reader_list"))
+        self.assertContains(response, "Story")
+        body_table = ArticleBody._meta.db_table
+        self.assertFalse(any(body_table in q["sql"] for q in queries))
+
+    def test_move_command_compresses_legacy_rows(self):
+        """Inline bodies are moved, cleared and reported with their savings."""
+        Article.objects.filter(pk=self.article.pk).update(legacy_content="Old body")
+        ArticleBody.objects.all().delete()
+        self.assertEqual(Article.objects.get(pk=self.article.pk).content, "Old body")
+
+        out = StringIO()
+        call_command("move_content_bodies", "--model", "article", stdout=out)
+        self.assertIn("Moved the bodies of 1 article(s).", out.getvalue())
+        self.assertIn("bytes less per article row", out.getvalue())
+        article = Article.objects.get(pk=self.article.pk)
+        self.assertEqual(article.legacy_content, "")
+        self.assertEqual(article.content, "Old body")
+
+
+class RevisionTests(BaseTestCase):
+    """Tests for the article revision history."""
+
+    def setUp(self):
+        self.editor = User.objects.create_user(
+            username="editor", password="pass123", role="editor"
+        )
+        self.publisher = Publisher.objects.create(name="Tech Daily")
+        self.paragraphs = [f"Paragraph {i} of a long article." for i in range(200)]
+        self.article = Article.objects.create(
+            title="Draft",
+            content="\n".join(self.paragraphs),
+            publisher=self.publisher,
+            author=self.editor,
+        )
+        self.client.login(username="editor", password="pass123")
+
+    def edit(self, title, content):
+        """Save a new version through the editor edit view."""
+        self.client.post(
+            reverse("articles:editor_edit", args=[self.article.pk]),
+            {"title": title, "content": content, "publisher": self.publisher.pk},
+        )
+
+    def test_edits_are_stored_as_reverse_diffs(self):
+        """Only the newest version is stored in full; all can be rebuilt."""
+        versions = ["\n".join(self.paragraphs)]
+        for i in range(3):
+            self.paragraphs[i * 50] = f"Rewritten paragraph {i}."
+            versions.append("\n".join(self.paragraphs))
+            self.edit(f"Take {i}", versions[-1])
+
+        history = list(self.article.revisions.order_by("number"))
+        self.assertEqual([r.number for r in history], [1, 2, 3, 4])
+        self.assertEqual([r.is_snapshot for r in history], [False] * 3 + [True])
+        self.assertEqual(history[0].title, "Draft")
+        self.assertEqual(history[3].edited_by, self.editor)
+        self.assertLess(len(history[0].data), len(history[3].data) // 5)
+        for revision, text in zip(history, versions):
+            self.assertEqual(revisions.get_text(revision), text)
+
+        self.edit("Take 2", versions[-1])
+        self.assertEqual(self.article.revisions.count(), 4)
+
+    @override_settings(REVISION_SNAPSHOT_EVERY=2)
+    def test_snapshots_bound_the_chain_and_history_shows_a_diff(self):
+        """Snapshots are kept every few revisions; the view diffs two of them."""
+        for i in range(4):
+            self.edit("Draft", f"Version {i}\n" + "\n".join(self.paragraphs))
+        flags = self.article.revisions.order_by("number").values_list(
+            "is_snapshot", flat=True
+        )
+        self.assertEqual(list(flags), [False, True, False, True, True])
+        oldest = self.article.revisions.get(number=1)
+        with self.assertNumQueries(2):
+            self.assertEqual(revisions.get_text(oldest), "\n".join(self.paragraphs))
+
+        response = self.client.get(
+            reverse("articles:editor_history", args=[self.article.pk]),
+            {"a": 2, "b": 5},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(("remove", "-Version 0"), response.context["diff"])
+        self.assertIn(("add", "+Version 3"), response.context["diff"])
+
+    def test_compact_thins_old_revisions_to_one_per_day(self):
+        """Old same-day revisions collapse into the last one of the day."""
+        for i in range(4):
+            self.edit(f"Take {i}", f"Version {i}\n" + "\n".join(self.paragraphs))
+        long_ago = timezone.now() - timedelta(days=60)
+        self.article.revisions.filter(number__lt=4).update(created_at=long_ago)
+
+        out = StringIO()
+        call_command("compact_revisions", stdout=out)
+        self.assertIn("Dropped 2 revision(s) of 1 article(s).", out.getvalue())
+        kept = list(self.article.revisions.order_by("number"))
+        self.assertEqual([r.number for r in kept], [3, 4, 5])
+        self.assertEqual(
+            revisions.get_text(kept[0]), "Version 1\n" + "\n".join(self.paragraphs)
+        )
+        self.article.refresh_from_db()
+        self.assertEqual(revisions.get_text(kept[2]), self.article.content)
+
+    def test_history_survives_archiving_but_not_deletion(self):
+        """Archived articles keep their history; deleted ones drop it."""
+        for i in range(2):
+            self.edit("Draft", f"Version {i}\n" + "\n".join(self.paragraphs))
+        long_ago = timezone.now() - timedelta(days=400)
+        Article.objects.filter(pk=self.article.pk).update(
+            is_approved=True, created_at=long_ago
+        )
+        archive.archive(Article, pause=0)
+        self.assertFalse(Article.objects.filter(pk=self.article.pk).exists())
+
+        history = ArticleRevision.objects.filter(article_id=self.article.pk)
+        self.assertEqual(history.count(), 3)
+        oldest = history.get(number=1)
+        self.assertEqual(revisions.get_text(oldest), "\n".join(self.paragraphs))
+        response = self.client.get(
+            reverse("articles:editor_history", args=[self.article.pk])
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context["archived"])
+        self.assertIn(("add", "+Version 1"), response.context["diff"])
+
+        other = Article.objects.create(
+            title="Short-lived",
+            content="Body",
+            publisher=self.publisher,
+            author=self.editor,
+        )
+        self.article = other
+        self.edit("Short-lived", "Edited")
+        other.delete()
+        self.assertFalse(ArticleRevision.objects.filter(article_id=other.pk).exists())
+        self.assertEqual(history.count(), 3)
+
+
+class SchedulingTests(BaseTestCase):
+    """Tests for scheduled publishing and the release scheduler."""
+
+    def setUp(self):
+        cache.clear()
+        self.editor = User.objects.create_user(
+            username="editor", password="pass123", role="editor"
+        )
+        self.reader = User.objects.create_user(
+            username="reader",
+            password="pass123",
+            role="reader",
+            email="reader@example.com",
+        )
+        self.publisher = Publisher.objects.create(name="Tech Daily")
+        Subscription.objects.create(user=self.reader, publisher=self.publisher)
+        self.later = timezone.now() + timedelta(hours=2)
+        self.articles = [
+            Article.objects.create(
+                title=f"Embargoed {i}",
+                content="Body",
+                publisher=self.publisher,
+                author=self.editor,
+                publish_at=self.later,
+            )
+            for i in range(3)
+        ]
+
+    def test_approval_waits_for_the_release_time(self):
+        """Approving a future item schedules it without publishing or emailing."""
+        self.client.login(username="editor", password="pass123")
+        article = self.articles[0]
+        self.client.post(
+            reverse("articles:editor_edit", args=[article.pk]),
+            {
+                "title": article.title,
+                "content": "Body",
+                "publisher": self.publisher.pk,
+                "publish_at": self.later.strftime("%Y-%m-%dT%H:%M"),
+                "approve": "1",
+            },
+        )
+        article.refresh_from_db()
+        self.assertEqual((article.is_approved, article.is_scheduled), (False, True))
+        self.assertIsNone(article.approved_at)
+        self.assertEqual(mail.outbox, [])
+
+        bulk_set_approval(Article, [a.pk for a in self.articles], approve=True)
+        self.assertEqual(Article.objects.filter(is_scheduled=True).count(), 3)
+        self.assertFalse(Article.objects.filter(is_approved=True).exists())
+        bulk_set_approval(Article, [article.pk], approve=False)
+        article.refresh_from_db()
+        self.assertFalse(article.is_scheduled)
+        self.assertEqual(mail.outbox, [])
+
+    def test_scheduler_releases_due_items_in_batches(self):
+        """Due items are published batch by batch with one grouped email."""
+        bulk_set_approval(Article, [a.pk for a in self.articles], approve=True)
+        due = timezone.now() - timedelta(seconds=30)
+        Article.objects.filter(pk__in=[a.pk for a in self.articles[:2]]).update(
+            publish_at=due
+        )
+
+        out = StringIO()
+        call_command("publish_scheduled", "--once", "--batch-size", "1", stdout=out)
+        self.assertIn("Released 2 article(s).", out.getvalue())
+        self.assertEqual(
+            set(Article.objects.filter(is_approved=True).values_list("pk", flat=True)),
+            {a.pk for a in self.articles[:2]},
+        )
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertIn("Embargoed 1", mail.outbox[0].body)
+        self.assertEqual(scheduling.next_release(), self.later)
+        exposition = metrics.render()
+        self.assertIn("news_portal_scheduled_releases_total 2", exposition)
+        self.assertIn('news_portal_release_delay_seconds_bucket{le="30"} 0', exposition)
+        self.assertIn("news_portal_release_delay_seconds_count 2", exposition)
+
+        self.assertEqual(scheduling.release_due(), {"article": 0, "newsletter": 0})
+
+
+@override_settings(
+    API_THROTTLE_BURST=3,
+    API_THROTTLE_IP_BURST=10,
+    API_THROTTLE_RATES={
+        "reader": "60/min",
+        "editor": "120/min",
+        "ip": "600/min",
+    },
+)
+class ThrottleTests(BaseTestCase):
+    """Tests for the token-bucket throttles of the subscriber APIs."""
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.client_api = APIClient()
+        self.reader = User.objects.create_user(
+            username="bucket_reader", password="pass", role="reader"
+        )
+        self.editor = User.objects.create_user(
+            username="bucket_editor", password="pass", role="editor"
+        )
+        self.url = reverse("articles:api_articles")
+        now = patch("articles.throttling._now", return_value=1000.0)
+        self.now = now.start()
+        self.addCleanup(now.stop)
+
+    def test_burst_then_throttled_until_refilled(self):
+        """A burst is served, then 429 with Retry-After until a token is back."""
+        self.client_api.force_authenticate(self.reader)
+        remaining = []
+        for _ in range(3):
+            response = self.client_api.get(self.url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response["X-RateLimit-Limit"], "3")
+            remaining.append(response["X-RateLimit-Remaining"])
+        self.assertEqual(remaining, ["2", "1", "0"])
+        self.assertEqual(response["X-RateLimit-Reset"], "3")
+
+        response = self.client_api.get(reverse("articles:api_newsletters"))
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(response["Retry-After"], "1")
+        self.assertIn("news_portal_api_throttled_total 1", metrics.render())
+
+        self.now.return_value = 1001.0
+        response = self.client_api.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["X-RateLimit-Remaining"], "0")
+
+    def test_limits_are_per_user_and_role(self):
+        """Each user has an own bucket, refilled at the rate of their role."""
+        self.client_api.force_authenticate(self.reader)
+        for _ in range(4):
+            self.client_api.get(self.url)
+        self.client_api.force_authenticate(self.editor)
+        for _ in range(3):
+            self.assertEqual(self.client_api.get(self.url).status_code, 200)
+
+        self.now.return_value = 1000.5
+        self.assertEqual(self.client_api.get(self.url).status_code, 200)
+        self.client_api.force_authenticate(self.reader)
+        response = self.client_api.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    @override_settings(API_THROTTLE_IP_BURST=3)
+    def test_ip_bucket_is_shared_by_accounts(self):
+        """Accounts behind one address share the per-IP bucket."""
+        self.client_api.force_authenticate(self.reader)
+        for _ in range(3):
+            self.client_api.get(self.url)
+        self.client_api.force_authenticate(self.editor)
+        response = self.client_api.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(throttling.parse_rate("60/min"), 1.0)
+
+    @override_settings(API_THROTTLE_IP_BURST=3)
+    def test_concurrent_requests_never_share_a_token(self):
+        """Simultaneous requests of one client spend distinct tokens."""
+
+        def attempt(_):
+            request = RequestFactory().get(self.url)
+            return throttling.IPRateThrottle().allow_request(request, None)
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(attempt, range(16)))
+        self.assertEqual(results.count(True), 3)
+
+    def test_request_is_throttled_while_bucket_is_locked(self):
+        """A request that cannot lock its bucket in time is refused."""
+        request = RequestFactory().get(self.url)
+        cache.add("throttle:ip:127.0.0.1:lock", 1)
+        with patch("articles.throttling.LOCK_WAIT", 0):
+            self.assertFalse(throttling.IPRateThrottle().allow_request(request, None))
+        self.assertEqual(request._rate_limits[0].remaining, 0)
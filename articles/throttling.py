@@ -0,0 +1,206 @@
+"""
+articles.throttling
+
+Token-bucket throttling for the subscriber content APIs.
+
+Every client has two buckets in the default cache: one per user, filled at
+the rate configured for the user's role in ``API_THROTTLE_RATES``, and one
+per client IP (``API_THROTTLE_RATES["ip"]``), shared by every account
+behind that address. A user's bucket holds up to ``API_THROTTLE_BURST``
+tokens and an address's up to ``API_THROTTLE_IP_BURST``.
+Each request spends one token, and tokens come back continuously at the
+configured rate. Clients that poll at a reasonable pace never run dry, and
+short bursts such as opening the app are absorbed. A client looping on the
+feed query is held to the steady rate.
+
+A bucket is stored as ``(tokens, last_update)`` and expires once it would
+be full again, so idle clients cost nothing. The cache has no
+compare-and-set, so each bucket is read and written under a short lock
+taken with ``cache.add`` (atomic on every shared backend); concurrent
+requests of one client never spend the same token. A request that cannot
+take the lock within ``LOCK_WAIT`` seconds is throttled: only a client
+sending many requests at once contends for its own bucket.
+
+Responses carry ``X-RateLimit-Limit`` (bucket size),
+``X-RateLimit-Remaining`` (whole tokens left) and ``X-RateLimit-Reset``
+(seconds until the bucket is full) for the tighter of the two buckets.
+Throttled requests get ``429 Too Many Requests`` with ``Retry-After``.
+"""
+
+import math
+import time
+from typing import NamedTuple
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.throttling import BaseThrottle
+
+from . import metrics
+
+DEFAULT_RATES = {
+    "reader": "60/min",
+    "journalist": "120/min",
+    "editor": "240/min",
+    "ip": "300/min",
+}
+
+PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+# A bucket lock outlives a crashed holder by at most LOCK_TIMEOUT seconds;
+# waiters give up after LOCK_WAIT seconds, polling every LOCK_POLL.
+LOCK_TIMEOUT = 1
+LOCK_WAIT = 0.1
+LOCK_POLL = 0.002
+
+
+class Bucket(NamedTuple):
+    """State of one token bucket after a request."""
+
+    capacity: int
+    tokens: float
+    refill: float  # tokens per second
+
+    @property
+    def remaining(self):
+        """Return the whole tokens left."""
+        return int(self.tokens)
+
+    @property
+    def reset(self):
+        """Return the seconds until the bucket is full again."""
+        return math.ceil((self.capacity - self.tokens) / self.refill)
+
+
+def _now():
+    """Return the wall-clock time shared by all workers."""
+    return time.time()
+
+
+def parse_rate(rate):
+    """
+    Parse a rate such as ``"60/min"``.
+
+    Args:
+        rate (str): ``<requests>/<period>``; the period is read from its
+            first letter (``s``, ``m``, ``h`` or ``d``).
+
+    Returns:
+        float: Tokens added per second.
+    """
+    num, period = rate.split("/")
+    return int(num) / PERIODS[period.strip()[0].lower()]
+
+
+def _acquire(lock):
+    """Take the cache lock ``lock``, waiting up to ``LOCK_WAIT`` seconds."""
+    deadline = time.monotonic() + LOCK_WAIT
+    while not cache.add(lock, 1, timeout=LOCK_TIMEOUT):
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(LOCK_POLL)
+    return True
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Token-bucket throttle keyed by client address at the ``scope`` rate.
+
+    Subclasses set ``scope`` and may override ``get_rate`` and
+    ``get_ident_key`` to choose the rate and the bucket per request. The
+    bucket state of every throttle that ran is appended to
+    ``request._rate_limits`` for ``RateLimitHeadersMixin``.
+    """
+
+    scope = None
+    burst_setting = "API_THROTTLE_BURST"
+    default_burst = 20
+
+    def get_rate(self, request):
+        """Return the rate string for ``request``, or None for no limit."""
+        return getattr(settings, "API_THROTTLE_RATES", DEFAULT_RATES).get(self.scope)
+
+    def get_ident_key(self, request):
+        """Return the identity part of the cache key (the client address)."""
+        return self.get_ident(request)
+
+    def allow_request(self, request, view):
+        """Spend one token, or refuse the request if the bucket is empty."""
+        rate = self.get_rate(request)
+        if not rate:
+            return True
+        refill = parse_rate(rate)
+        capacity = max(1, getattr(settings, self.burst_setting, self.default_burst))
+        key = f"throttle:{self.scope}:{self.get_ident_key(request)}"
+
+        if _acquire(f"{key}:lock"):
+            try:
+                now = _now()
+                tokens, updated = cache.get(key, (capacity, now))
+                tokens = min(capacity, tokens + max(0.0, now - updated) * refill)
+                allowed = tokens >= 1
+                if allowed:
+                    tokens -= 1
+                cache.set(key, (tokens, now), timeout=math.ceil(capacity / refill) + 1)
+            finally:
+                cache.delete(f"{key}:lock")
+        else:
+            tokens, allowed = 0.0, False
+        if not allowed:
+            metrics.inc("news_portal_api_throttled_total")
+
+        self.bucket = Bucket(capacity, tokens, refill)
+        if not hasattr(request, "_rate_limits"):
+            request._rate_limits = []
+        request._rate_limits.append(self.bucket)
+        return allowed
+
+    def wait(self):
+        """Return the seconds until the next token is available."""
+        return (1 - self.bucket.tokens) / self.bucket.refill
+
+
+class RoleRateThrottle(TokenBucketThrottle):
+    """Per-user bucket filled at the rate of the user's role."""
+
+    scope = "user"
+
+    def get_rate(self, request):
+        """Return the rate configured for the user's role."""
+        rates = getattr(settings, "API_THROTTLE_RATES", DEFAULT_RATES)
+        role = getattr(request.user, "role", None)
+        return rates.get(role) or rates.get("reader")
+
+    def get_ident_key(self, request):
+        """Key authenticated users by id and anonymous ones by address."""
+        if request.user and request.user.is_authenticated:
+            return request.user.pk
+        return f"anon:{self.get_ident(request)}"
+
+
+class IPRateThrottle(TokenBucketThrottle):
+    """Per-client-IP bucket shared by every account behind the address."""
+
+    scope = "ip"
+    burst_setting = "API_THROTTLE_IP_BURST"
+    default_burst = 100
+
+
+class RateLimitHeadersMixin:
+    """
+    Throttle an API view with token buckets and add rate-limit headers.
+
+    The headers describe the bucket with the fewest tokens left.
+    """
+
+    throttle_classes = [RoleRateThrottle, IPRateThrottle]
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        """Add ``X-RateLimit-*`` headers from the buckets checked."""
+        response = super().finalize_response(request, response, *args, **kwargs)
+        buckets = getattr(request, "_rate_limits", None)
+        if buckets:
+            bucket = min(buckets, key=lambda b: b.tokens)
+            response["X-RateLimit-Limit"] = str(bucket.capacity)
+            response["X-RateLimit-Remaining"] = str(bucket.remaining)
+            response["X-RateLimit-Reset"] = str(bucket.reset)
+        return response
@@ -8,12 +8,17 @@ Defines routes for:
 - Journalist views
 - Editor views
 - Publisher creation
-- API endpoints for subscriber articles and newsletters
+- API endpoints for subscriber articles and newsletters, bulk moderation,
+  bulk subscription changes, the publisher/journalist directory,
+  most-read articles per publisher and reader read state
+- RSS/Atom feeds per publisher and per journalist
+- Staff-only streaming exports and page cache statistics
+- Prometheus metrics endpoint (token or staff protected)
 """
 
 from django.urls import path
 
-from . import api_views, views
+from . import api_views, feeds, views
 
 app_name = "articles"
 
@@ -26,8 +31,14 @@ urlpatterns = [
 
     # ---------------- Editor ----------------
     path("editor/", views.editor_article_list, name="editor_list"),
+    path("editor/bulk/", views.editor_article_bulk, name="editor_bulk"),
     path("editor/<int:pk>/edit/", views.editor_article_edit, name="editor_edit"),
     path("editor/<int:pk>/delete/", views.editor_article_delete, name="editor_delete"),
+    path(
+        "editor/<int:pk>/history/",
+        views.editor_article_history,
+        name="editor_history",
+    ),
 
     # ---------------- Journalist ----------------
     path(
@@ -50,6 +61,29 @@ urlpatterns = [
     # ---------------- Publisher ----------------
     path("publisher/create/", views.create_publisher, name="create_publisher"),
 
+    # ---------------- Feeds ----------------
+    path("feeds/publisher/<int:pk>/rss/", feeds.publisher_feed, name="publisher_feed"),
+    path(
+        "feeds/publisher/<int:pk>/atom/",
+        feeds.publisher_atom_feed,
+        name="publisher_atom_feed",
+    ),
+    path(
+        "feeds/journalist/<int:pk>/rss/",
+        feeds.journalist_feed,
+        name="journalist_feed",
+    ),
+    path(
+        "feeds/journalist/<int:pk>/atom/",
+        feeds.journalist_atom_feed,
+        name="journalist_atom_feed",
+    ),
+
+    # ---------------- Staff ----------------
+    path("export/<str:kind>/", views.export_content, name="export"),
+    path("page-cache/stats/", views.page_cache_stats, name="page_cache_stats"),
+    path("metrics/", views.prometheus_metrics, name="metrics"),
+
     # ---------------- API Endpoints ----------------
     path(
         "api/articles/",
@@ -61,4 +95,21 @@ urlpatterns = [
         api_views.SubscriberNewslettersAPI.as_view(),
         name="api_newsletters",
     ),
+    path(
+        "api/moderation/bulk/",
+        api_views.BulkModerationAPI.as_view(),
+        name="api_bulk_moderation",
+    ),
+    path(
+        "api/subscriptions/",
+        api_views.BulkSubscriptionAPI.as_view(),
+        name="api_subscriptions",
+    ),
+    path("api/directory/", api_views.DirectoryAPI.as_view(), name="api_directory"),
+    path(
+        "api/publishers/<int:pk>/most-read/",
+        api_views.MostReadAPI.as_view(),
+        name="api_most_read",
+    ),
+    path("api/read-state/", api_views.ReadStateAPI.as_view(), name="api_read_state"),
 ]
@@ -0,0 +1,275 @@
+"""
+articles.view_counts
+
+Buffered article view counting and per-publisher most-read lists.
+
+Detail page hits are accumulated in memory by each worker process and
+written every ``VIEW_COUNT_FLUSH_INTERVAL`` seconds (or after
+``VIEW_COUNT_FLUSH_HITS`` hits) as one batched upsert into
+``ArticleViewCount``: a ``bulk_create`` that makes sure every counted row
+exists, then a single ``UPDATE`` adding each article's buffered hits. Popular
+articles therefore cost one row update per flush instead of one per view,
+and ``Article`` rows are never locked by counting. A daemon thread flushes
+the buffer of a worker that stops receiving views, so counts never wait for
+the next hit. Hits of articles deleted or archived in the meantime are
+dropped. If a flush fails, the hits are put back in the buffer and the error
+is logged; the viewing request is never affected. Hits still buffered when
+a worker dies are lost; the remaining buffer is flushed at interpreter exit.
+
+The most-read articles of each publisher are kept as a precomputed top-N
+list in the default cache. A flush reads back the new totals of the flushed
+articles and merges them into the cached lists; a missing list is rebuilt
+from the ``(publisher, views)`` index.
+
+Pre-rendered static pages served by the web server are not counted.
+"""
+
+import atexit
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import Case, F, Value, When
+from django.utils import timezone
+
+from .models import Article, ArticleViewCount
+
+logger = logging.getLogger(__name__)
+
+MOST_READ_SIZE = 10
+
+
+# ---------------- Buffer ----------------
+
+
+class ViewBuffer:
+    """Thread-safe in-process buffer of detail page hits."""
+
+    def __init__(self):
+        """Create an empty buffer."""
+        self._lock = threading.Lock()
+        self._hits = {}
+        self._total = 0
+        self._started = time.monotonic()
+
+    def add(self, article_id, publisher_id):
+        """
+        Count one view.
+
+        Returns:
+            bool: True if the buffer is due to be flushed.
+        """
+        with self._lock:
+            entry = self._hits.setdefault(article_id, [publisher_id, 0])
+            entry[0] = publisher_id
+            entry[1] += 1
+            self._total += 1
+            interval = getattr(settings, "VIEW_COUNT_FLUSH_INTERVAL", 10)
+            return (
+                self._total >= getattr(settings, "VIEW_COUNT_FLUSH_HITS", 500)
+                or time.monotonic() - self._started >= interval
+            )
+
+    def drain(self):
+        """
+        Empty the buffer.
+
+        Returns:
+            dict: Maps article id to ``[publisher_id, hits]``.
+        """
+        with self._lock:
+            hits, self._hits = self._hits, {}
+            self._total = 0
+            self._started = time.monotonic()
+        return hits
+
+    def restore(self, hits):
+        """Put back hits returned by ``drain`` that could not be written."""
+        with self._lock:
+            for article_id, (publisher_id, n) in hits.items():
+                entry = self._hits.setdefault(article_id, [publisher_id, 0])
+                entry[1] += n
+                self._total += n
+
+
+class Flusher:
+    """Daemon thread that flushes the buffer every flush interval."""
+
+    def __init__(self):
+        """Create a flusher that is not running yet."""
+        self._lock = threading.Lock()
+        self._pid = None
+
+    def start(self):
+        """Start the thread, once per process (again in a forked worker)."""
+        pid = os.getpid()
+        with self._lock:
+            if self._pid == pid:
+                return
+            self._pid = pid
+        threading.Thread(
+            target=self._run, name="view-count-flusher", daemon=True
+        ).start()
+
+    def _run(self):
+        """Flush periodically, closing this thread's connection in between."""
+        while True:
+            time.sleep(getattr(settings, "VIEW_COUNT_FLUSH_INTERVAL", 10))
+            safe_flush()
+            connections.close_all()
+
+
+buffer = ViewBuffer()
+flusher = Flusher()
+
+
+def record_view(article):
+    """
+    Count a view of ``article``, flushing the buffer when it is due.
+
+    Args:
+        article (Article): Viewed article.
+    """
+    flusher.start()
+    if buffer.add(article.pk, article.publisher_id):
+        safe_flush()
+
+
+# ---------------- Flushing ----------------
+
+
+def flush():
+    """
+    Write the buffered hits to ``ArticleViewCount``.
+
+    Queries use the primary explicitly so counting a reader's view does not
+    go through the router and pin that reader to the primary. Hits of
+    articles that no longer exist are dropped. If writing fails, the hits
+    go back into the buffer before the error is raised.
+
+    Returns:
+        int: Number of views written.
+    """
+    hits = buffer.drain()
+    if not hits:
+        return 0
+    try:
+        with transaction.atomic(using=DEFAULT_DB_ALIAS):
+            hits = _write(hits)
+    except Exception:
+        buffer.restore(hits)
+        raise
+    counts = ArticleViewCount.objects.using(DEFAULT_DB_ALIAS)
+    _merge_top_lists(
+        counts.filter(article_id__in=hits, article__is_approved=True).values_list(
+            "publisher_id", "article_id", "article__title", "views"
+        )
+    )
+    return sum(n for _, n in hits.values())
+
+
+def _write(hits):
+    """Add ``hits`` to the view counts; return the hits actually written."""
+    live = set(
+        Article.objects.using(DEFAULT_DB_ALIAS)
+        .filter(pk__in=hits)
+        .values_list("pk", flat=True)
+    )
+    hits = {pk: entry for pk, entry in hits.items() if pk in live}
+    if not hits:
+        return hits
+    counts = ArticleViewCount.objects.using(DEFAULT_DB_ALIAS)
+    features = connections[DEFAULT_DB_ALIAS].features
+    counts.bulk_create(
+        [
+            ArticleViewCount(article_id=article_id, publisher_id=publisher_id)
+            for article_id, (publisher_id, _) in hits.items()
+        ],
+        update_conflicts=True,
+        unique_fields=(
+            ["article"] if features.supports_update_conflicts_with_target else None
+        ),
+        update_fields=["publisher"],
+    )
+    counts.filter(article_id__in=hits).update(
+        views=F("views")
+        + Case(
+            *[When(article_id=pk, then=Value(n)) for pk, (_, n) in hits.items()],
+            default=Value(0),
+        ),
+        updated_at=timezone.now(),
+    )
+    return hits
+
+
+def safe_flush():
+    """Flush the buffer, logging instead of raising on failure."""
+    try:
+        return flush()
+    except Exception:
+        logger.exception("Could not flush buffered article views.")
+        return 0
+
+
+atexit.register(safe_flush)
+
+
+# ---------------- Most read ----------------
+
+
+def _top_key(publisher_id):
+    """Return the cache key of a publisher's most-read list."""
+    return f"views:top:{publisher_id}"
+
+
+def _merge_top_lists(rows):
+    """Merge fresh totals into the cached most-read lists they belong to."""
+    updates = {}
+    for publisher_id, article_id, title, views in rows:
+        updates.setdefault(publisher_id, {})[article_id] = (article_id, title, views)
+    cached = cache.get_many([_top_key(pk) for pk in updates])
+    merged = {}
+    for publisher_id, fresh in updates.items():
+        key = _top_key(publisher_id)
+        if key not in cached:
+            continue  # Rebuilt from the index on the next read.
+        entries = {entry[0]: entry for entry in cached[key]}
+        entries.update(fresh)
+        merged[key] = sorted(entries.values(), key=lambda e: (-e[2], -e[0]))[
+            :MOST_READ_SIZE
+        ]
+    if merged:
+        cache.set_many(merged, timeout=None)
+
+
+def invalidate_top(publisher_id):
+    """Drop a publisher's cached most-read list (e.g. after an unapproval)."""
+    cache.delete(_top_key(publisher_id))
+
+
+def most_read(publisher_id):
+    """
+    Return the most-read approved articles of a publisher.
+
+    Args:
+        publisher_id (int): Publisher id.
+
+    Returns:
+        list[tuple]: ``(article_id, title, views)``, most viewed first.
+    """
+    key = _top_key(publisher_id)
+    top = cache.get(key)
+    if top is None:
+        top = list(
+            ArticleViewCount.objects.filter(
+                publisher_id=publisher_id, article__is_approved=True
+            )
+            .order_by("-views", "-article_id")
+            .values_list("article_id", "article__title", "views")[:MOST_READ_SIZE]
+        )
+        cache.set(key, top, timeout=None)
+    return top
@@ -5,36 +5,61 @@ Views module for the Articles app.
 
 Includes:
 - Home view for all users
-- Editor views (approve/edit/delete articles)
+- Editor views (approve/edit/delete articles, revision history)
 - Reader views (list/detail)
 - Journalist views (create/edit/delete articles)
 - Publisher creation view
+- Staff-only streaming export
+- Page cache statistics and the Prometheus metrics endpoint
 """
 
+from django.conf import settings
+from django.contrib import messages
 from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
 from django.core.exceptions import PermissionDenied
-from django.db.models import Q
+from django.db import transaction
+from django.http import (
+    HttpResponse,
+    HttpResponseBadRequest,
+    JsonResponse,
+    StreamingHttpResponse,
+)
 from django.shortcuts import get_object_or_404, redirect, render
+from django.utils.crypto import constant_time_compare
 
+from news_portal.db_router import replica_reads
 from newsletters.models import Newsletter
-from subscriptions.models import Subscription
+from subscriptions import read_state
+from subscriptions.snapshot import get_snapshot
 
+from . import archive, metrics, page_cache, revisions, view_counts
+from .directory import DIRECTORY_PAGE_SIZE
+from .exports import EXPORTS, FORMATS, parse_bound, stream_export
 from .forms import ArticleForm, PublisherForm
-from .models import Article, Journalist, Publisher
+from .models import Article, ArticleRevision, Journalist, Publisher
+from .moderation import (
+    BULK_ACTIONS,
+    bulk_set_approval,
+    moderation_queue,
+    queue_params,
+)
 
 User = get_user_model()
 
 
 # ---------------------------- Home View ----------------------------
 
+@replica_reads
 def home(request):
     """
     Display the home page with content based on user role.
 
     Editors: All unapproved articles/newsletters.
     Journalists: Their own unapproved articles/newsletters.
-    Readers: Approved content from subscribed publishers/journalists.
+    Readers: Approved content from subscribed publishers/journalists with
+    unread items flagged, unread counts per subscription, plus the most
+    followed publishers and journalists.
 
     Args:
         request (HttpRequest): HTTP request object.
@@ -53,12 +78,17 @@ def home(request):
                 "journalists": [],
                 "subscribed_publishers": [],
                 "subscribed_journalists": [],
+                "unread_articles": set(),
+                "unread_newsletters": set(),
+                "unread_sources": [],
             },
         )
 
     user = request.user
     articles = newsletters = publishers = journalists = []
     subscribed_publishers = subscribed_journalists = []
+    unread_articles = unread_newsletters = set()
+    unread_sources = []
 
     if user.role == "editor":
         articles = Article.objects.filter(is_approved=False).order_by("-created_at")
@@ -67,36 +97,46 @@ def home(request):
         articles = Article.objects.filter(author=user, is_approved=False).order_by("-created_at")
         newsletters = Newsletter.objects.filter(author=user, is_approved=False).order_by("-created_at")
     elif user.role == "reader":
-        subscribed_publishers = Subscription.objects.filter(
-            user=user, publisher__isnull=False
-        ).values_list("publisher_id", flat=True)
-        subscribed_journalists = Subscription.objects.filter(
-            user=user, journalist__isnull=False
-        ).values_list("journalist_id", flat=True)
+        # One query; the template's membership checks reuse the same sets.
+        snapshot = get_snapshot(user)
+        subscribed_publishers = snapshot.publisher_ids
+        subscribed_journalists = snapshot.journalist_user_ids
 
         articles = (
-            Article.objects.filter(
-                Q(publisher__id__in=subscribed_publishers) |
-                Q(author__id__in=subscribed_journalists),
-                is_approved=True,
-            )
-            .distinct()
+            Article.objects.filter(snapshot.content_filter(), is_approved=True)
+            .select_related("publisher", "author")
             .order_by("-created_at")
         )
         newsletters = (
-            Newsletter.objects.filter(
-                Q(publisher__id__in=subscribed_publishers) |
-                Q(author__id__in=subscribed_journalists),
-                is_approved=True,
-            )
-            .distinct()
+            Newsletter.objects.filter(snapshot.content_filter(), is_approved=True)
+            .select_related("publisher", "author")
             .order_by("-created_at")
         )
-        publishers = Publisher.objects.all()
-        journalists = Journalist.objects.all()
+        # Only the most followed sources; the rest are searchable through
+        # the directory API.
+        publishers = Publisher.objects.order_by("-subscriber_count", "-id")[
+            :DIRECTORY_PAGE_SIZE
+        ]
+        journalists = Journalist.objects.select_related("user").order_by(
+            "-subscriber_count", "-id"
+        )[:DIRECTORY_PAGE_SIZE]
     else:
         raise PermissionDenied()
 
+    # List rows only need the precomputed excerpt, never the full body.
+    articles = articles.defer("legacy_content")
+    newsletters = newsletters.defer("legacy_content")
+
+    if user.role == "reader":
+        # Evaluates the lists once; the template iterates the cached rows.
+        unread_articles = read_state.unread_ids(user, articles)
+        unread_newsletters = read_state.unread_ids(user, newsletters)
+        unread_sources = [
+            source
+            for source in read_state.unread_counts(user)
+            if source["articles"] or source["newsletters"]
+        ]
+
     return render(
         request,
         "articles/home.html",
@@ -107,6 +147,9 @@ def home(request):
             "journalists": journalists,
             "subscribed_publishers": subscribed_publishers,
             "subscribed_journalists": subscribed_journalists,
+            "unread_articles": unread_articles,
+            "unread_newsletters": unread_newsletters,
+            "unread_sources": unread_sources,
         },
     )
 
@@ -146,7 +189,10 @@ def create_publisher(request):
 
 def editor_article_list(request):
     """
-    Display all articles for editors to review.
+    Display the article moderation queue for editors.
+
+    Supports ``?status=all|approved|unapproved``, ``?publisher=<id>`` and
+    keyset pagination through ``?cursor=<token>``.
 
     Args:
         request (HttpRequest): HTTP request object.
@@ -157,8 +203,20 @@ def editor_article_list(request):
     if not request.user.is_authenticated or request.user.role != "editor":
         raise PermissionDenied()
 
-    articles = Article.objects.all().order_by("-created_at")
-    return render(request, "articles/editor_article_list.html", {"articles": articles})
+    params = queue_params(request.GET)
+    queue = moderation_queue(Article, **params)
+    return render(
+        request,
+        "articles/editor_article_list.html",
+        {
+            "articles": queue["items"],
+            "next_cursor": queue["next_cursor"],
+            "counts": queue["counts"],
+            "filter_status": params["status"],
+            "filter_publisher": params["publisher"],
+            "publishers": Publisher.objects.only("id", "name").order_by("name"),
+        },
+    )
 
 
 @login_required
@@ -182,10 +240,39 @@ def editor_article_delete(request, pk):
     return render(request, "articles/article_confirm_delete.html", {"article": article})
 
 
+@login_required
+def editor_article_bulk(request):
+    """
+    Approve or reject the articles selected on the editor list.
+
+    Expects a POST with one or more ``ids`` and ``action`` set to
+    ``approve`` or ``reject``.
+
+    Args:
+        request (HttpRequest): HTTP request object.
+
+    Returns:
+        HttpResponse: Redirect back to the editor list.
+    """
+    if request.user.role != "editor":
+        raise PermissionDenied()
+    if request.method == "POST":
+        action = request.POST.get("action")
+        ids = [pk for pk in request.POST.getlist("ids") if pk.isdigit()]
+        if action in BULK_ACTIONS and ids:
+            changed = bulk_set_approval(Article, ids, approve=action == "approve")
+            messages.success(
+                request, f"{changed} article(s) {BULK_ACTIONS[action]}."
+            )
+    return redirect("articles:editor_list")
+
+
 def editor_article_edit(request, pk):
     """
     Allow editor to edit and approve an article.
 
+    Each saved change is recorded in the article's revision history.
+
     Args:
         request (HttpRequest): HTTP request object.
         pk (int): Article primary key.
@@ -198,24 +285,86 @@ def editor_article_edit(request, pk):
 
     article = get_object_or_404(Article, pk=pk)
     if request.method == "POST":
+        previous = revisions.capture(article)
         form = ArticleForm(request.POST, instance=article)
         if form.is_valid():
             article = form.save(commit=False)
             if "approve" in request.POST or request.POST.get("is_approved"):
                 article.is_approved = True
-            article.save()
+            with transaction.atomic():
+                article.save()
+                revisions.record(article, previous, request.user)
             return redirect("articles:editor_list")
     else:
         form = ArticleForm(instance=article)
     return render(request, "articles/editor_article_edit.html", {"form": form, "article": article})
 
 
+def editor_article_history(request, pk):
+    """
+    List an article's revisions and show the diff between two of them.
+
+    ``?a=<number>&b=<number>`` pick the revisions to compare; by default
+    the newest revision is compared with the one before it. Archived
+    articles keep their history and can still be looked up here.
+
+    Args:
+        request (HttpRequest): HTTP request object.
+        pk (int): Article primary key.
+
+    Returns:
+        HttpResponse: Rendered revision history page.
+    """
+    if not request.user.is_authenticated or request.user.role != "editor":
+        raise PermissionDenied()
+
+    article = archive.get_object_or_404(Article, defer_body=True, pk=pk)
+    history = list(
+        ArticleRevision.objects.filter(article_id=article.pk)
+        .select_related("edited_by")
+        .defer("data")
+        .order_by("-number")
+    )
+    by_number = {revision.number: revision for revision in history}
+    numbers = []
+    for name, default in (("a", 1), ("b", 0)):
+        value = request.GET.get(name, "")
+        if value.isdigit() and int(value) in by_number:
+            numbers.append(int(value))
+        elif len(history) > default:
+            numbers.append(history[default].number)
+    older = newer = None
+    diff = []
+    if len(numbers) == 2:
+        older, newer = (
+            ArticleRevision.objects.get(article_id=article.pk, number=number)
+            for number in sorted(numbers)
+        )
+        diff = revisions.diff_lines(
+            revisions.get_text(older), revisions.get_text(newer)
+        )
+    return render(
+        request,
+        "articles/editor_article_history.html",
+        {
+            "article": article,
+            "archived": archive.is_archived(article),
+            "history": history,
+            "older": older,
+            "newer": newer,
+            "diff": diff,
+        },
+    )
+
+
 # ---------------------------- Reader Views ----------------------------
 
+@replica_reads
 @login_required
 def reader_article_list(request):
     """
-    Display approved articles for a reader based on subscriptions.
+    Display approved articles for a reader based on subscriptions, flagging
+    unread ones.
 
     Args:
         request (HttpRequest): HTTP request object.
@@ -226,28 +375,28 @@ def reader_article_list(request):
     if request.user.role != "reader":
         raise PermissionDenied()
 
-    subscriptions_pub = Subscription.objects.filter(
-        user=request.user, publisher__isnull=False
-    ).values_list("publisher_id", flat=True)
-    subscriptions_jour = Subscription.objects.filter(
-        user=request.user, journalist__isnull=False
-    ).values_list("journalist_id", flat=True)
     articles = (
         Article.objects.filter(
-            Q(publisher__id__in=subscriptions_pub) |
-            Q(author__id__in=subscriptions_jour),
-            is_approved=True,
+            get_snapshot(request.user).content_filter(), is_approved=True
         )
-        .distinct()
+        .defer("legacy_content")
         .order_by("-created_at")
     )
-    return render(request, "articles/reader_article_list.html", {"articles": articles})
+    return render(
+        request,
+        "articles/reader_article_list.html",
+        {
+            "articles": articles,
+            "unread_articles": read_state.unread_ids(request.user, articles),
+        },
+    )
 
 
 @login_required
 def reader_article_detail(request, pk):
     """
-    Display a single approved article for a reader.
+    Display a single approved article for a reader, count the view and mark
+    the article read. Archived articles are shown but not counted.
 
     Args:
         request (HttpRequest): HTTP request object.
@@ -256,15 +405,21 @@ def reader_article_detail(request, pk):
     Returns:
         HttpResponse: Rendered article detail page.
     """
-    article = get_object_or_404(Article, pk=pk, is_approved=True)
+    article = archive.get_object_or_404(
+        Article, defer_body=True, pk=pk, is_approved=True
+    )
     if request.user.role != "reader":
         raise PermissionDenied()
-    return render(request, "articles/article_detail.html", {"article": article})
+    if not archive.is_archived(article):
+        view_counts.record_view(article)
+        read_state.record_read(request.user, article)
+    return _render_article_detail(request, article)
 
 
 def article_detail(request, pk):
     """
-    Display a single article regardless of approval status.
+    Display a single article regardless of approval status, falling back to
+    the archive.
 
     Args:
         request (HttpRequest): HTTP request object.
@@ -273,8 +428,72 @@ def article_detail(request, pk):
     Returns:
         HttpResponse: Rendered article detail page.
     """
-    article = get_object_or_404(Article, pk=pk)
-    return render(request, "articles/article_detail.html", {"article": article})
+    article = archive.get_object_or_404(Article, defer_body=True, pk=pk)
+    return _render_article_detail(request, article)
+
+
+def _render_article_detail(request, article):
+    """
+    Render the detail page around the cached, role-independent body.
+
+    Args:
+        request (HttpRequest): HTTP request object.
+        article (Article or ArchivedArticle): Article to display (the body
+            may be deferred).
+
+    Returns:
+        HttpResponse: Rendered article detail page.
+    """
+    body_html = page_cache.render_body(
+        article, "articles/_article_body.html", "article"
+    )
+    return render(
+        request,
+        "articles/article_detail.html",
+        {"article": article, "body_html": body_html},
+    )
+
+
+@login_required
+def page_cache_stats(request):
+    """
+    Return detail page cache hit/miss counters to staff users.
+
+    Args:
+        request (HttpRequest): HTTP request object.
+
+    Returns:
+        JsonResponse: ``hits``, ``misses`` and ``hit_ratio``.
+    """
+    if not request.user.is_staff:
+        raise PermissionDenied()
+    return JsonResponse(page_cache.stats())
+
+
+def prometheus_metrics(request):
+    """
+    Expose notification and cache metrics in Prometheus text format.
+
+    Scrapers authenticate with ``Authorization: Bearer <METRICS_TOKEN>``;
+    logged-in staff users may also view the page.
+
+    Args:
+        request (HttpRequest): HTTP request object.
+
+    Returns:
+        HttpResponse: Metrics in the text exposition format.
+
+    Raises:
+        PermissionDenied: If neither a valid token nor a staff session is given.
+    """
+    token = getattr(settings, "METRICS_TOKEN", "")
+    header = request.headers.get("Authorization", "")
+    authorized = bool(token) and constant_time_compare(header, f"Bearer {token}")
+    if not (authorized or request.user.is_staff):
+        raise PermissionDenied()
+    return HttpResponse(
+        metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
 
 
 # ---------------------------- Journalist Views ----------------------------
@@ -317,7 +536,11 @@ def journalist_article_list(request):
     if not request.user.is_authenticated or request.user.role != "journalist":
         raise PermissionDenied()
 
-    articles = Article.objects.filter(author=request.user).order_by("-created_at")
+    articles = (
+        Article.objects.filter(author=request.user)
+        .defer("legacy_content")
+        .order_by("-created_at")
+    )
     return render(request, "articles/journalist_article_list.html", {"articles": articles})
 
 
@@ -325,6 +548,8 @@ def journalist_article_edit(request, pk):
     """
     Allow a journalist to edit one of their own articles.
 
+    Each saved change is recorded in the article's revision history.
+
     Args:
         request (HttpRequest): HTTP request object.
         pk (int): Article primary key.
@@ -334,9 +559,12 @@ def journalist_article_edit(request, pk):
     """
     article = get_object_or_404(Article, pk=pk, author=request.user)
     if request.method == "POST":
+        previous = revisions.capture(article)
         form = ArticleForm(request.POST, instance=article)
         if form.is_valid():
-            form.save()
+            with transaction.atomic():
+                form.save()
+                revisions.record(article, previous, request.user)
             return redirect("articles:journalist_list")
     else:
         form = ArticleForm(instance=article)
@@ -359,3 +587,61 @@ def journalist_article_delete(request, pk):
         article.delete()
         return redirect("articles:journalist_list")
     return render(request, "articles/article_confirm_delete.html", {"article": article})
+
+
+# ---------------------------- Export ----------------------------
+
+@login_required
+def export_content(request, kind):
+    """
+    Stream an export of articles, newsletters or subscriptions to staff users.
+
+    Query parameters:
+        format: ``ndjson`` (default) or ``csv``.
+        gzip: ``1`` to gzip the response on the fly.
+        publisher: Publisher id to filter by.
+        since / until: ISO dates or datetimes bounding ``created_at``.
+
+    Args:
+        request (HttpRequest): HTTP request object.
+        kind (str): ``articles``, ``newsletters`` or ``subscriptions``.
+
+    Returns:
+        StreamingHttpResponse: The export as an attachment.
+    """
+    if not request.user.is_staff:
+        raise PermissionDenied()
+    if kind not in EXPORTS:
+        return HttpResponseBadRequest("Unknown export.")
+
+    fmt = request.GET.get("format", "ndjson")
+    if fmt not in FORMATS:
+        return HttpResponseBadRequest("format must be ndjson or csv.")
+    compress = request.GET.get("gzip") in ("1", "true")
+    publisher = request.GET.get("publisher")
+    try:
+        publisher = int(publisher) if publisher else None
+        since = parse_bound(request.GET.get("since"))
+        until = parse_bound(request.GET.get("until"), end_of_day=True)
+    except ValueError as exc:
+        return HttpResponseBadRequest(str(exc))
+
+    filename = f"{kind}.{'csv' if fmt == 'csv' else 'ndjson'}"
+    content_type = "text/csv" if fmt == "csv" else "application/x-ndjson"
+    if compress:
+        filename += ".gz"
+        content_type = "application/gzip"
+
+    response = StreamingHttpResponse(
+        stream_export(
+            kind,
+            fmt=fmt,
+            compress=compress,
+            publisher=publisher,
+            since=since,
+            until=until,
+        ),
+        content_type=content_type,
+    )
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
@@ -0,0 +1,24 @@
+"""
+monitoring.apps
+
+Monitoring app configuration.
+
+This app stores operational diagnostics such as slow database queries.
+It defines the AppConfig class for Django to recognize this app
+and sets default behaviors such as the primary key field type.
+"""
+
+from django.apps import AppConfig
+
+
+class MonitoringConfig(AppConfig):
+    """
+    Configuration class for the Monitoring app.
+
+    Attributes:
+        default_auto_field (str): Default type for auto-created primary keys.
+        name (str): Name of the app used by Django.
+    """
+
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "monitoring"
@@ -0,0 +1,139 @@
+"""
+monitoring.management.commands.benchmark_startup
+
+Management command measuring the cold-start cost of ``django.setup()``.
+
+Each run starts a fresh interpreter, imports Django and calls
+``django.setup()`` with the current settings module, so the numbers include
+every app's imports and ``ready()`` hooks. One extra run with
+``-X importtime`` lists the slowest top-level imports. Results are stored
+as ``StartupBenchmark`` rows and compared with earlier runs.
+"""
+
+import os
+import platform
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from monitoring.models import StartupBenchmark
+
+SETUP_SCRIPT = (
+    "import time; t = time.perf_counter(); import django; django.setup(); "
+    "print((time.perf_counter() - t) * 1000)"
+)
+
+
+def parse_importtime(stderr, limit):
+    """
+    Return the slowest top-level imports from ``-X importtime`` output.
+
+    Args:
+        stderr (str): Interpreter stderr.
+        limit (int): Number of modules to return.
+
+    Returns:
+        list[list]: ``[module, cumulative_ms]`` pairs, slowest first.
+    """
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|", 2)
+        # Nested imports are indented below the module that triggered them.
+        if name.startswith(" ") and not name.startswith("  "):
+            modules.append([name.strip(), int(cumulative) / 1000])
+    modules.sort(key=lambda item: item[1], reverse=True)
+    return modules[:limit]
+
+
+class Command(BaseCommand):
+    """
+    Benchmark ``django.setup()`` in fresh processes and record the result.
+
+    Example::
+
+        python manage.py benchmark_startup --runs 10 --note "$(git describe)"
+    """
+
+    help = "Measure the cold-start time of django.setup() and track it over time."
+
+    def add_arguments(self, parser):
+        """Register command-line arguments."""
+        parser.add_argument(
+            "--runs",
+            type=int,
+            default=5,
+            help="Cold starts to measure (default: 5).",
+        )
+        parser.add_argument(
+            "--top",
+            type=int,
+            default=10,
+            help="Slowest top-level imports to report (default: 10).",
+        )
+        parser.add_argument("--note", default="", help="Label stored with the result.")
+        parser.add_argument(
+            "--no-save",
+            action="store_true",
+            help="Print the result without storing it.",
+        )
+
+    def handle(self, *args, **options):
+        """Run the benchmark, print it and store it."""
+        if options["runs"] < 1:
+            raise CommandError("--runs must be at least 1.")
+
+        timings = [self._run()[0] for _ in range(options["runs"])]
+        _, stderr = self._run("-X", "importtime")
+        top_imports = parse_importtime(stderr, options["top"])
+
+        result = StartupBenchmark(
+            runs=len(timings),
+            median_ms=statistics.median(timings),
+            min_ms=min(timings),
+            max_ms=max(timings),
+            top_imports=top_imports,
+            python_version=platform.python_version(),
+            note=options["note"][:100],
+        )
+
+        self.stdout.write(
+            f"django.setup(): median {result.median_ms:.1f} ms, "
+            f"min {result.min_ms:.1f} ms, max {result.max_ms:.1f} ms "
+            f"over {result.runs} run(s)."
+        )
+        self.stdout.write("Slowest top-level imports (cumulative):")
+        for module, cumulative_ms in top_imports:
+            self.stdout.write(f"  {cumulative_ms:8.1f} ms  {module}")
+
+        previous = StartupBenchmark.objects.order_by("-created_at")[:5]
+        if previous:
+            self.stdout.write("History (newest first):")
+            for run in previous:
+                delta = result.median_ms - run.median_ms
+                self.stdout.write(
+                    f"  {run.created_at:%Y-%m-%d %H:%M}  {run.median_ms:8.1f} ms "
+                    f"({delta:+.1f} ms now)  {run.note}"
+                )
+
+        if not options["no_save"]:
+            result.save()
+            self.stdout.write(self.style.SUCCESS("Result stored."))
+
+    def _run(self, *flags):
+        """Start one interpreter and return ``(setup_ms, stderr)``."""
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=settings.SETTINGS_MODULE)
+        completed = subprocess.run(
+            [sys.executable, *flags, "-c", SETUP_SCRIPT],
+            capture_output=True,
+            text=True,
+            cwd=settings.BASE_DIR,
+            env=env,
+        )
+        if completed.returncode:
+            raise CommandError(f"django.setup() failed:\n{completed.stderr}")
+        return float(completed.stdout.strip().splitlines()[-1]), completed.stderr
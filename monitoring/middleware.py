@@ -0,0 +1,83 @@
+"""
+monitoring.middleware
+
+Diagnostics middleware.
+
+``SlowQueryMiddleware`` attaches the slow-query recorder to every request.
+It is enabled with ``SLOW_QUERY_ENABLED``; otherwise Django drops it at
+startup. Queries run while a streaming response is consumed happen after
+the middleware returns and are not captured.
+
+``ProfilingMiddleware`` profiles requests on demand (``?prof`` for staff)
+or by sampling (``PROFILE_SAMPLE_RATE``).
+"""
+
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import HttpResponse
+from django.urls import reverse
+
+from . import profiling
+from .slow_queries import QueryRecorder, record
+
+
+class SlowQueryMiddleware:
+    """
+    Record queries slower than ``SLOW_QUERY_THRESHOLD_MS`` per request.
+
+    Captured queries are buffered in memory while the view runs and written
+    to the ``SlowQuery`` table once the response has been built, so the
+    bookkeeping queries are never timed themselves.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "SLOW_QUERY_ENABLED", False):
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder = QueryRecorder(
+            threshold_ms=getattr(settings, "SLOW_QUERY_THRESHOLD_MS", 200),
+            sample_rate=getattr(settings, "SLOW_QUERY_SAMPLE_RATE", 1.0),
+            size=getattr(settings, "SLOW_QUERY_BUFFER_SIZE", 100),
+        )
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+
+        if recorder.entries:
+            match = request.resolver_match
+            record(recorder.entries, match.view_name if match else request.path)
+        return response
+
+
+class ProfilingMiddleware:
+    """
+    Profile selected requests with cProfile and store the results.
+
+    Staff users get a plain-text report instead of the page when they add
+    ``?prof`` to a URL. Sampled requests are answered normally; their
+    profiles are only stored. Must come after ``AuthenticationMiddleware``.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not (profiling.requested(request) or profiling.sampled()):
+            return self.get_response(request)
+
+        response, profile = profiling.profile_request(self.get_response, request)
+        if not profile.requested:
+            return response
+        download_url = request.build_absolute_uri(
+            reverse("monitoring:profile_download", args=[profile.pk])
+        )
+        return HttpResponse(
+            profiling.report(profile, download_url),
+            content_type="text/plain; charset=utf-8",
+        )
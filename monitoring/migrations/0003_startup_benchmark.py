@@ -0,0 +1,39 @@
+# Generated by Django 5.2.5 on 2026-10-19 09:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("monitoring", "0002_request_profile"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StartupBenchmark",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("runs", models.PositiveSmallIntegerField()),
+                ("median_ms", models.FloatField()),
+                ("min_ms", models.FloatField()),
+                ("max_ms", models.FloatField()),
+                ("top_imports", models.JSONField(default=list)),
+                ("python_version", models.CharField(max_length=20)),
+                ("note", models.CharField(blank=True, max_length=100)),
+            ],
+            options={
+                "verbose_name": "Startup benchmark",
+                "verbose_name_plural": "Startup benchmarks",
+            },
+        ),
+    ]
@@ -0,0 +1,138 @@
+"""
+monitoring.models
+
+Models for the Monitoring app.
+
+Defines SlowQuery, which aggregates slow database queries by the
+fingerprint of their normalized SQL, RequestProfile, which stores the
+cProfile results of individual requests, and StartupBenchmark, which tracks
+the cold-start cost of ``django.setup()`` over time.
+"""
+
+from django.conf import settings
+from django.db import models
+
+
+class SlowQuery(models.Model):
+    """
+    Aggregated statistics for one normalized slow SQL statement.
+
+    Attributes:
+        fingerprint (CharField): Hash of the normalized SQL.
+        sql (TextField): SQL with literals replaced by ``?``.
+        count (PositiveIntegerField): Number of slow executions recorded.
+        total_ms (FloatField): Summed duration of those executions.
+        max_ms (FloatField): Longest recorded execution.
+        last_url_name (CharField): URL name of the last request that ran it.
+        last_frame (CharField): Application code (``file:line in function``)
+            that last issued it.
+        first_seen (DateTimeField): When it was first recorded.
+        last_seen (DateTimeField): When it was last recorded.
+    """
+
+    fingerprint = models.CharField(max_length=40, unique=True)
+    sql = models.TextField()
+    count = models.PositiveIntegerField(default=0)
+    total_ms = models.FloatField(default=0)
+    max_ms = models.FloatField(default=0)
+    last_url_name = models.CharField(max_length=200, blank=True)
+    last_frame = models.CharField(max_length=500, blank=True)
+    first_seen = models.DateTimeField(auto_now_add=True)
+    last_seen = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Slow query"
+        verbose_name_plural = "Slow queries"
+
+    @property
+    def avg_ms(self):
+        """Return the mean duration of the recorded executions."""
+        return self.total_ms / self.count if self.count else 0
+
+    def __str__(self):
+        """String representation."""
+        return f"{self.fingerprint} ({self.count}x, max {self.max_ms:.0f} ms)"
+
+
+class RequestProfile(models.Model):
+    """
+    cProfile result of one request, with a time breakdown.
+
+    Attributes:
+        created_at (DateTimeField): When the request was profiled.
+        method (CharField): HTTP method.
+        path (CharField): Full path including the query string.
+        url_name (CharField): Resolved URL name.
+        user (ForeignKey): Authenticated user, if any.
+        status_code (PositiveSmallIntegerField): Response status.
+        requested (BooleanField): True if asked for with ``?prof``, False if
+            sampled automatically.
+        total_ms (FloatField): Wall time of the request.
+        sql_ms (FloatField): Time spent in database queries.
+        sql_count (PositiveIntegerField): Number of queries.
+        template_ms (FloatField): Template rendering time excluding SQL.
+        python_ms (FloatField): Remaining time.
+        stats (BinaryField): Marshalled ``pstats`` data.
+    """
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    method = models.CharField(max_length=10)
+    path = models.CharField(max_length=500)
+    url_name = models.CharField(max_length=200, blank=True)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="+",
+    )
+    status_code = models.PositiveSmallIntegerField()
+    requested = models.BooleanField(default=False)
+    total_ms = models.FloatField()
+    sql_ms = models.FloatField()
+    sql_count = models.PositiveIntegerField()
+    template_ms = models.FloatField()
+    python_ms = models.FloatField()
+    stats = models.BinaryField()
+
+    class Meta:
+        verbose_name = "Request profile"
+        verbose_name_plural = "Request profiles"
+
+    def __str__(self):
+        """String representation."""
+        return f"{self.method} {self.path} ({self.total_ms:.0f} ms)"
+
+
+class StartupBenchmark(models.Model):
+    """
+    Result of one ``benchmark_startup`` run.
+
+    Attributes:
+        created_at (DateTimeField): When the benchmark ran.
+        runs (PositiveSmallIntegerField): Number of cold starts measured.
+        median_ms (FloatField): Median time of ``django.setup()``.
+        min_ms (FloatField): Fastest run.
+        max_ms (FloatField): Slowest run.
+        top_imports (JSONField): ``[[module, cumulative_ms], ...]`` for the
+            slowest top-level imports.
+        python_version (CharField): Interpreter version.
+        note (CharField): Free-form label, e.g. a commit hash.
+    """
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    runs = models.PositiveSmallIntegerField()
+    median_ms = models.FloatField()
+    min_ms = models.FloatField()
+    max_ms = models.FloatField()
+    top_imports = models.JSONField(default=list)
+    python_version = models.CharField(max_length=20)
+    note = models.CharField(max_length=100, blank=True)
+
+    class Meta:
+        verbose_name = "Startup benchmark"
+        verbose_name_plural = "Startup benchmarks"
+
+    def __str__(self):
+        """String representation."""
+        return f"{self.created_at:%Y-%m-%d %H:%M}: {self.median_ms:.0f} ms"
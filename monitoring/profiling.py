@@ -0,0 +1,179 @@
+"""
+monitoring.profiling
+
+cProfile-based profiling of single requests.
+
+A request is profiled when a staff user adds ``?prof`` to the URL, or at
+random for a ``PROFILE_SAMPLE_RATE`` fraction of all requests. The time is
+broken down into SQL (measured by an execute wrapper), template rendering
+(cumulative time of ``django.template.base.Template.render``, minus the SQL
+it triggered) and the remaining Python time. Every profile is stored as a
+``RequestProfile`` whose raw stats can be downloaded and opened with
+``pstats`` or snakeviz.
+"""
+
+import cProfile
+import io
+import marshal
+import pstats
+import random
+import sys
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.template.base import Template
+
+from .models import RequestProfile
+
+PROFILE_PARAM = "prof"
+
+_TEMPLATE_RENDER = Template.render.__code__
+_TEMPLATE_KEY = (
+    _TEMPLATE_RENDER.co_filename,
+    _TEMPLATE_RENDER.co_firstlineno,
+    _TEMPLATE_RENDER.co_name,
+)
+
+
+def requested(request):
+    """Return True if a staff user asked for a profile of this request."""
+    return PROFILE_PARAM in request.GET and request.user.is_staff
+
+
+def sampled():
+    """Return True if this request is picked for automatic profiling."""
+    rate = getattr(settings, "PROFILE_SAMPLE_RATE", 0.0)
+    return rate > 0 and random.random() < rate
+
+
+def _in_template_render():
+    """Return True if the current call stack is inside a template render."""
+    frame = sys._getframe(2)
+    while frame is not None:
+        if frame.f_code is _TEMPLATE_RENDER:
+            return True
+        frame = frame.f_back
+    return False
+
+
+class SQLTimer:
+    """
+    Execute wrapper summing query time, split by template rendering.
+
+    Attributes:
+        count (int): Number of queries run.
+        total (float): Seconds spent in queries.
+        in_templates (float): Part of ``total`` spent while rendering templates.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.in_templates = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        """Run the query and add its duration to the totals."""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.count += 1
+            self.total += elapsed
+            if _in_template_render():
+                self.in_templates += elapsed
+
+
+def profile_request(get_response, request):
+    """
+    Run the request under cProfile and store the result.
+
+    Args:
+        get_response (callable): Next handler in the middleware chain.
+        request (HttpRequest): The request to profile.
+
+    Returns:
+        tuple: ``(response, RequestProfile)``.
+    """
+    profiler = cProfile.Profile()
+    sql = SQLTimer()
+    started = time.perf_counter()
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(sql))
+        profiler.enable()
+        try:
+            response = get_response(request)
+        finally:
+            profiler.disable()
+    total = time.perf_counter() - started
+
+    profiler.create_stats()
+    template_total = profiler.stats.get(_TEMPLATE_KEY, (0, 0, 0, 0))[3]
+    template = max(template_total - sql.in_templates, 0.0)
+    match = request.resolver_match
+    user = request.user if request.user.is_authenticated else None
+
+    profile = RequestProfile.objects.create(
+        method=request.method,
+        path=request.get_full_path()[:500],
+        url_name=(match.view_name if match else "")[:200],
+        user=user,
+        status_code=response.status_code,
+        requested=requested(request),
+        total_ms=total * 1000,
+        sql_ms=sql.total * 1000,
+        sql_count=sql.count,
+        template_ms=template * 1000,
+        python_ms=max(total - sql.total - template, 0.0) * 1000,
+        stats=marshal.dumps(profiler.stats),
+    )
+    prune()
+    return response, profile
+
+
+def prune():
+    """Delete the oldest profiles beyond ``PROFILE_MAX_STORED``."""
+    keep = getattr(settings, "PROFILE_MAX_STORED", 500)
+    newest = RequestProfile.objects.order_by("-pk").values_list("pk", flat=True)
+    cutoff = newest[keep : keep + 1].first()
+    if cutoff is not None:
+        RequestProfile.objects.filter(pk__lte=cutoff).delete()
+
+
+def report(profile, download_url, limit=40):
+    """
+    Return a plain-text report of a profile.
+
+    Args:
+        profile (RequestProfile): Stored profile.
+        download_url (str): Where the raw stats can be downloaded.
+        limit (int): Number of functions listed.
+
+    Returns:
+        str: Time breakdown followed by the top functions by cumulative time.
+    """
+    buffer = io.StringIO()
+    buffer.write(
+        f"{profile.method} {profile.path} -> {profile.status_code}\n"
+        f"total     {profile.total_ms:9.1f} ms\n"
+        f"sql       {profile.sql_ms:9.1f} ms ({profile.sql_count} queries)\n"
+        f"templates {profile.template_ms:9.1f} ms\n"
+        f"python    {profile.python_ms:9.1f} ms\n"
+        f"raw stats: {download_url}\n\n"
+    )
+    stats = pstats.Stats(_StoredStats(profile.stats), stream=buffer)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(limit)
+    return buffer.getvalue()
+
+
+class _StoredStats:
+    """Adapter letting ``pstats.Stats`` load marshalled stats from memory."""
+
+    def __init__(self, data):
+        self.stats = marshal.loads(bytes(data))
+
+    def create_stats(self):
+        """Stats are already complete."""
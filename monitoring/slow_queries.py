@@ -0,0 +1,155 @@
+"""
+monitoring.slow_queries
+
+Capture of slow database queries with the code that issued them.
+
+``QueryRecorder`` is a database execute wrapper (see Django's
+``connection.execute_wrapper``). It times every query of a request and keeps
+the ones slower than ``SLOW_QUERY_THRESHOLD_MS`` (optionally sampled) in a
+bounded ring buffer, together with the innermost stack frame that belongs to
+the project rather than to Django or a third-party library. After the
+response has been built, ``record()`` folds the buffer into the
+``SlowQuery`` table, one row per normalized SQL fingerprint.
+"""
+
+import hashlib
+import random
+import re
+import time
+import traceback
+from collections import deque
+from pathlib import Path
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from .models import SlowQuery
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r"\bIN\s*\((?:\s*(?:\?|%s)\s*,?)+\)", re.IGNORECASE)
+_SPACE_RE = re.compile(r"\s+")
+
+_THIS_DIR = str(Path(__file__).resolve().parent)
+
+
+def normalize_sql(sql):
+    """
+    Replace literals and placeholder lists so similar queries compare equal.
+
+    Args:
+        sql (str): SQL as sent to the database.
+
+    Returns:
+        str: SQL with literals as ``?`` and ``IN`` lists as ``IN (...)``.
+    """
+    sql = _STRING_RE.sub("?", sql)
+    sql = _NUMBER_RE.sub("?", sql)
+    sql = _IN_LIST_RE.sub("IN (...)", sql)
+    return _SPACE_RE.sub(" ", sql).strip()
+
+
+def fingerprint(normalized_sql):
+    """Return a short stable hash of normalized SQL."""
+    return hashlib.sha1(normalized_sql.encode("utf-8")).hexdigest()
+
+
+def caller_frame():
+    """
+    Return the innermost project stack frame as ``file:line in function``.
+
+    Frames from Django, installed packages and this app are skipped.
+
+    Returns:
+        str: Location relative to ``BASE_DIR``, or ``""`` if none is found.
+    """
+    base_dir = str(settings.BASE_DIR)
+    for frame in reversed(traceback.extract_stack()):
+        filename = frame.filename
+        if (
+            filename.startswith(base_dir)
+            and not filename.startswith(_THIS_DIR)
+            and "site-packages" not in filename
+        ):
+            relative = Path(filename).relative_to(base_dir)
+            return f"{relative}:{frame.lineno} in {frame.name}"
+    return ""
+
+
+class QueryRecorder:
+    """
+    Execute wrapper keeping the slow queries of one request.
+
+    Args:
+        threshold_ms (float): Minimum duration for a query to be kept.
+        sample_rate (float): Fraction of slow queries kept (0-1).
+        size (int): Maximum number of queries kept; older ones are dropped.
+    """
+
+    def __init__(self, threshold_ms, sample_rate=1.0, size=100):
+        self.threshold_ms = threshold_ms
+        self.sample_rate = sample_rate
+        self.entries = deque(maxlen=size)
+
+    def __call__(self, execute, sql, params, many, context):
+        """Run the query and keep it if it was slow."""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration_ms = (time.perf_counter() - started) * 1000
+            if duration_ms >= self.threshold_ms and (
+                self.sample_rate >= 1 or random.random() < self.sample_rate
+            ):
+                self.entries.append((sql, duration_ms, caller_frame()))
+
+
+def record(entries, url_name=""):
+    """
+    Fold captured queries into the ``SlowQuery`` table.
+
+    Args:
+        entries (Iterable[tuple]): ``(sql, duration_ms, frame)`` tuples.
+        url_name (str): URL name of the request that ran them.
+    """
+    grouped = {}
+    for sql, duration_ms, frame in entries:
+        normalized = normalize_sql(sql)
+        key = fingerprint(normalized)
+        count, total, longest, _, _ = grouped.get(key, (0, 0.0, 0.0, "", ""))
+        grouped[key] = (
+            count + 1,
+            total + duration_ms,
+            max(longest, duration_ms),
+            normalized,
+            frame,
+        )
+
+    for key, (count, total, longest, normalized, frame) in grouped.items():
+        values = {
+            "count": F("count") + count,
+            "total_ms": F("total_ms") + total,
+            "max_ms": Greatest("max_ms", longest),
+            "last_url_name": url_name[:200],
+            "last_frame": frame[:500],
+            "last_seen": timezone.now(),
+        }
+        if SlowQuery.objects.filter(fingerprint=key).update(**values):
+            continue
+        try:
+            with transaction.atomic():
+                SlowQuery.objects.create(
+                    fingerprint=key,
+                    sql=normalized,
+                    count=count,
+                    total_ms=total,
+                    max_ms=longest,
+                    last_url_name=url_name[:200],
+                    last_frame=frame[:500],
+                )
+        except IntegrityError:
+            # Another process created the row first.
+            SlowQuery.objects.filter(fingerprint=key).update(**values)
@@ -0,0 +1,21 @@
+"""
+monitoring.urls
+
+URL configuration for the Monitoring app.
+
+Defines the staff-only download route for stored request profiles.
+"""
+
+from django.urls import path
+
+from . import views
+
+app_name = "monitoring"
+
+urlpatterns = [
+    path(
+        "profiles/<int:pk>/download/",
+        views.profile_download,
+        name="profile_download",
+    ),
+]
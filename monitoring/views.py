@@ -0,0 +1,41 @@
+"""
+monitoring.views
+
+Views module for the Monitoring app.
+
+Provides the staff-only download of stored request profiles.
+"""
+
+from django.contrib.auth.decorators import login_required
+from django.core.exceptions import PermissionDenied
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+
+from .models import RequestProfile
+
+
+@login_required
+def profile_download(request, pk):
+    """
+    Return the raw stats of a stored profile as a ``.prof`` file.
+
+    The file can be opened with ``python -m pstats`` or snakeviz.
+
+    Args:
+        request (HttpRequest): HTTP request object.
+        pk (int): RequestProfile primary key.
+
+    Returns:
+        HttpResponse: The marshalled ``pstats`` data as an attachment.
+
+    Raises:
+        PermissionDenied: If the user is not staff.
+    """
+    if not request.user.is_staff:
+        raise PermissionDenied()
+    profile = get_object_or_404(RequestProfile, pk=pk)
+    response = HttpResponse(
+        bytes(profile.stats), content_type="application/octet-stream"
+    )
+    response["Content-Disposition"] = f'attachment; filename="profile-{pk}.prof"'
+    return response
@@ -0,0 +1,148 @@
+"""
+news_portal.db_router
+
+Read-replica routing with read-your-writes stickiness.
+
+Writes always go to the ``default`` (primary) database. Reads go to one of
+the aliases in ``DATABASE_REPLICAS`` only while a GET/HEAD request is
+being handled by a view marked as replica-safe: function views decorated
+with ``replica_reads`` and class-based views with ``replica_reads = True``
+(feeds, the read APIs, the directory and the home page). Everything else,
+including management commands, reads from the primary.
+
+A client that has just written something is pinned to the primary so it
+sees its own change despite replication lag. Within the request this
+happens as soon as a write is routed. For the following
+``REPLICA_PIN_SECONDS`` it is done with a cookie set on the response.
+Reads inside a transaction on the primary, and session lookups, also
+stay on the primary.
+
+``ReplicaRoutingMiddleware`` keeps the per-request state; it must be
+listed in ``MIDDLEWARE`` for replicas to be used at all.
+"""
+
+import random
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+PIN_COOKIE = "primary_pin"
+
+# Apps whose tables are always read from the primary.
+PRIMARY_APPS = {"sessions"}
+
+_state = ContextVar("db_routing_state", default=None)
+
+
+class RoutingState:
+    """
+    Routing decisions for the current request.
+
+    Attributes:
+        replica (bool): Reads may use a replica.
+        wrote (bool): A write was routed during the request.
+    """
+
+    def __init__(self):
+        self.replica = False
+        self.wrote = False
+
+
+def replica_reads(view):
+    """Mark a function view whose GET/HEAD reads may be served by a replica."""
+    view.replica_reads = True
+    return view
+
+
+def _is_replica_safe(view_func):
+    """Return True if a resolved view was marked replica-safe."""
+    view_class = getattr(view_func, "view_class", None)
+    return bool(
+        getattr(view_func, "replica_reads", False)
+        or getattr(view_class, "replica_reads", False)
+    )
+
+
+class PrimaryReplicaRouter:
+    """Database router sending replica-safe reads to ``DATABASE_REPLICAS``."""
+
+    def db_for_read(self, model, **hints):
+        """Pick a replica when the current request allows it."""
+        replicas = getattr(settings, "DATABASE_REPLICAS", [])
+        state = _state.get()
+        if not replicas or state is None or not state.replica or state.wrote:
+            return None
+        if model._meta.app_label in PRIMARY_APPS:
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        """Send writes to the primary and pin the rest of the request to it."""
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        """Allow relations between objects loaded from primary or replicas."""
+        aliases = {DEFAULT_DB_ALIAS, *getattr(settings, "DATABASE_REPLICAS", [])}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        """Replicas receive their schema through replication, not migrations."""
+        if db in getattr(settings, "DATABASE_REPLICAS", []):
+            return False
+        return None
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Track replica eligibility and writes for each request.
+
+    Sets the pin cookie on responses to requests that wrote to the primary.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        state = RoutingState()
+        token = _state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.reset(token)
+
+        if state.wrote:
+            pin_seconds = getattr(settings, "REPLICA_PIN_SECONDS", 5)
+            response.set_cookie(
+                PIN_COOKIE,
+                str(int(time.time()) + pin_seconds),
+                max_age=pin_seconds,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        """Allow replica reads for safe requests to replica-safe views."""
+        state = _state.get()
+        if state is None or request.method not in ("GET", "HEAD"):
+            return None
+        if not _is_replica_safe(view_func) or self._pinned(request):
+            return None
+        state.replica = True
+        return None
+
+    def _pinned(self, request):
+        """Return True if the client wrote within the pin window."""
+        try:
+            return int(request.COOKIES.get(PIN_COOKIE, 0)) > time.time()
+        except ValueError:
+            return False
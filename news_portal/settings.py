@@ -47,6 +47,7 @@ INSTALLED_APPS = [
     "accounts",
     "dashboards",
     "newsletters",
+    "monitoring",
     "rest_framework",
 ]
 
@@ -58,6 +59,10 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "monitoring.middleware.SlowQueryMiddleware",
+    "monitoring.middleware.ProfilingMiddleware",
+    # Last, so bookkeeping writes of the middleware above do not pin clients.
+    "news_portal.db_router.ReplicaRoutingMiddleware",
 ]
 
 ROOT_URLCONF = "news_portal.urls"
@@ -99,6 +104,112 @@ DATABASES = {
     }
 }
 
+# Read replicas: one alias per host in DB_REPLICA_HOSTS (comma-separated),
+# otherwise identical to "default". Replica-safe views read from them; a
+# client that wrote something reads from the primary for
+# REPLICA_PIN_SECONDS. Tests mirror the replicas to the default database.
+_replica_hosts = os.getenv("DB_REPLICA_HOSTS", "").split(",")
+for _index, _host in enumerate(h.strip() for h in _replica_hosts if h.strip()):
+    DATABASES[f"replica_{_index}"] = {
+        **DATABASES["default"],
+        "HOST": _host,
+        "TEST": {"MIRROR": "default"},
+    }
+
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias.startswith("replica_")]
+DATABASE_ROUTERS = ["news_portal.db_router.PrimaryReplicaRouter"]
+REPLICA_PIN_SECONDS = int(os.getenv("REPLICA_PIN_SECONDS", "5"))
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Use a shared backend (e.g. django.core.cache.backends.redis.RedisCache)
+# in production so every worker sees the same cached pages and counters.
+
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.getenv("CACHE_LOCATION", "news-portal"),
+    }
+}
+
+# Seconds a rendered article/newsletter body stays in the page cache.
+PAGE_CACHE_TIMEOUT = int(os.getenv("PAGE_CACHE_TIMEOUT", "3600"))
+
+# Upper bound (seconds) on how long a rendered RSS/Atom feed is cached; feeds
+# are also expired whenever content of their publisher or journalist changes.
+FEED_CACHE_TIMEOUT = int(os.getenv("FEED_CACHE_TIMEOUT", "86400"))
+
+# Bearer token Prometheus uses to scrape /metrics/ (staff sessions also work).
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+# Slow-query capture (browse under Admin > Monitoring > Slow queries). Queries
+# slower than the threshold are sampled at SLOW_QUERY_SAMPLE_RATE, at most
+# SLOW_QUERY_BUFFER_SIZE per request, and grouped by normalized SQL.
+SLOW_QUERY_ENABLED = os.getenv("SLOW_QUERY_ENABLED", "0") == "1"
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "200"))
+SLOW_QUERY_SAMPLE_RATE = float(os.getenv("SLOW_QUERY_SAMPLE_RATE", "1.0"))
+SLOW_QUERY_BUFFER_SIZE = int(os.getenv("SLOW_QUERY_BUFFER_SIZE", "100"))
+
+# Request profiling: staff can add ?prof to any URL; additionally a fraction
+# of all requests is profiled automatically. Only the newest
+# PROFILE_MAX_STORED profiles are kept (Admin > Monitoring > Request profiles).
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_MAX_STORED = int(os.getenv("PROFILE_MAX_STORED", "500"))
+
+# Pre-rendered static detail pages for approved content, served directly by
+# the front web server (see README). Disabled unless STATIC_PAGES_ENABLED=1.
+STATIC_PAGES_ENABLED = os.getenv("STATIC_PAGES_ENABLED", "0") == "1"
+STATIC_PAGES_ROOT = Path(os.getenv("STATIC_PAGES_ROOT", BASE_DIR / "prerendered"))
+
+# Memory-mapped reverse subscription index used to resolve who follows a
+# publisher or journalist; rebuild it with `build_audience_index`. Without
+# the file, audiences are queried from the database.
+AUDIENCE_INDEX_PATH = Path(
+    os.getenv("AUDIENCE_INDEX_PATH", BASE_DIR / "var" / "audience.idx")
+)
+
+# Seconds an API worker reuses a cached first page of the publisher/journalist
+# directory (autocomplete) before querying again.
+DIRECTORY_CACHE_TIMEOUT = int(os.getenv("DIRECTORY_CACHE_TIMEOUT", "60"))
+
+# Article detail views are buffered per worker and written to the view count
+# table every VIEW_COUNT_FLUSH_INTERVAL seconds or VIEW_COUNT_FLUSH_HITS hits.
+VIEW_COUNT_FLUSH_INTERVAL = int(os.getenv("VIEW_COUNT_FLUSH_INTERVAL", "10"))
+VIEW_COUNT_FLUSH_HITS = int(os.getenv("VIEW_COUNT_FLUSH_HITS", "500"))
+
+# `archive_content` moves approved items older than ARCHIVE_AFTER_DAYS into
+# the archive tables, ARCHIVE_BATCH_SIZE rows per transaction, sleeping
+# ARCHIVE_BATCH_PAUSE seconds between batches.
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "365"))
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "500"))
+ARCHIVE_BATCH_PAUSE = float(os.getenv("ARCHIVE_BATCH_PAUSE", "0.5"))
+
+# Article revisions are stored as reverse diffs, with the full text kept on
+# one revision in every REVISION_SNAPSHOT_EVERY. `compact_revisions` thins
+# revisions older than REVISION_KEEP_DAYS to the last one of each day.
+REVISION_SNAPSHOT_EVERY = int(os.getenv("REVISION_SNAPSHOT_EVERY", "20"))
+REVISION_KEEP_DAYS = int(os.getenv("REVISION_KEEP_DAYS", "30"))
+
+# `publish_scheduled` wakes up at least every SCHEDULER_INTERVAL seconds and
+# releases due scheduled items SCHEDULER_BATCH_SIZE rows per transaction.
+SCHEDULER_INTERVAL = float(os.getenv("SCHEDULER_INTERVAL", "30"))
+SCHEDULER_BATCH_SIZE = int(os.getenv("SCHEDULER_BATCH_SIZE", "200"))
+
+# Token-bucket throttling of the subscriber content APIs: each user's bucket
+# refills at the rate of their role and holds up to API_THROTTLE_BURST
+# requests; each client IP's refills at the "ip" rate and holds up to
+# API_THROTTLE_IP_BURST, since it is shared by every account behind it.
+API_THROTTLE_RATES = {
+    "reader": os.getenv("API_THROTTLE_RATE_READER", "60/min"),
+    "journalist": os.getenv("API_THROTTLE_RATE_JOURNALIST", "120/min"),
+    "editor": os.getenv("API_THROTTLE_RATE_EDITOR", "240/min"),
+    "ip": os.getenv("API_THROTTLE_RATE_IP", "300/min"),
+}
+API_THROTTLE_BURST = int(os.getenv("API_THROTTLE_BURST", "20"))
+API_THROTTLE_IP_BURST = int(os.getenv("API_THROTTLE_IP_BURST", "100"))
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 AUTH_USER_MODEL = "accounts.CustomUser"
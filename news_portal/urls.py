@@ -31,4 +31,5 @@ urlpatterns = [
     path("newsletters/", include("newsletters.urls", namespace="newsletters")),
     path("dashboards/", include("dashboards.urls", namespace="dashboards")),
     path("subscriptions/", include("subscriptions.urls", namespace="subscriptions")),
+    path("monitoring/", include("monitoring.urls", namespace="monitoring")),
 ]
@@ -1,5 +1,7 @@
 from django import forms
 
+from articles.forms import BodyFormMixin
+
 from .models import Newsletter
 
 """
@@ -9,7 +11,7 @@ Includes forms for creating and updating Newsletter instances.
 """
 
 
-class NewsletterForm(forms.ModelForm):
+class NewsletterForm(BodyFormMixin, forms.ModelForm):
     """
     Form for creating or editing a Newsletter.
 
@@ -18,26 +20,41 @@ class NewsletterForm(forms.ModelForm):
     - content: Body content of the newsletter
     - publisher: Publisher associated with the newsletter
     - author: Author (user) of the newsletter
+    - publish_at: Optional release time; approval schedules the newsletter
     - is_approved: Boolean flag indicating if approved by editor
 
     Widgets are customized for Bootstrap 5 styling.
     """
 
+    content = forms.CharField(
+        widget=forms.Textarea(
+            attrs={
+                "class": "form-control",
+                "rows": 10,
+                "placeholder": "Write the newsletter content here...",
+            }
+        )
+    )
+
     class Meta:
         model = Newsletter
-        fields = ["title", "content", "publisher", "author", "is_approved"]
+        fields = [
+            "title",
+            "content",
+            "publisher",
+            "author",
+            "publish_at",
+            "is_approved",
+        ]
         widgets = {
             "title": forms.TextInput(
                 attrs={"class": "form-control", "placeholder": "Enter newsletter title"}
             ),
-            "content": forms.Textarea(
-                attrs={
-                    "class": "form-control",
-                    "rows": 10,
-                    "placeholder": "Write the newsletter content here...",
-                }
-            ),
             "publisher": forms.Select(attrs={"class": "form-select"}),
             "author": forms.Select(attrs={"class": "form-select"}),
+            "publish_at": forms.DateTimeInput(
+                attrs={"class": "form-control", "type": "datetime-local"},
+                format="%Y-%m-%dT%H:%M",
+            ),
             "is_approved": forms.CheckboxInput(attrs={"class": "form-check-input"}),
         }
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-19 09:28
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("articles", "0006_status_created_index"),
+        ("newsletters", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="newsletter",
+            index=models.Index(
+                fields=["is_approved", "created_at", "id"],
+                name="newsletter_status_created_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.5 on 2026-10-19 09:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("newsletters", "0002_status_created_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="newsletter",
+            name="excerpt",
+            field=models.CharField(blank=True, editable=False, max_length=500),
+        ),
+        migrations.AddField(
+            model_name="newsletter",
+            name="reading_time",
+            field=models.PositiveSmallIntegerField(
+                default=0,
+                editable=False,
+                help_text="Estimated reading time in minutes.",
+            ),
+        ),
+        migrations.AddField(
+            model_name="newsletter",
+            name="word_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-19 09:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("newsletters", "0003_derived_text_fields"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="newsletter",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.5 on 2026-10-19 09:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("newsletters", "0004_newsletter_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="newsletter",
+            name="approved_at",
+            field=models.DateTimeField(
+                blank=True, db_index=True, editable=False, null=True
+            ),
+        ),
+    ]
@@ -0,0 +1,72 @@
+# Generated by Django 5.2.5 on 2026-10-19 10:17
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("articles", "0011_archived_article"),
+        ("newsletters", "0005_approved_at"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedNewsletter",
+            fields=[
+                (
+                    "excerpt",
+                    models.CharField(blank=True, editable=False, max_length=500),
+                ),
+                ("word_count", models.PositiveIntegerField(default=0, editable=False)),
+                (
+                    "reading_time",
+                    models.PositiveSmallIntegerField(
+                        default=0,
+                        editable=False,
+                        help_text="Estimated reading time in minutes.",
+                    ),
+                ),
+                (
+                    "approved_at",
+                    models.DateTimeField(
+                        blank=True, db_index=True, editable=False, null=True
+                    ),
+                ),
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("title", models.CharField(max_length=255)),
+                ("content", models.TextField()),
+                ("is_approved", models.BooleanField(default=True)),
+                ("created_at", models.DateTimeField()),
+                ("updated_at", models.DateTimeField()),
+                (
+                    "archived_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                (
+                    "author",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "publisher",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="articles.publisher",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Archived newsletter",
+                "verbose_name_plural": "Archived newsletters",
+            },
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.5 on 2026-10-19 10:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("newsletters", "0006_archived_newsletter"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NewsletterBody",
+            fields=[
+                ("data", models.BinaryField()),
+                (
+                    "newsletter",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="body",
+                        serialize=False,
+                        to="newsletters.newsletter",
+                    ),
+                ),
+            ],
+            options={
+                "abstract": False,
+            },
+        ),
+        # The existing column is kept and mapped to legacy_content; its rows
+        # are moved into the body table by the move_content_bodies command.
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.RenameField(
+                    model_name="newsletter",
+                    old_name="content",
+                    new_name="legacy_content",
+                ),
+                migrations.AlterField(
+                    model_name="newsletter",
+                    name="legacy_content",
+                    field=models.TextField(
+                        blank=True, db_column="content", default="", editable=False
+                    ),
+                ),
+            ],
+        ),
+    ]
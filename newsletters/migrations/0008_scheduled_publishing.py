@@ -0,0 +1,36 @@
+# Generated by Django 5.2.5 on 2026-10-19 10:34
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("articles", "0014_scheduled_publishing"),
+        ("newsletters", "0007_newsletter_body"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="newsletter",
+            name="is_scheduled",
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.AddField(
+            model_name="newsletter",
+            name="publish_at",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="Release time; leave empty to publish on approval.",
+                null=True,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="newsletter",
+            index=models.Index(
+                fields=["is_scheduled", "publish_at"], name="newsletter_scheduled_idx"
+            ),
+        ),
+    ]
@@ -1,25 +1,43 @@
 from django.conf import settings
 from django.db import models
 
+from articles.models import (
+    ApprovalStampModel,
+    ArchivedContentModel,
+    CompressedBodyModel,
+    ContentBodyModel,
+    DerivedTextModel,
+    ScheduledPublishModel,
+)
+
 """
 Models for the newsletters app.
 
 Defines the Newsletter model representing publications associated with
-publishers and authors.
+publishers and authors, NewsletterBody holding its compressed body, and
+ArchivedNewsletter holding old newsletters moved out of it.
 """
 
 
-class Newsletter(models.Model):
+class Newsletter(
+    DerivedTextModel, ScheduledPublishModel, ApprovalStampModel, CompressedBodyModel
+):
     """
     Represents a newsletter publication associated with a publisher and author.
 
     Attributes:
         title (CharField): Title of the newsletter.
-        content (TextField): Body content of the newsletter.
+        content (str): Body content of the newsletter, stored in
+            ``NewsletterBody``.
         publisher (ForeignKey): The publisher this newsletter belongs to.
         author (ForeignKey): The user who authored the newsletter.
         is_approved (BooleanField): Flag indicating if the newsletter is approved.
         created_at (DateTimeField): Timestamp of creation.
+        updated_at (DateTimeField): Timestamp of the last update.
+        excerpt, word_count, reading_time: See articles.models.DerivedTextModel.
+        approved_at: See articles.models.ApprovalStampModel.
+        publish_at, is_scheduled: See articles.models.ScheduledPublishModel.
+        legacy_content: See articles.models.CompressedBodyModel.
 
     Related objects:
         publisher.newsletters: All newsletters for a given publisher.
@@ -27,7 +45,6 @@ class Newsletter(models.Model):
     """
 
     title = models.CharField(max_length=255)
-    content = models.TextField()
     publisher = models.ForeignKey(
         "articles.Publisher",
         on_delete=models.CASCADE,
@@ -40,6 +57,21 @@ class Newsletter(models.Model):
     )
     is_approved = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Editor moderation queue: status filter + keyset pagination.
+            models.Index(
+                fields=["is_approved", "created_at", "id"],
+                name="newsletter_status_created_idx",
+            ),
+            # Release scheduler: due scheduled items.
+            models.Index(
+                fields=["is_scheduled", "publish_at"],
+                name="newsletter_scheduled_idx",
+            ),
+        ]
 
     def __str__(self):
         """
@@ -49,3 +81,25 @@ class Newsletter(models.Model):
             str: The title of the newsletter.
         """
         return self.title
+
+
+class NewsletterBody(ContentBodyModel):
+    """
+    Compressed body of a newsletter (see articles.models.CompressedBodyModel).
+
+    Attributes:
+        newsletter (OneToOneField): The newsletter; also the primary key.
+        data: See articles.models.ContentBodyModel.
+    """
+
+    newsletter = models.OneToOneField(
+        Newsletter, on_delete=models.CASCADE, primary_key=True, related_name="body"
+    )
+
+
+class ArchivedNewsletter(ArchivedContentModel):
+    """A newsletter moved out of ``Newsletter`` by the archiver."""
+
+    class Meta:
+        verbose_name = "Archived newsletter"
+        verbose_name_plural = "Archived newsletters"
@@ -9,6 +9,7 @@ Provides role-based routes for managing newsletters:
 
 - Editor:
     - List unapproved newsletters for review
+    - Approve or reject selected newsletters in bulk
     - Edit a newsletter
     - Delete a newsletter
 - Journalist:
@@ -25,6 +26,7 @@ app_name = "newsletters"
 urlpatterns = [
     # ---------------- Editor URLs ----------------
     path("editor/", views.editor_newsletter_list, name="editor_list"),
+    path("editor/bulk/", views.editor_newsletter_bulk, name="editor_bulk"),
     path("editor/<int:pk>/edit/", views.editor_newsletter_edit, name="editor_edit"),
     path(
         "editor/<int:pk>/delete/",
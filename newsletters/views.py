@@ -1,9 +1,19 @@
+from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.core.exceptions import PermissionDenied
-from django.db.models import Q
 from django.shortcuts import get_object_or_404, redirect, render
 
-from subscriptions.models import Subscription
+from articles import archive, page_cache
+from articles.models import Publisher
+from articles.moderation import (
+    BULK_ACTIONS,
+    bulk_set_approval,
+    moderation_queue,
+    queue_params,
+)
+from news_portal.db_router import replica_reads
+from subscriptions import read_state
+from subscriptions.snapshot import get_snapshot
 
 from .forms import NewsletterForm
 from .models import Newsletter
@@ -23,17 +33,27 @@ Includes views for editors, journalists, and readers:
 
 def editor_newsletter_list(request):
     """
-    Display a list of all newsletters for editors.
+    Display the newsletter moderation queue for editors.
 
+    Supports ``?status=all|approved|unapproved``, ``?publisher=<id>`` and
+    keyset pagination through ``?cursor=<token>``.
     Only accessible to users with the 'editor' role.
     """
     if not request.user.is_authenticated or request.user.role != "editor":
         raise PermissionDenied()
-    newsletters = Newsletter.objects.all().order_by("-created_at")
+    params = queue_params(request.GET)
+    queue = moderation_queue(Newsletter, **params)
     return render(
         request,
         "newsletters/editor_newsletter_list.html",
-        {"newsletters": newsletters},
+        {
+            "newsletters": queue["items"],
+            "next_cursor": queue["next_cursor"],
+            "counts": queue["counts"],
+            "filter_status": params["status"],
+            "filter_publisher": params["publisher"],
+            "publishers": Publisher.objects.only("id", "name").order_by("name"),
+        },
     )
 
 
@@ -53,6 +73,27 @@ def editor_newsletter_delete(request, pk):
     )
 
 
+@login_required
+def editor_newsletter_bulk(request):
+    """
+    Approve or reject the newsletters selected on the editor list.
+
+    Expects a POST with one or more ``ids`` and ``action`` set to
+    ``approve`` or ``reject``. Only accessible to users with the 'editor' role.
+    """
+    if request.user.role != "editor":
+        raise PermissionDenied()
+    if request.method == "POST":
+        action = request.POST.get("action")
+        ids = [pk for pk in request.POST.getlist("ids") if pk.isdigit()]
+        if action in BULK_ACTIONS and ids:
+            changed = bulk_set_approval(Newsletter, ids, approve=action == "approve")
+            messages.success(
+                request, f"{changed} newsletter(s) {BULK_ACTIONS[action]}."
+            )
+    return redirect("newsletters:editor_list")
+
+
 def editor_newsletter_edit(request, pk):
     """
     Allow editors to edit and approve a newsletter.
@@ -86,50 +127,59 @@ def editor_newsletter_edit(request, pk):
 # ---------------------------- Reader Views ----------------------------
 
 
+@replica_reads
 @login_required
 def reader_newsletter_list(request):
     """
     Display approved newsletters for a reader based on subscriptions.
 
-    Readers see newsletters from publishers or journalists they are subscribed to.
+    Readers see newsletters from publishers or journalists they are subscribed to;
+    unread ones are flagged.
     """
     if request.user.role != "reader":
         raise PermissionDenied()
-    subscriptions_pub = Subscription.objects.filter(
-        user=request.user, publisher__isnull=False
-    ).values_list("publisher_id", flat=True)
-    subscriptions_jour = Subscription.objects.filter(
-        user=request.user, journalist__isnull=False
-    ).values_list("journalist_id", flat=True)
     newsletters = (
         Newsletter.objects.filter(
-            Q(publisher__id__in=subscriptions_pub)
-            | Q(author__id__in=subscriptions_jour),
-            is_approved=True,
+            get_snapshot(request.user).content_filter(), is_approved=True
         )
-        .distinct()
+        .defer("legacy_content")
         .order_by("-created_at")
     )
     return render(
-        request, "newsletters/reader_newsletter_list.html", {"newsletters": newsletters}
+        request,
+        "newsletters/reader_newsletter_list.html",
+        {
+            "newsletters": newsletters,
+            "unread_newsletters": read_state.unread_ids(request.user, newsletters),
+        },
     )
 
 
 @login_required
 def reader_newsletter_detail(request, pk):
     """
-    Display a single approved newsletter to a reader.
+    Display a single approved newsletter to a reader and mark it read.
+    Archived newsletters are shown but not marked.
 
     Parameters:
         pk (int): Primary key of the newsletter.
 
     Only accessible to users with the 'reader' role.
     """
-    newsletter = get_object_or_404(Newsletter, pk=pk, is_approved=True)
+    newsletter = archive.get_object_or_404(
+        Newsletter, defer_body=True, pk=pk, is_approved=True
+    )
     if request.user.role != "reader":
         raise PermissionDenied()
+    if not archive.is_archived(newsletter):
+        read_state.record_read(request.user, newsletter)
+    body_html = page_cache.render_body(
+        newsletter, "newsletters/_newsletter_body.html", "newsletter"
+    )
     return render(
-        request, "newsletters/newsletter_detail.html", {"newsletter": newsletter}
+        request,
+        "newsletters/newsletter_detail.html",
+        {"newsletter": newsletter, "body_html": body_html},
     )
 
 
@@ -160,7 +210,11 @@ def journalist_newsletter_list(request):
     """Display all newsletters created by the logged-in journalist."""
     if not request.user.is_authenticated or request.user.role != "journalist":
         raise PermissionDenied()
-    newsletters = Newsletter.objects.filter(author=request.user).order_by("-created_at")
+    newsletters = (
+        Newsletter.objects.filter(author=request.user)
+        .defer("legacy_content")
+        .order_by("-created_at")
+    )
     return render(
         request,
         "newsletters/journalist_newsletter_list.html",
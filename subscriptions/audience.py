@@ -0,0 +1,344 @@
+"""
+subscriptions.audience
+
+Reverse subscription index: the reader ids following each publisher and
+journalist, as sorted arrays of 64-bit integers.
+
+The ``build_audience_index`` command writes the index to a single file at
+``AUDIENCE_INDEX_PATH``::
+
+    header     magic, watermark, number of sources    (3 x int64)
+    directory  kind, source id, offset, length         (4 x int64 per source)
+    data       sorted user ids of every source, back to back (int64)
+
+Worker processes memory-map the file read-only, so the operating system
+shares one copy of the pages between them, and a source's audience is a
+zero-copy slice of the mapping. Every follow and unfollow is also logged
+as an ``AudienceChange`` row. The build stores the id of the newest change
+it has seen as the index's watermark. On lookup, the changes above the
+watermark are read for the requested sources (one indexed query) and merged
+into the slices. Every worker therefore sees the same audience, whatever
+cache backend it uses. Replaying a change the build already saw is
+harmless, since follows and unfollows are idempotent. A rebuild deletes the
+changes covered by the index it replaces.
+
+Without a readable index file ``audience()`` returns None and callers fall
+back to querying ``Subscription``.
+"""
+
+import logging
+import mmap
+import os
+import tempfile
+import threading
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+
+from django.conf import settings
+from django.db.models import Max, Q
+
+from .models import AudienceChange, Subscription
+
+logger = logging.getLogger(__name__)
+
+MAGIC = int.from_bytes(b"NPAUDIX2", "little")
+HEADER_ITEMS = 3
+ENTRY_ITEMS = 4
+
+PUBLISHER = 0
+JOURNALIST = 1
+
+# ---------------- Sorted array operations ----------------
+
+
+def _copy(target, ids):
+    """Append an int64 array or memoryview to ``target`` with one memcpy."""
+    target.frombytes(memoryview(ids).cast("B"))
+
+
+def union(a, b):
+    """
+    Merge two sorted id sequences.
+
+    Runs in ``O(len(b) * log(len(a)))`` Python steps plus a memory copy of
+    ``a``, so pass the smaller sequence as ``b``.
+
+    Args:
+        a (array or memoryview): Sorted, distinct int64 ids.
+        b (Sequence[int]): Sorted, distinct ids.
+
+    Returns:
+        array: Sorted, distinct ids present in either sequence.
+    """
+    merged = array("q")
+    start = 0
+    for value in b:
+        position = bisect_left(a, value, start)
+        if position < len(a) and a[position] == value:
+            continue
+        _copy(merged, a[start:position])
+        merged.append(value)
+        start = position
+    _copy(merged, a[start:])
+    return merged
+
+
+def difference(a, b):
+    """
+    Remove the ids of ``b`` from ``a``.
+
+    Args:
+        a (array or memoryview): Sorted, distinct int64 ids.
+        b (Sequence[int]): Sorted ids to remove.
+
+    Returns:
+        array: Sorted ids of ``a`` that are not in ``b``.
+    """
+    remaining = array("q")
+    start = 0
+    for value in b:
+        position = bisect_left(a, value, start)
+        if position < len(a) and a[position] == value:
+            _copy(remaining, a[start:position])
+            start = position + 1
+    _copy(remaining, a[start:])
+    return remaining
+
+
+# ---------------- Index file ----------------
+
+
+class AudienceIndex:
+    """
+    Read-only view of a memory-mapped index file.
+
+    Attributes:
+        watermark (int): Id of the newest ``AudienceChange`` the build saw.
+    """
+
+    def __init__(self, path):
+        """Map the file and load its directory."""
+        with open(path, "rb") as handle:
+            self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        self._items = memoryview(self._map).cast("q")
+        magic, self.watermark, count = self._items[:HEADER_ITEMS]
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not an audience index")
+        entries = self._items[HEADER_ITEMS : HEADER_ITEMS + count * ENTRY_ITEMS]
+        self._directory = {
+            (entries[i], entries[i + 1]): (entries[i + 2], entries[i + 3])
+            for i in range(0, len(entries), ENTRY_ITEMS)
+        }
+        self._data = self._items[HEADER_ITEMS + count * ENTRY_ITEMS :]
+
+    def close(self):
+        """
+        Unmap the file.
+
+        If a caller still holds a slice from ``lookup``, the mapping is
+        closed by the garbage collector once the last slice is released.
+        """
+        for view in (getattr(self, "_data", None), self._items):
+            if view is not None:
+                view.release()
+        try:
+            self._map.close()
+        except BufferError:
+            pass
+
+    def lookup(self, kind, source_id):
+        """
+        Return the indexed followers of one source.
+
+        Args:
+            kind (int): ``PUBLISHER`` or ``JOURNALIST``.
+            source_id (int): Publisher or ``Journalist`` id.
+
+        Returns:
+            memoryview: Sorted user ids, sharing memory with the mapping.
+        """
+        offset, length = self._directory.get((kind, source_id), (0, 0))
+        return self._data[offset : offset + length]
+
+
+def index_path():
+    """Return the configured index file location."""
+    return Path(getattr(settings, "AUDIENCE_INDEX_PATH", "audience.idx"))
+
+
+_loaded = {"key": None, "index": None}
+_load_lock = threading.Lock()
+
+
+def get_index():
+    """
+    Return the current index, remapping it after a rebuild.
+
+    The replaced mapping is not closed: threads may still be reading it or
+    holding slices of it, so it is unmapped by the garbage collector once
+    the last reference is gone.
+
+    Returns:
+        AudienceIndex or None: None if no index has been built, or if the
+        file has an older format (rebuild it).
+    """
+    path = index_path()
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    key = (str(path), stat.st_ino, stat.st_mtime_ns)
+    with _load_lock:
+        if _loaded["key"] != key:
+            try:
+                index = AudienceIndex(path)
+            except ValueError:
+                logger.warning("Ignoring %s; run build_audience_index.", path)
+                index = None
+            _loaded["index"], _loaded["key"] = index, key
+        return _loaded["index"]
+
+
+def build(path=None):
+    """
+    Write a new index from the ``Subscription`` table.
+
+    The file is written next to the target and renamed over it, so readers
+    always map a complete index. The watermark is taken before the
+    subscriptions are read, so changes recorded while the build runs are
+    replayed on top of it. Changes only the replaced index needed are
+    deleted afterwards.
+
+    Args:
+        path (Path, optional): Target file; defaults to ``AUDIENCE_INDEX_PATH``.
+
+    Returns:
+        dict: ``{"sources": <int>, "subscriptions": <int>}``.
+    """
+    path = Path(path or index_path())
+    watermark = AudienceChange.objects.aggregate(last=Max("id"))["last"] or 0
+    previous = get_index() if path == index_path() else None
+
+    sources = {}
+    for kind, field in ((PUBLISHER, "publisher_id"), (JOURNALIST, "journalist_id")):
+        rows = (
+            Subscription.objects.filter(**{f"{field}__isnull": False})
+            .order_by(field, "user_id")
+            .values_list(field, "user_id")
+            .iterator(chunk_size=10000)
+        )
+        for source_id, user_id in rows:
+            ids = sources.setdefault((kind, source_id), array("q"))
+            if not ids or ids[-1] != user_id:
+                ids.append(user_id)
+
+    directory = array("q")
+    offset = 0
+    for (kind, source_id), ids in sources.items():
+        directory.extend((kind, source_id, offset, len(ids)))
+        offset += len(ids)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            array("q", (MAGIC, watermark, len(sources))).tofile(handle)
+            directory.tofile(handle)
+            for ids in sources.values():
+                ids.tofile(handle)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    if previous is not None:
+        AudienceChange.objects.filter(id__lte=previous.watermark).delete()
+    return {"sources": len(sources), "subscriptions": offset}
+
+
+# ---------------- Incremental changes ----------------
+
+
+def record_changes(subscriptions, following):
+    """
+    Log follows or unfollows for the next lookups and builds.
+
+    Args:
+        subscriptions (Iterable[Subscription]): Added or removed subscriptions.
+        following (bool): True for follows, False for unfollows.
+    """
+    changes = []
+    for subscription in subscriptions:
+        if subscription.publisher_id:
+            kind, source_id = PUBLISHER, subscription.publisher_id
+        elif subscription.journalist_id:
+            kind, source_id = JOURNALIST, subscription.journalist_id
+        else:
+            continue
+        changes.append(
+            AudienceChange(
+                kind=kind,
+                source_id=source_id,
+                user_id=subscription.user_id,
+                following=following,
+            )
+        )
+    if changes:
+        AudienceChange.objects.bulk_create(changes)
+
+
+def _followers(index, sources):
+    """Return the indexed followers of ``sources`` with later changes applied."""
+    deltas = {source: {} for source in sources}
+    condition = Q()
+    for kind, source_id in sources:
+        condition |= Q(kind=kind, source_id=source_id)
+    rows = (
+        AudienceChange.objects.filter(condition, id__gt=index.watermark)
+        .order_by("id")
+        .values_list("kind", "source_id", "user_id", "following")
+    )
+    for kind, source_id, user_id, following in rows:
+        deltas[(kind, source_id)][user_id] = following
+
+    parts = []
+    for source, delta in deltas.items():
+        ids = index.lookup(*source)
+        if delta:
+            removed = sorted(user for user, follows in delta.items() if not follows)
+            added = sorted(user for user, follows in delta.items() if follows)
+            ids = union(difference(ids, removed), added)
+        parts.append(ids)
+    return parts
+
+
+def audience(publisher_id=None, journalist_id=None):
+    """
+    Return the user ids following a publisher, a journalist, or either.
+
+    Args:
+        publisher_id (int, optional): Publisher id.
+        journalist_id (int, optional): ``Journalist`` id.
+
+    Returns:
+        Sequence[int] or None: Sorted, distinct user ids, or None when no
+        index has been built.
+    """
+    index = get_index()
+    if index is None:
+        return None
+    sources = [
+        (kind, source_id)
+        for kind, source_id in ((PUBLISHER, publisher_id), (JOURNALIST, journalist_id))
+        if source_id
+    ]
+    if not sources:
+        return array("q")
+    parts = _followers(index, sources)
+    if len(parts) == 1:
+        return parts[0]
+    small, large = sorted(parts, key=len)
+    return union(large, small)
@@ -0,0 +1,68 @@
+"""
+subscriptions.bulk
+
+Follow and unfollow many publishers and journalists in one request.
+
+New subscriptions are written with a single ``bulk_create`` that ignores
+rows already present, relying on the unique constraints of
+``Subscription`` instead of a ``get_or_create`` round trip per target.
+Removals are one filtered ``delete``. Both run in one transaction, and the
+reader's new state is returned from a freshly loaded snapshot. Because
+``bulk_create`` sends no ``post_save`` and does not say which rows it
+inserted, follows are recorded in the audience index explicitly and the
+subscriber counts of every source touched are recomputed from the
+subscription table inside the same transaction.
+"""
+
+from django.db import transaction
+from django.db.models import Q
+
+from articles.directory import recount_subscribers
+
+from . import audience
+from .models import Subscription
+from .snapshot import get_snapshot, invalidate
+
+
+def apply_changes(
+    user,
+    follow_publishers=(),
+    follow_journalists=(),
+    unfollow_publishers=(),
+    unfollow_journalists=(),
+):
+    """
+    Add and remove a reader's subscriptions in bulk.
+
+    Ids are expected to exist; callers validate them first.
+
+    Args:
+        user (CustomUser): Reader whose subscriptions change.
+        follow_publishers (Iterable[int]): Publisher ids to follow.
+        follow_journalists (Iterable[int]): ``Journalist`` ids to follow.
+        unfollow_publishers (Iterable[int]): Publisher ids to unfollow.
+        unfollow_journalists (Iterable[int]): ``Journalist`` ids to unfollow.
+
+    Returns:
+        SubscriptionSnapshot: The reader's subscriptions after the change.
+    """
+    rows = [
+        Subscription(user=user, publisher_id=pk) for pk in set(follow_publishers)
+    ] + [Subscription(user=user, journalist_id=pk) for pk in set(follow_journalists)]
+    removed = Q(publisher_id__in=set(unfollow_publishers)) | Q(
+        journalist_id__in=set(unfollow_journalists)
+    )
+
+    with transaction.atomic():
+        if rows:
+            Subscription.objects.bulk_create(rows, ignore_conflicts=True)
+            transaction.on_commit(lambda: audience.record_changes(rows, True))
+        if unfollow_publishers or unfollow_journalists:
+            Subscription.objects.filter(removed, user=user).delete()
+        recount_subscribers(
+            set(follow_publishers) | set(unfollow_publishers),
+            set(follow_journalists) | set(unfollow_journalists),
+        )
+
+    invalidate(user)
+    return get_snapshot(user)
@@ -0,0 +1,184 @@
+"""
+subscriptions.digests
+
+Digest emails for readers who chose hourly or daily delivery.
+
+Instead of one email per approved publication, these readers receive one
+message per delivery window listing everything their publishers and
+journalists published in it. A run collects the window's approved items,
+matches them to subscribers with one set-based subscription query, and
+sends all messages over a single SMTP connection. Each run is recorded as
+a ``DigestRun`` so the next one starts exactly where it ended.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import send_mass_mail
+from django.db.models import Q
+from django.utils import timezone
+
+from accounts.models import DELIVERY_DAILY, DELIVERY_HOURLY
+from articles import metrics
+from articles.models import Article
+from articles.signals import record_email_result
+from newsletters.models import Newsletter
+
+from .models import DigestRun, Subscription
+
+PERIODS = {
+    DELIVERY_HOURLY: timedelta(hours=1),
+    DELIVERY_DAILY: timedelta(days=1),
+}
+
+# Publications listed per digest email.
+DIGEST_MAX_ITEMS = 50
+
+
+def window_for(frequency, now=None):
+    """
+    Return the approval window the next digest run should cover.
+
+    Args:
+        frequency (str): ``hourly`` or ``daily``.
+        now (datetime, optional): End of the window; defaults to now.
+
+    Returns:
+        tuple: ``(start, end)``; ``start`` is exclusive.
+    """
+    end = now or timezone.now()
+    last = (
+        DigestRun.objects.filter(frequency=frequency)
+        .order_by("-window_end")
+        .values_list("window_end", flat=True)
+        .first()
+    )
+    return (last or end - PERIODS[frequency]), end
+
+
+def pending_items(start, end):
+    """
+    Return the publications approved within a window.
+
+    Args:
+        start (datetime): Exclusive start of the window.
+        end (datetime): Inclusive end of the window.
+
+    Returns:
+        list[tuple]: ``(kind, title, publisher_id, publisher_name, author_id)``
+        ordered by approval time.
+    """
+    items = []
+    for kind, model in (("Article", Article), ("Newsletter", Newsletter)):
+        items.extend(
+            (kind, *row)
+            for row in model.objects.filter(
+                is_approved=True, approved_at__gt=start, approved_at__lte=end
+            )
+            .order_by("approved_at")
+            .values_list("title", "publisher_id", "publisher__name", "author_id")
+        )
+    return items
+
+
+def build_digests(frequency, items):
+    """
+    Group pending publications per subscribed reader.
+
+    Args:
+        frequency (str): Delivery preference of the readers to include.
+        items (list[tuple]): Rows returned by ``pending_items``.
+
+    Returns:
+        dict: Maps reader email to the list of items they follow.
+    """
+    if not items:
+        return {}
+    publisher_ids = {item[2] for item in items}
+    author_ids = {item[4] for item in items}
+
+    # One query for every matching subscription of every digest reader.
+    follows = {}
+    for email, publisher_id, author_id in (
+        Subscription.objects.filter(user__role="reader", user__email_delivery=frequency)
+        .exclude(user__email="")
+        .filter(
+            Q(publisher_id__in=publisher_ids)
+            | Q(
+                journalist__user_id__in=author_ids,
+                journalist__user__role="journalist",
+            )
+        )
+        .values_list("user__email", "publisher_id", "journalist__user_id")
+    ):
+        sources = follows.setdefault(email, (set(), set()))
+        if publisher_id:
+            sources[0].add(publisher_id)
+        if author_id:
+            sources[1].add(author_id)
+
+    return {
+        email: [item for item in items if item[2] in publishers or item[4] in authors]
+        for email, (publishers, authors) in follows.items()
+    }
+
+
+def render_digest(frequency, items):
+    """
+    Return the subject and body of one digest email.
+
+    Args:
+        frequency (str): ``hourly`` or ``daily``.
+        items (list[tuple]): Items for this reader.
+
+    Returns:
+        tuple: ``(subject, message)``.
+    """
+    subject = f"Your {frequency} News Portal digest: {len(items)} new publication(s)"
+    lines = [
+        f"- {title} ({kind.lower()}, {publisher_name})"
+        for kind, title, _, publisher_name, _ in items[:DIGEST_MAX_ITEMS]
+    ]
+    if len(items) > DIGEST_MAX_ITEMS:
+        lines.append(f"...and {len(items) - DIGEST_MAX_ITEMS} more.")
+    return subject, "\n".join(lines)
+
+
+def send_digests(frequency, now=None, dry_run=False):
+    """
+    Send one digest email per reader for the next window of ``frequency``.
+
+    Args:
+        frequency (str): ``hourly`` or ``daily``.
+        now (datetime, optional): End of the window; defaults to now.
+        dry_run (bool): Build the digests without sending or recording them.
+
+    Returns:
+        DigestRun: The recorded (or, for a dry run, unsaved) run.
+    """
+    start, end = window_for(frequency, now)
+    items = pending_items(start, end)
+    digests = build_digests(frequency, items)
+    run = DigestRun(
+        frequency=frequency,
+        window_start=start,
+        window_end=end,
+        recipients=len(digests),
+        items=len(items),
+    )
+    if dry_run:
+        return run
+
+    from_email = getattr(settings, "DEFAULT_FROM_EMAIL", "noreply@newsportal.com")
+    if digests:
+        with metrics.timer("news_portal_email_send_seconds"):
+            sent = send_mass_mail(
+                (
+                    (*render_digest(frequency, reader_items), from_email, [email])
+                    for email, reader_items in digests.items()
+                ),
+                fail_silently=True,
+            )
+        record_email_result(len(digests), sent)
+    run.save()
+    return run
@@ -0,0 +1,46 @@
+"""
+subscriptions.management.commands.send_digests
+
+Management command that emails the hourly or daily digests.
+
+Schedule it from cron, e.g. ``send_digests hourly`` at the top of every hour
+and ``send_digests daily`` once a day. Each run covers the approvals since
+the previous run of the same frequency.
+"""
+
+from django.core.management.base import BaseCommand
+
+from subscriptions.digests import PERIODS, send_digests
+
+
+class Command(BaseCommand):
+    """
+    Send one digest email per reader for the elapsed window.
+
+    Example::
+
+        python manage.py send_digests daily
+    """
+
+    help = "Send hourly or daily digest emails to subscribed readers."
+
+    def add_arguments(self, parser):
+        """Register command-line arguments."""
+        parser.add_argument("frequency", choices=sorted(PERIODS))
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Build the digests without sending or recording the run.",
+        )
+
+    def handle(self, *args, **options):
+        """Build and send the digests."""
+        run = send_digests(options["frequency"], dry_run=options["dry_run"])
+        verb = "Would send" if options["dry_run"] else "Sent"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{verb} {run.recipients} {run.frequency} digest(s) covering "
+                f"{run.items} publication(s) approved after "
+                f"{run.window_start:%Y-%m-%d %H:%M}."
+            )
+        )
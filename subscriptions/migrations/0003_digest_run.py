@@ -0,0 +1,43 @@
+# Generated by Django 5.2.5 on 2026-10-19 09:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("subscriptions", "0002_alter_subscription_options"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DigestRun",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("frequency", models.CharField(max_length=10)),
+                ("window_start", models.DateTimeField()),
+                ("window_end", models.DateTimeField()),
+                ("recipients", models.PositiveIntegerField(default=0)),
+                ("items", models.PositiveIntegerField(default=0)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name": "Digest run",
+                "verbose_name_plural": "Digest runs",
+                "indexes": [
+                    models.Index(
+                        fields=["frequency", "window_end"],
+                        name="subscriptio_frequen_da4c1c_idx",
+                    )
+                ],
+            },
+        ),
+    ]
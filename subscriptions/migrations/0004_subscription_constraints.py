@@ -0,0 +1,50 @@
+# Generated by Django 5.2.5 on 2026-10-19 09:53
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def remove_duplicates(apps, schema_editor):
+    """Keep the oldest row of every duplicated publisher/journalist follow."""
+    Subscription = apps.get_model("subscriptions", "Subscription")
+    for field in ("publisher", "journalist"):
+        duplicates = (
+            Subscription.objects.filter(**{f"{field}__isnull": False})
+            .values("user", field)
+            .annotate(keep=Min("id"), rows=Count("id"))
+            .filter(rows__gt=1)
+        )
+        for row in duplicates:
+            Subscription.objects.filter(
+                user=row["user"], **{field: row[field]}
+            ).exclude(pk=row["keep"]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("articles", "0008_approved_at"),
+        ("subscriptions", "0003_digest_run"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicates, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name="subscription",
+            unique_together=set(),
+        ),
+        migrations.AddConstraint(
+            model_name="subscription",
+            constraint=models.UniqueConstraint(
+                fields=("user", "publisher"), name="unique_publisher_subscription"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="subscription",
+            constraint=models.UniqueConstraint(
+                fields=("user", "journalist"), name="unique_journalist_subscription"
+            ),
+        ),
+    ]
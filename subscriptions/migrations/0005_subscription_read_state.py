@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-19 10:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("subscriptions", "0004_subscription_constraints"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="subscription",
+            name="read_exceptions",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name="subscription",
+            name="read_until",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.5 on 2026-10-19 10:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("subscriptions", "0005_subscription_read_state"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AudienceChange",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("kind", models.PositiveSmallIntegerField()),
+                ("source_id", models.PositiveIntegerField()),
+                ("user_id", models.PositiveIntegerField()),
+                ("following", models.BooleanField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name": "Audience change",
+                "verbose_name_plural": "Audience changes",
+                "indexes": [
+                    models.Index(
+                        fields=["kind", "source_id", "id"],
+                        name="audience_change_source",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -1,7 +1,9 @@
 """
 Models for the Subscriptions app.
 
-Defines user subscriptions to publishers or journalists.
+Defines user subscriptions to publishers or journalists (including the
+reader's read state for each source), the record of digest email runs, and
+the log of subscription changes replayed on top of the audience index.
 """
 
 from django.conf import settings
@@ -17,10 +19,18 @@ class Subscription(models.Model):
         publisher (ForeignKey, optional): The publisher the user subscribes to.
         journalist (ForeignKey, optional): The journalist the user subscribes to.
         created_at (DateTimeField): Timestamp when the subscription was created.
+        read_until (DateTimeField, optional): High-water mark of the reader's
+            read state: content of the source approved up to this time is
+            read. Defaults to ``created_at``.
+        read_exceptions (JSONField): Content approved after ``read_until``
+            that was read out of order, as ``{"article": [ids],
+            "newsletter": [ids]}``. See ``subscriptions.read_state``.
 
     Notes:
-        Each subscription must be unique for a combination of user, publisher,
-        and journalist.
+        A reader follows each publisher and each journalist at most once.
+        The two unique constraints treat NULL as distinct, so the publisher
+        constraint never collides with journalist subscriptions and vice
+        versa.
     """
 
     user = models.ForeignKey(
@@ -43,9 +53,18 @@ class Subscription(models.Model):
         related_name="subscribed_users",
     )
     created_at = models.DateTimeField(auto_now_add=True)
+    read_until = models.DateTimeField(null=True, blank=True)
+    read_exceptions = models.JSONField(default=dict, blank=True)
 
     class Meta:
-        unique_together = ("user", "publisher", "journalist")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "publisher"], name="unique_publisher_subscription"
+            ),
+            models.UniqueConstraint(
+                fields=["user", "journalist"], name="unique_journalist_subscription"
+            ),
+        ]
         verbose_name = "Subscription"
         verbose_name_plural = "Subscriptions"
 
@@ -61,3 +80,78 @@ class Subscription(models.Model):
                 f"{self.journalist.user.username}"
             )
         return f"{self.user.username} subscription"
+
+
+class DigestRun(models.Model):
+    """
+    Records one run of the digest emails for a delivery frequency.
+
+    The next run of the same frequency starts its window where this one
+    ended, so every approved item falls into exactly one digest window.
+
+    Attributes:
+        frequency (CharField): ``hourly`` or ``daily``.
+        window_start (DateTimeField): Exclusive start of the approval window.
+        window_end (DateTimeField): Inclusive end of the approval window.
+        recipients (PositiveIntegerField): Number of digest emails sent.
+        items (PositiveIntegerField): Number of publications in the window.
+        created_at (DateTimeField): When the run finished.
+    """
+
+    frequency = models.CharField(max_length=10)
+    window_start = models.DateTimeField()
+    window_end = models.DateTimeField()
+    recipients = models.PositiveIntegerField(default=0)
+    items = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["frequency", "window_end"])]
+        verbose_name = "Digest run"
+        verbose_name_plural = "Digest runs"
+
+    def __str__(self):
+        """
+        Return a human-readable representation of the run.
+        """
+        return f"{self.frequency} digest up to {self.window_end:%Y-%m-%d %H:%M}"
+
+
+class AudienceChange(models.Model):
+    """
+    A follow or unfollow recorded for the audience index.
+
+    ``subscriptions.audience`` replays the changes newer than an index
+    build on top of it, so every worker sees the same audiences whatever
+    cache backend it uses. A rebuild deletes the changes the previous
+    index no longer needs.
+
+    Attributes:
+        kind (PositiveSmallIntegerField): 0 for a publisher, 1 for a journalist.
+        source_id (PositiveIntegerField): Publisher or ``Journalist`` id.
+        user_id (PositiveIntegerField): Id of the following user.
+        following (BooleanField): True for a follow, False for an unfollow.
+        created_at (DateTimeField): When the change was recorded.
+    """
+
+    kind = models.PositiveSmallIntegerField()
+    source_id = models.PositiveIntegerField()
+    user_id = models.PositiveIntegerField()
+    following = models.BooleanField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["kind", "source_id", "id"], name="audience_change_source"
+            )
+        ]
+        verbose_name = "Audience change"
+        verbose_name_plural = "Audience changes"
+
+    def __str__(self):
+        """
+        Return a human-readable representation of the change.
+        """
+        action = "follow" if self.following else "unfollow"
+        return f"{action} {self.kind}:{self.source_id} by {self.user_id}"
@@ -0,0 +1,291 @@
+"""
+subscriptions.read_state
+
+Compact per-reader read state for unread badges.
+
+Instead of one row per (reader, item), each ``Subscription`` row carries
+the reader's read state for that source:
+
+- ``read_until``: a high-water mark. Every item of the source approved up
+  to this time counts as read. It defaults to when the reader followed the
+  source.
+- ``read_exceptions``: the few items approved after the mark that were
+  opened out of order, such as the newest article read first.
+
+An item is unread for a source when it was approved after the mark and is
+not an exception. Opening an item records it in every followed source it
+belongs to, so an item read once is read everywhere.
+
+When a subscription holds more than ``READ_EXCEPTIONS_MAX`` exceptions, it
+is compacted. The mark first advances over the items that are read up to
+the oldest unread one. If the set is still too large, the mark is forced
+past the oldest exceptions, and any unread items older than those stop
+counting.
+
+Read state is loaded with the subscription snapshot, in the same query,
+and kept for the request. Unread counts for all of a reader's
+subscriptions come from one query with a correlated count per source.
+"""
+
+from django.db.models import F, Func, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from articles.models import Article
+from newsletters.models import Newsletter
+
+from .models import Subscription
+from .snapshot import get_snapshot, invalidate
+
+READ_EXCEPTIONS_MAX = 200
+
+# read_exceptions key -> content model
+CONTENT_MODELS = {"article": Article, "newsletter": Newsletter}
+
+
+def _mark():
+    """Return the effective high-water mark of a ``Subscription`` row."""
+    return Coalesce("read_until", "created_at")
+
+
+def _source_filter():
+    """Return a Q matching content of the subscription in ``OuterRef``."""
+    return Q(publisher_id=OuterRef("publisher_id")) | Q(
+        author_id=OuterRef("journalist__user_id")
+    )
+
+
+# ---------------- Loading ----------------
+
+
+def get_markers(user):
+    """
+    Return the reader's read state from the subscription snapshot.
+
+    Args:
+        user (CustomUser): Authenticated reader.
+
+    Returns:
+        tuple[ReadMarker]: One marker per subscription.
+    """
+    return get_snapshot(user).read_markers
+
+
+# ---------------- Unread state ----------------
+
+
+def unread_ids(user, items):
+    """
+    Return the ids of the unread items among ``items``.
+
+    No query is made beyond loading the read state.
+
+    Args:
+        user (CustomUser): Reader.
+        items (Iterable[Article or Newsletter]): Items of one content kind.
+
+    Returns:
+        set: Ids of the unread items.
+    """
+    markers = get_markers(user)
+    unread = set()
+    for item in items:
+        kind = item._meta.model_name
+        if any(m.covers(item) and m.is_unread(kind, item) for m in markers):
+            unread.add(item.pk)
+    return unread
+
+
+def _count_after_mark(model, excluded):
+    """Return a correlated subquery counting a source's unread items."""
+    return Subquery(
+        model.objects.filter(
+            _source_filter(), is_approved=True, approved_at__gt=OuterRef("mark")
+        )
+        .exclude(pk__in=excluded)
+        .order_by()
+        .annotate(count=Func(F("pk"), function="COUNT"))
+        .values("count")
+    )
+
+
+def unread_counts(user):
+    """
+    Return the number of unread items of every followed source.
+
+    Args:
+        user (CustomUser): Reader.
+
+    Returns:
+        list[dict]: ``{"type", "id", "name", "articles", "newsletters"}`` per
+        subscription; journalist ids are ``Journalist`` ids.
+    """
+    excluded = {kind: set() for kind in CONTENT_MODELS}
+    for marker in get_markers(user):
+        for kind, ids in marker.exceptions.items():
+            excluded[kind] |= ids
+    rows = (
+        Subscription.objects.filter(user=user)
+        .annotate(
+            mark=_mark(),
+            **{
+                f"unread_{kind}": Coalesce(_count_after_mark(model, excluded[kind]), 0)
+                for kind, model in CONTENT_MODELS.items()
+            },
+        )
+        .values_list(
+            "publisher_id",
+            "publisher__name",
+            "journalist_id",
+            "journalist__user__username",
+            "unread_article",
+            "unread_newsletter",
+        )
+        .order_by("pk")
+    )
+    return [
+        {
+            "type": "publisher" if publisher_id else "journalist",
+            "id": publisher_id or journalist_id,
+            "name": publisher_name or journalist_name,
+            "articles": articles,
+            "newsletters": newsletters,
+        }
+        for (
+            publisher_id,
+            publisher_name,
+            journalist_id,
+            journalist_name,
+            articles,
+            newsletters,
+        ) in rows
+    ]
+
+
+# ---------------- Updating ----------------
+
+
+def _save(subscription_id, read_until, exceptions):
+    """Write a subscription's read state without sending signals."""
+    Subscription.objects.filter(pk=subscription_id).update(
+        read_until=read_until,
+        read_exceptions={kind: sorted(ids) for kind, ids in exceptions.items() if ids},
+    )
+
+
+def _compact(marker, read_until, exceptions):
+    """
+    Shrink an oversized exception set by advancing the mark.
+
+    Returns:
+        tuple: ``(read_until, exceptions)`` after compaction.
+    """
+    source = (
+        Q(publisher_id=marker.publisher_id)
+        if marker.publisher_id
+        else Q(author_id=marker.journalist_user_id)
+    )
+    read = []  # (approved_at, kind, pk) of exceptions still after the mark
+    first_unread = None
+    for kind, model in CONTENT_MODELS.items():
+        after_mark = model.objects.filter(
+            source, is_approved=True, approved_at__gt=read_until
+        )
+        read += [
+            (approved_at, kind, pk)
+            for pk, approved_at in after_mark.filter(
+                pk__in=exceptions.get(kind, ())
+            ).values_list("pk", "approved_at")
+        ]
+        oldest = (
+            after_mark.exclude(pk__in=exceptions.get(kind, ()))
+            .order_by("approved_at")
+            .values_list("approved_at", flat=True)
+            .first()
+        )
+        if oldest is not None and (first_unread is None or oldest < first_unread):
+            first_unread = oldest
+
+    read.sort()
+    # Items read up to the oldest unread one fold into the mark without
+    # losing anything; past that, the oldest are folded in only while the
+    # set is still too large.
+    folded = 0
+    for approved_at, _, _ in read:
+        lossless = first_unread is None or approved_at < first_unread
+        if not lossless and len(read) - folded <= READ_EXCEPTIONS_MAX:
+            break
+        read_until = approved_at
+        folded += 1
+    remaining = {}
+    for approved_at, kind, pk in read:
+        if approved_at > read_until:
+            remaining.setdefault(kind, set()).add(pk)
+    return read_until, remaining
+
+
+def record_read(user, item):
+    """
+    Record that the reader opened ``item``.
+
+    The item is added to the exceptions of every followed source it belongs
+    to and is still unread in. Concurrent reads by the same reader may race;
+    the lost exception only makes an item show as unread again.
+
+    Args:
+        user (CustomUser): Reader.
+        item (Article or Newsletter): Approved item that was opened.
+    """
+    kind = item._meta.model_name
+    changed = False
+    for marker in get_markers(user):
+        if not (marker.covers(item) and marker.is_unread(kind, item)):
+            continue
+        read_until = marker.read_until
+        exceptions = {k: set(ids) for k, ids in marker.exceptions.items()}
+        exceptions.setdefault(kind, set()).add(item.pk)
+        if sum(len(ids) for ids in exceptions.values()) > READ_EXCEPTIONS_MAX:
+            read_until, exceptions = _compact(marker, read_until, exceptions)
+        _save(marker.subscription_id, read_until, exceptions)
+        changed = True
+    if changed:
+        invalidate(user)
+
+
+def mark_read(user, kind, source_id, until=None):
+    """
+    Mark a followed source read up to a point in time.
+
+    The mark only moves forward. Exceptions it now covers are dropped.
+
+    Args:
+        user (CustomUser): Reader.
+        kind (str): ``publisher`` or ``journalist``.
+        source_id (int): Publisher or ``Journalist`` id.
+        until (datetime, optional): New mark; defaults to now.
+
+    Returns:
+        datetime: The effective mark after the change.
+
+    Raises:
+        Subscription.DoesNotExist: The reader does not follow the source.
+    """
+    marker = next(
+        (m for m in get_markers(user) if getattr(m, f"{kind}_id") == source_id),
+        None,
+    )
+    if marker is None:
+        raise Subscription.DoesNotExist()
+    read_until = max(marker.read_until, until or timezone.now())
+    exceptions = {
+        content: set(
+            model.objects.filter(
+                pk__in=marker.exceptions[content], approved_at__gt=read_until
+            ).values_list("pk", flat=True)
+        )
+        for content, model in CONTENT_MODELS.items()
+        if marker.exceptions.get(content)
+    }
+    _save(marker.subscription_id, read_until, exceptions)
+    invalidate(user)
+    return read_until
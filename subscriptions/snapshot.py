@@ -0,0 +1,149 @@
+"""
+subscriptions.snapshot
+
+Per-request snapshot of a reader's subscriptions.
+
+The ids a reader follows, and the reader's read state for each source, are
+loaded with a single query and kept on the user object, so every view, API
+and template in the same request reuses them instead of re-running
+``Subscription`` subqueries or re-evaluating lazy querysets in ``in``
+checks. ``request.user`` is created per request, which bounds the
+snapshot's lifetime; code that changes subscriptions calls
+``invalidate()``.
+"""
+
+from typing import NamedTuple
+
+from django.db.models import Q
+
+from .models import Subscription
+
+ATTRIBUTE = "_subscription_snapshot"
+
+
+class ReadMarker(NamedTuple):
+    """
+    Read state of one subscription (see ``subscriptions.read_state``).
+
+    Attributes:
+        subscription_id (int): ``Subscription`` id.
+        publisher_id (int or None): Followed publisher.
+        journalist_id (int or None): Followed ``Journalist``.
+        journalist_user_id (int or None): User id of the followed journalist.
+        read_until (datetime): Effective high-water mark.
+        exceptions (dict): Content kind to the set of ids read after the mark.
+    """
+
+    subscription_id: int
+    publisher_id: int
+    journalist_id: int
+    journalist_user_id: int
+    read_until: object
+    exceptions: dict
+
+    def covers(self, item):
+        """Return True if ``item`` was published by this source."""
+        if self.publisher_id:
+            return item.publisher_id == self.publisher_id
+        return item.author_id == self.journalist_user_id
+
+    def is_unread(self, kind, item):
+        """Return True if ``item`` of this source is unread."""
+        return (
+            item.approved_at is not None
+            and item.approved_at > self.read_until
+            and item.pk not in self.exceptions.get(kind, ())
+        )
+
+
+class SubscriptionSnapshot(NamedTuple):
+    """
+    Ids followed by one reader.
+
+    Attributes:
+        publisher_ids (frozenset): Followed publisher ids.
+        journalist_ids (frozenset): Followed ``Journalist`` ids.
+        journalist_user_ids (frozenset): User ids of followed journalists,
+            i.e. the ``author_id`` of their articles and newsletters.
+        read_markers (tuple): A ``ReadMarker`` per subscription.
+    """
+
+    publisher_ids: frozenset
+    journalist_ids: frozenset
+    journalist_user_ids: frozenset
+    read_markers: tuple
+
+    def content_filter(self):
+        """Return a Q matching content from followed publishers or journalists."""
+        return Q(publisher_id__in=self.publisher_ids) | Q(
+            author_id__in=self.journalist_user_ids
+        )
+
+
+EMPTY = SubscriptionSnapshot(frozenset(), frozenset(), frozenset(), ())
+
+
+def get_snapshot(user):
+    """
+    Return the user's subscription snapshot, loading it on first use.
+
+    Args:
+        user (CustomUser): Authenticated user.
+
+    Returns:
+        SubscriptionSnapshot: Followed ids (empty for anonymous users).
+    """
+    if not user.is_authenticated:
+        return EMPTY
+    snapshot = getattr(user, ATTRIBUTE, None)
+    if snapshot is None:
+        publishers, journalists, journalist_users = set(), set(), set()
+        markers = []
+        for (
+            pk,
+            publisher_id,
+            journalist_id,
+            journalist_user_id,
+            created_at,
+            read_until,
+            exceptions,
+        ) in Subscription.objects.filter(user=user).values_list(
+            "pk",
+            "publisher_id",
+            "journalist_id",
+            "journalist__user_id",
+            "created_at",
+            "read_until",
+            "read_exceptions",
+        ):
+            if publisher_id:
+                publishers.add(publisher_id)
+            if journalist_id:
+                journalists.add(journalist_id)
+                journalist_users.add(journalist_user_id)
+            markers.append(
+                ReadMarker(
+                    pk,
+                    publisher_id,
+                    journalist_id,
+                    journalist_user_id,
+                    read_until or created_at,
+                    {kind: set(ids) for kind, ids in (exceptions or {}).items()},
+                )
+            )
+        snapshot = SubscriptionSnapshot(
+            frozenset(publishers),
+            frozenset(journalists),
+            frozenset(journalist_users),
+            tuple(markers),
+        )
+        setattr(user, ATTRIBUTE, snapshot)
+    return snapshot
+
+
+def invalidate(user):
+    """Drop the cached snapshot after the user's subscriptions changed."""
+    try:
+        delattr(user, ATTRIBUTE)
+    except AttributeError:
+        pass
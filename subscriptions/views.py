@@ -9,6 +9,7 @@ from django.shortcuts import get_object_or_404, redirect
 
 from articles.models import Journalist, Publisher
 from .models import Subscription
+from .snapshot import invalidate
 
 
 @login_required
@@ -31,6 +32,7 @@ def subscribe_publisher(request, pk):
 
     publisher = get_object_or_404(Publisher, pk=pk)
     Subscription.objects.get_or_create(user=request.user, publisher=publisher)
+    invalidate(request.user)
     messages.success(request, f"Subscribed to {publisher.name}")
     return redirect("articles:home")
 
@@ -55,6 +57,7 @@ def unsubscribe_publisher(request, pk):
 
     publisher = get_object_or_404(Publisher, pk=pk)
     Subscription.objects.filter(user=request.user, publisher=publisher).delete()
+    invalidate(request.user)
     messages.success(request, f"Unsubscribed from {publisher.name}")
     return redirect("articles:home")
 
@@ -79,6 +82,7 @@ def subscribe_journalist(request, pk):
 
     journalist = get_object_or_404(Journalist, pk=pk)
     Subscription.objects.get_or_create(user=request.user, journalist=journalist)
+    invalidate(request.user)
     messages.success(request, f"Subscribed to {journalist.user.username}")
     return redirect("articles:home")
 
@@ -103,5 +107,6 @@ def unsubscribe_journalist(request, pk):
 
     journalist = get_object_or_404(Journalist, pk=pk)
     Subscription.objects.filter(user=request.user, journalist=journalist).delete()
+    invalidate(request.user)
     messages.success(request, f"Unsubscribed from {journalist.user.username}")
     return redirect("articles:home")